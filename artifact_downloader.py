@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# artifact_downloader.py - Bulk streaming download of occurrence artifacts and snippets
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from findings import PolarisFindingsAPI
+
+MANIFEST_NAME = 'manifest.json'
+_UNSAFE = re.compile(r'[^\w.-]')
+
+
+def artifact_ids(occurrence: Dict) -> List[str]:
+    """
+    Artifact IDs referenced by an occurrence
+
+    Reads an `artifacts` list (IDs or objects with an `id`) and any
+    `_links` href pointing at `/artifacts/<id>`.
+    """
+    ids = []
+    for artifact in occurrence.get('artifacts') or []:
+        artifact_id = artifact.get('id') if isinstance(artifact, dict) else artifact
+        if artifact_id and artifact_id not in ids:
+            ids.append(str(artifact_id))
+
+    links = occurrence.get('_links') or []
+    if isinstance(links, dict):
+        links = list(links.values())
+    for link in links:
+        href = link.get('href', '') if isinstance(link, dict) else str(link)
+        if '/artifacts/' in href:
+            artifact_id = href.split('/artifacts/', 1)[1].split('?', 1)[0].strip('/')
+            if artifact_id and artifact_id not in ids:
+                ids.append(artifact_id)
+    return ids
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class DownloadResult:
+    """Outcome of one file download"""
+    path: str
+    size: int = 0
+    sha256: Optional[str] = None
+    skipped: bool = False
+    error: Optional[str] = None
+
+
+class ArtifactDownloader:
+    """
+    Downloads occurrence artifacts and snippets of a project to disk
+
+    Files are streamed chunk by chunk, so memory use does not depend on their
+    size. Every completed file is recorded with its SHA-256 in a manifest in
+    the output directory; a file that is still on disk with a matching
+    checksum is skipped on the next run, a missing or modified one is
+    downloaded again. Downloads run on a bounded worker pool.
+
+    Layout: <output_dir>/<occurrence_id>/snippet.json and
+    <output_dir>/<occurrence_id>/artifact_<artifact_id>.txt
+    """
+
+    def __init__(self, findings_api: PolarisFindingsAPI, output_dir: str,
+                 max_workers: int = 8):
+        """
+        Initialize the downloader
+
+        Args:
+            findings_api: Findings API client
+            output_dir: Directory the files are written to
+            max_workers: Number of downloads in flight
+        """
+        self.findings_api = findings_api
+        self.output_dir = output_dir
+        self.max_workers = max_workers
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+        self._manifest = self._load_manifest()
+
+    # Manifest
+    def _load_manifest(self) -> Dict[str, Dict]:
+        try:
+            with open(self._manifest_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_manifest(self) -> None:
+        """Write the manifest atomically"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        with self._lock:
+            temp_path = f"{self._manifest_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._manifest, f, indent=2, sort_keys=True)
+            os.replace(temp_path, self._manifest_path)
+
+    def _is_current(self, relative_path: str) -> bool:
+        """Whether a file is on disk with the checksum recorded in the manifest"""
+        with self._lock:
+            entry = self._manifest.get(relative_path)
+        path = os.path.join(self.output_dir, relative_path)
+        if entry is None or not os.path.exists(path):
+            return False
+        if os.path.getsize(path) != entry.get('size'):
+            return False
+        return file_sha256(path) == entry.get('sha256')
+
+    # Downloads
+    def _download(self, relative_path: str, fetch) -> DownloadResult:
+        """Stream one file unless an identical copy is already on disk"""
+        path = os.path.join(self.output_dir, relative_path)
+        if self._is_current(relative_path):
+            with self._lock:
+                entry = self._manifest[relative_path]
+            return DownloadResult(path, entry['size'], entry['sha256'], skipped=True)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        digest = hashlib.sha256()
+        try:
+            size = fetch(path, digest)
+        except Exception as e:
+            self.logger.warning(f"Error downloading {relative_path}: {str(e)}")
+            return DownloadResult(path, error=str(e))
+
+        result = DownloadResult(path, size, digest.hexdigest())
+        with self._lock:
+            self._manifest[relative_path] = {'size': size, 'sha256': result.sha256}
+        return result
+
+    def download_artifact(self, occurrence_id: str, artifact_id: str,
+                          project_id: Optional[str] = None) -> DownloadResult:
+        """Download one artifact of an occurrence"""
+        relative_path = os.path.join(
+            _UNSAFE.sub('_', occurrence_id), f"artifact_{_UNSAFE.sub('_', artifact_id)}.txt"
+        )
+        return self._download(relative_path, lambda path, digest:
+                              self.findings_api.download_occurrence_artifact(
+                                  occurrence_id, artifact_id, path,
+                                  project_id=project_id, hasher=digest))
+
+    def download_snippet(self, occurrence_id: str,
+                         project_id: Optional[str] = None) -> DownloadResult:
+        """Download the code snippet of an occurrence"""
+        relative_path = os.path.join(_UNSAFE.sub('_', occurrence_id), 'snippet.json')
+        return self._download(relative_path, lambda path, digest:
+                              self.findings_api.download_occurrence_snippet(
+                                  occurrence_id, path, project_id=project_id, hasher=digest))
+
+    def download_all(self, tasks: Iterable[Tuple[str, Optional[str]]],
+                     project_id: Optional[str] = None) -> Iterator[DownloadResult]:
+        """
+        Download many files on the bounded worker pool
+
+        Args:
+            tasks: (occurrence_id, artifact_id) pairs; an artifact_id of None
+                   downloads the occurrence snippet
+            project_id: Project ID passed to every request
+
+        Yields:
+            One DownloadResult per task, in task order
+        """
+        def run(task: Tuple[str, Optional[str]]) -> DownloadResult:
+            occurrence_id, artifact_id = task
+            if artifact_id is None:
+                return self.download_snippet(occurrence_id, project_id)
+            return self.download_artifact(occurrence_id, artifact_id, project_id)
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+                yield from executor.map(run, tasks)
+        finally:
+            self.save_manifest()
+
+    def project_tasks(self, project_id: str, include_snippets: bool = True,
+                      page_size: int = 100) -> Iterator[Tuple[str, Optional[str]]]:
+        """List the download tasks of every occurrence of a project"""
+        for page in self.findings_api.get_occurrences_paginated(project_id, page_size):
+            for occurrence in page.get('_items', []):
+                occurrence_id = occurrence.get('id')
+                if not occurrence_id:
+                    continue
+                if include_snippets:
+                    yield occurrence_id, None
+                for artifact_id in artifact_ids(occurrence):
+                    yield occurrence_id, artifact_id
+
+    def download_project(self, project_id: str,
+                         include_snippets: bool = True) -> Dict[str, int]:
+        """
+        Download all artifacts (and snippets) of a project
+
+        Returns:
+            Counts of downloaded, skipped and failed files and bytes written
+        """
+        totals = {'downloaded': 0, 'skipped': 0, 'failed': 0, 'bytes': 0}
+        for result in self.download_all(self.project_tasks(project_id, include_snippets),
+                                        project_id):
+            if result.error:
+                totals['failed'] += 1
+            elif result.skipped:
+                totals['skipped'] += 1
+            else:
+                totals['downloaded'] += 1
+                totals['bytes'] += result.size
+        return totals
+
+
+def main() -> None:
+    """Download the artifacts and snippets of a project"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    parser = argparse.ArgumentParser(description='Download occurrence artifacts and snippets')
+    parser.add_argument('base_url', help='Polaris base URL')
+    parser.add_argument('api_token', help='API token')
+    parser.add_argument('project_id', help='Project (portfolio subitem) ID')
+    parser.add_argument('output_dir', help='Directory to write the files to')
+    parser.add_argument('--workers', type=int, default=8, help='Parallel downloads (default: 8)')
+    parser.add_argument('--no-snippets', action='store_true', help='Download artifacts only')
+    args = parser.parse_args()
+
+    api = PolarisFindingsAPI(args.base_url, args.api_token)
+    downloader = ArtifactDownloader(api, args.output_dir, max_workers=args.workers)
+    totals = downloader.download_project(args.project_id, include_snippets=not args.no_snippets)
+    print(f"Downloaded: {totals['downloaded']} ({totals['bytes']} bytes), "
+          f"skipped: {totals['skipped']}, failed: {totals['failed']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+# assist_cache.py - Content addressed cache for occurrence AI assist responses
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional, Union
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_snippet(snippet: Union[Dict, str, None]) -> str:
+    """
+    Reduce a code snippet to the text that identifies the pattern
+
+    Uses the `content` of a snippet response; a response without content
+    gives an empty text. Leading/trailing whitespace of every line, runs of
+    inner whitespace and blank lines are dropped, so the same code at a
+    different indentation or position maps to the same text.
+    """
+    if isinstance(snippet, dict):
+        snippet = snippet.get('content')
+    if not snippet:
+        return ''
+    lines = (_WHITESPACE.sub(' ', line).strip() for line in str(snippet).splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+def assist_key(issue_type: str, snippet: Union[Dict, str, None], scope: str = '') -> str:
+    """Cache key of an assist response: scope, issue type and normalized snippet hash"""
+    text = f"{scope}\0{issue_type}\0{normalize_snippet(snippet)}"
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class AssistCache:
+    """
+    Persistent assist cache shared by all occurrences with the same pattern
+
+    Assist responses are stored in SQLite under `assist_key(issue type,
+    snippet)`, so a pattern that repeats across occurrences, projects and
+    runs is requested once. Concurrent lookups of a key that is being
+    fetched wait for that fetch instead of starting their own. Keys include
+    a `scope`, the server and credential, so one file can serve several
+    tenants. Occurrences without snippet text identify no pattern and are
+    always fetched.
+    """
+
+    def __init__(self, path: str = '.polaris_cache/assist.sqlite',
+                 ttl: float = 30 * 86400, scope: str = ''):
+        """
+        Initialize the cache
+
+        Args:
+            path: SQLite database file
+            ttl: Seconds a stored assist response is reused
+            scope: Tenant the responses belong to, e.g. the base URL and API token;
+                   only its hash is stored
+        """
+        self.path = path
+        self.ttl = ttl
+        self.scope = scope
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS assists (
+                key TEXT PRIMARY KEY,
+                issue_type TEXT,
+                body TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the stored assist response for a key if it has not expired"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body FROM assists WHERE key = ? AND created_at > ?",
+                (key, time.time() - self.ttl)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: str, issue_type: Optional[str], assist: Dict) -> None:
+        """Store an assist response"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO assists (key, issue_type, body, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, issue_type, json.dumps(assist, ensure_ascii=False), time.time())
+            )
+            self._conn.commit()
+
+    def get_or_fetch(self, issue_type: str, snippet: Union[Dict, str, None],
+                     fetch: Callable[[], Dict]) -> Dict:
+        """
+        Return the assist response for a pattern, calling `fetch` at most once per key
+
+        Args:
+            issue_type: Issue type ID or name
+            snippet: Code snippet response or its text
+            fetch: Performs the assist request on a cache miss
+
+        Raises:
+            Whatever `fetch` raises; waiting callers receive the same exception
+        """
+        if not normalize_snippet(snippet):
+            return fetch()
+        key = assist_key(issue_type, snippet, self.scope)
+        cached = self.get(key)
+        if cached is not None:
+            with self._lock:
+                self.hits += 1
+            return cached
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if not owner:
+            return future.result()
+
+        try:
+            # Another owner may have stored the key between the lookup and now
+            assist = self.get(key)
+            if assist is None:
+                assist = fetch()
+            if assist:
+                self.put(key, issue_type, assist)
+            future.set_result(assist)
+            return assist
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Hit, miss and coalesced lookup counts of this process"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'coalesced': self.coalesced}
+
+    def clear(self) -> None:
+        """Remove all stored assist responses"""
+        with self._lock:
+            self._conn.execute("DELETE FROM assists")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,579 @@
+# async_api.py - Asyncio clients for the Polaris Findings and Portfolio APIs
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from itertools import islice
+from typing import Any, AsyncIterator, Awaitable, BinaryIO, Callable, Dict, Optional, Union
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+import json_codec
+from findings import PolarisFindingsAPI
+from page_prefetch import aiter_prefetched
+from portfolio import PolarisPortfolioAPI, PaginationParams
+from rate_limiter import AdaptiveRateLimiter, RetryPolicy, get_shared_rate_limiter
+from request_metrics import RequestMetrics
+
+
+class _AsyncRequestMixin:
+    """
+    Replaces the blocking `_make_request` of a Polaris client with a coroutine
+
+    The endpoint methods of the synchronous clients only build the request
+    and return `self._make_request(...)`, so overriding `_make_request` turns
+    them into awaitables without duplicating the endpoint definitions. The
+    listings (`*_paginated`, `iter_all_*`) read their responses, so every
+    async client defines its own async versions; a client class missing one
+    fails at definition time instead of returning a broken iterator.
+    All requests of one client share an aiohttp session and a semaphore that
+    bounds how many of them are in flight at the same time. Requests take a
+    token from the same rate limiter as the synchronous transport and follow
+    the same RetryPolicy. No requests transport is created.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        missing = [
+            name for name in dir(cls)
+            if (name.endswith('_paginated') or name.startswith('iter_all_'))
+            and not any(name in vars(klass) for klass in cls.__mro__
+                        if issubclass(klass, _AsyncRequestMixin))
+        ]
+        if missing:
+            raise TypeError(f"{cls.__name__} does not define async versions of "
+                            f"{', '.join(sorted(missing))}")
+
+    def __init__(self, base_url: str, api_token: str, max_concurrency: int = 100,
+                 timeout: float = 30, metrics: Optional[RequestMetrics] = None,
+                 rate_limiter: Optional[AdaptiveRateLimiter] = None,
+                 max_retries: int = 3, backoff_base: float = 0.5, backoff_max: float = 30):
+        """
+        Initialize the async API handler
+
+        Args:
+            base_url: Base URL for the Polaris instance
+            api_token: API token for authentication
+            max_concurrency: Maximum number of requests in flight
+            timeout: Total timeout per request in seconds
+            metrics: Per-endpoint request metrics to record into, disabled if omitted
+            rate_limiter: Limiter shared with other clients of the same tenant,
+                          `get_shared_rate_limiter()` if omitted
+            max_retries: Retries of an idempotent request after the first attempt
+            backoff_base: Seconds of the first backoff, doubled on every retry
+            backoff_max: Upper bound of a backoff in seconds
+        """
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for the async Polaris clients "
+                              "(pip install aiohttp)")
+        # The synchronous constructor would set up a requests transport
+        self.base_url = base_url.rstrip('/')
+        self.api_token = api_token
+        self.headers = {'Api-Token': api_token}
+        self.logger = logging.getLogger(__name__)
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.metrics = metrics
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
+        self.retry_policy = RetryPolicy(self.rate_limiter, max_retries, backoff_base, backoff_max)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._session = None
+
+    def _get_session(self) -> 'aiohttp.ClientSession':
+        """Create the shared session lazily inside the running event loop"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers={
+                    'Api-Token': self.api_token,
+                    'Accept-Language': 'en-US'
+                },
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency)
+            )
+        return self._session
+
+    @staticmethod
+    def _encode_params(params: Optional[Dict]) -> Optional[Dict]:
+        """Convert query parameters to the types aiohttp accepts"""
+        if not params:
+            return None
+        encoded = {}
+        for key, value in params.items():
+            if value is None:
+                continue
+            if isinstance(value, bool):
+                value = str(value).lower()
+            encoded[key] = value if isinstance(value, (str, int, float)) else str(value)
+        return encoded
+
+    async def _make_request(self, method: str, endpoint: str, accept_type: str,
+                            params: Optional[Dict] = None, data: Optional[Dict] = None,
+                            raw: bool = False, output_file: Optional[Union[str, BinaryIO]] = None,
+                            hasher: Optional[Any] = None) -> Any:
+        """
+        Make HTTP request to Polaris API without blocking the event loop
+
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            endpoint: API endpoint
+            accept_type: Accept header type
+            params: Query parameters
+            data: Request body data
+            raw: Return the undecoded response bytes
+            output_file: Stream the response body to this file path or binary
+                         buffer instead of decoding it
+            hasher: hashlib object updated with the streamed body
+
+        Returns:
+            API response as dictionary, the response bytes if `raw` is set, or
+            the number of bytes written if `output_file` is given
+        """
+        headers = self.headers.copy()
+        headers['Accept'] = accept_type
+
+        url = f"{self.base_url}{endpoint}"
+
+        policy = self.retry_policy
+        attempt = 0
+        while True:
+            delay = None
+            async with self._semaphore:
+                # Reserve inside the slot so at most max_concurrency reservations are
+                # outstanding when the limiter slows down
+                wait = self.rate_limiter.reserve()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                started = time.perf_counter()
+                status = 'error'
+                size = 0
+                finished = None
+                streaming = False
+                try:
+                    async with self._get_session().request(
+                        method,
+                        url,
+                        headers=headers,
+                        params=self._encode_params(params),
+                        json=data
+                    ) as response:
+                        status = response.status
+                        delay = policy.on_response(method, endpoint, status,
+                                                   response.headers.get('Retry-After'), attempt)
+                        if delay is None:
+                            if status >= 400:
+                                text = await response.text()
+                                self.logger.error(f"HTTP error occurred: {text}")
+                                response.raise_for_status()
+                            if output_file:
+                                streaming = True
+                                size = await self._download(response, output_file,
+                                                            hasher=hasher)
+                                return size
+                            body = b'' if status == 204 else await response.read()
+                            size = len(body)
+                            finished = time.perf_counter()
+                            if raw or not body:
+                                return body if raw else {}
+                            if self.metrics is None:
+                                return json_codec.loads(body)
+                            decode_started = time.perf_counter()
+                            result = json_codec.loads(body)
+                            self.metrics.record_decode(method, endpoint,
+                                                       time.perf_counter() - decode_started)
+                            return result
+                except (asyncio.TimeoutError, aiohttp.ClientConnectionError,
+                        aiohttp.ClientPayloadError) as e:
+                    # A partly streamed download is not sent again
+                    if not streaming:
+                        delay = policy.on_error(method, endpoint, e, attempt)
+                    if delay is None:
+                        self.logger.error('Request timed out' if isinstance(e, asyncio.TimeoutError)
+                                          else f"API request failed: {str(e)}")
+                        raise
+                except aiohttp.ClientResponseError:
+                    raise
+                except aiohttp.ClientError as e:
+                    self.logger.error(f"API request failed: {str(e)}")
+                    raise
+                finally:
+                    if self.metrics is not None:
+                        # Decode time is recorded separately, not as request latency
+                        self.metrics.record(method, endpoint, status,
+                                            (finished or time.perf_counter()) - started, size)
+
+            if self.metrics is not None:
+                self.metrics.record_retry(method, endpoint)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    async def _download(response: 'aiohttp.ClientResponse', target: Union[str, BinaryIO],
+                        chunk_size: int = 1024 * 1024, hasher: Optional[Any] = None) -> int:
+        """Stream a response body to a buffer, or to `<path>.part` moved into place"""
+        async def copy(out: BinaryIO) -> int:
+            written = 0
+            async for chunk in response.content.iter_chunked(chunk_size):
+                out.write(chunk)
+                if hasher is not None:
+                    hasher.update(chunk)
+                written += len(chunk)
+            return written
+
+        if not isinstance(target, str):
+            return await copy(target)
+        temp_path = f"{target}.part"
+        try:
+            with open(temp_path, 'wb') as f:
+                written = await copy(f)
+            os.replace(temp_path, target)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return written
+
+    async def close(self) -> None:
+        """Close the underlying HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+
+class AsyncPolarisFindingsAPI(_AsyncRequestMixin, PolarisFindingsAPI):
+    """
+    Asyncio counterpart of PolarisFindingsAPI
+
+    All endpoint methods of PolarisFindingsAPI are available and return
+    awaitables, e.g. `await api.get_issue_by_id(issue_id, project_id=pid)`.
+    """
+
+    async def get_issues_paginated(self, project_id: str, page_size: int = 100,
+                                   branch_id: str = None,
+                                   params: Optional[Dict] = None,
+                                   cursor: Optional[str] = None,
+                                   prefetch: int = 0) -> AsyncIterator[Dict]:
+        """
+        Get all issues using pagination
+
+        Args:
+            project_id: Project ID
+            page_size: Number of items per page
+            branch_id: Optional branch ID
+            params: Additional query parameters
+            cursor: Start at the page with this cursor instead of the first page
+            prefetch: Fetch the following pages in a background task, keeping
+                      up to this many ahead of the consumer
+
+        Yields:
+            Each page of issues
+        """
+        default_params = {
+            'projectId': project_id,
+            '_first': page_size,
+            '_includeType': True,
+            '_includeOccurrenceProperties': True,
+            '_includeTriageProperties': True
+        }
+        if branch_id:
+            default_params['branchId'] = branch_id
+        if params:
+            default_params.update(params)
+        params = default_params
+
+        async def fetch_page(page_cursor: Optional[str]) -> Dict:
+            page_params = dict(params)
+            if page_cursor:
+                page_params['_cursor'] = page_cursor
+            return await self._make_request(
+                'GET',
+                '/api/findings/issues',
+                'application/vnd.polaris.findings.issues-1+json',
+                params=page_params
+            )
+
+        if prefetch > 0:
+            async for page in aiter_prefetched(fetch_page, self.get_next_cursor, cursor,
+                                               prefetch):
+                yield page
+            return
+
+        while True:
+            response = await fetch_page(cursor)
+
+            yield response
+
+            cursor = self.get_next_cursor(response)
+            if not cursor:
+                break
+
+    async def _aiter_cursor_pages(self, fetch_page: Callable[[Dict], Awaitable[Dict]],
+                                  params: Dict) -> AsyncIterator[Dict]:
+        """
+        Walk a cursor-paginated listing
+
+        `fetch_page(params)` is awaited with `params` plus the `_cursor` of
+        each following page.
+
+        Yields:
+            Each page
+        """
+        params = dict(params)
+        while True:
+            response = await fetch_page(dict(params))
+            yield response
+
+            cursor = self.get_next_cursor(response)
+            if not cursor:
+                break
+            params['_cursor'] = cursor
+
+    def get_occurrences_paginated(self, project_id: str, page_size: int = 100,
+                                  params: Optional[Dict] = None) -> AsyncIterator[Dict]:
+        """
+        Get all occurrences of a project using cursor pagination
+
+        Yields:
+            Each page of occurrences
+        """
+        default_params = {'_first': page_size}
+        if params:
+            default_params.update(params)
+
+        return self._aiter_cursor_pages(
+            lambda page_params: self.get_occurrences(project_id=project_id, params=page_params),
+            default_params
+        )
+
+    def get_component_origins_paginated(self, project_id: str, page_size: int = 100,
+                                        params: Optional[Dict] = None) -> AsyncIterator[Dict]:
+        """
+        Get all component origins of a project using cursor pagination
+
+        Yields:
+            Each page of component origins
+        """
+        default_params = {'_first': page_size}
+        if params:
+            default_params.update(params)
+
+        return self._aiter_cursor_pages(
+            lambda page_params: self.get_component_origins(project_id, params=page_params),
+            default_params
+        )
+
+    def get_licenses_paginated(self, project_id: str = None, page_size: int = 100,
+                               include_text: bool = False,
+                               params: Optional[Dict] = None) -> AsyncIterator[Dict]:
+        """
+        Get all licenses using cursor pagination
+
+        Unlike `get_licenses`, license texts are left out unless requested.
+
+        Yields:
+            Each page of licenses
+        """
+        default_params = {
+            '_includeLicenseText': include_text,
+            '_first': page_size
+        }
+        if params:
+            default_params.update(params)
+
+        return self._aiter_cursor_pages(
+            lambda page_params: self.get_licenses(project_id=project_id, params=page_params),
+            default_params
+        )
+
+    def get_taxon_issue_types_paginated(self, taxon_id: str, page_size: int = 100,
+                                        params: Optional[Dict] = None) -> AsyncIterator[Dict]:
+        """
+        Get all issue types of a taxon using cursor pagination
+
+        Yields:
+            Each page of issue types
+        """
+        default_params = {'_first': page_size}
+        if params:
+            default_params.update(params)
+
+        return self._aiter_cursor_pages(
+            lambda page_params: self.get_taxon_issue_types(taxon_id, params=page_params),
+            default_params
+        )
+
+
+class AsyncPolarisPortfolioAPI(_AsyncRequestMixin, PolarisPortfolioAPI):
+    """
+    Asyncio counterpart of PolarisPortfolioAPI
+
+    All endpoint methods of PolarisPortfolioAPI are available and return
+    awaitables, e.g. `await api.get_portfolios()`.
+    """
+
+    async def delete_portfolio_item(self, item_id: str) -> None:
+        """Delete a portfolio item"""
+        await self._make_request(
+            'DELETE',
+            f'/api/portfolio/portfolio-items/{item_id}',
+            'application/vnd.pm.portfolio-items-1+json'
+        )
+
+    async def _aiter_offset_pages(self, fetch_page: Callable[[int], Awaitable[Dict]],
+                                  limit: int, max_workers: int = 8,
+                                  first_page: Optional[Dict] = None) -> AsyncIterator[Dict]:
+        """
+        Fetch the first page, then the remaining offsets concurrently
+
+        Pages are yielded in offset order. At most `max_workers` pages of this
+        listing are in flight, on top of the client wide semaphore, and at
+        most twice that many are fetched or buffered ahead of the consumer.
+        An already fetched page at offset 0 is passed as `first_page`.
+        """
+        if first_page is None:
+            first_page = await fetch_page(0)
+        for item in first_page.get('_items', []):
+            yield item
+
+        page_count = first_page.get('_collection', {}).get('pageCount', 1) or 1
+        listing_semaphore = asyncio.Semaphore(max(1, max_workers))
+
+        async def fetch_bounded(offset: int) -> Dict:
+            async with listing_semaphore:
+                return await fetch_page(offset)
+
+        offsets = (page * limit for page in range(1, page_count))
+        tasks = deque(asyncio.ensure_future(fetch_bounded(offset))
+                      for offset in islice(offsets, 2 * max(1, max_workers)))
+        try:
+            while tasks:
+                page = await tasks.popleft()
+                next_offset = next(offsets, None)
+                if next_offset is not None:
+                    tasks.append(asyncio.ensure_future(fetch_bounded(next_offset)))
+                for item in page.get('_items', []):
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def iter_all_portfolio_items(self, portfolio_id: str, limit: int = 100,
+                                 filter: Optional[str] = None, sort: Optional[str] = None,
+                                 max_workers: int = 8,
+                                 first_page: Optional[Dict] = None) -> AsyncIterator[Dict]:
+        """
+        Iterate over all portfolio items (applications)
+
+        Args:
+            portfolio_id: Portfolio ID
+            limit: Number of items per page
+            max_workers: Maximum number of pages fetched at the same time
+            filter: Optional RSQL filter
+            sort: Optional sort expression
+            first_page: Already fetched page at offset 0, if any
+        """
+        def fetch_page(offset: int):
+            return self.get_portfolio_items(
+                portfolio_id,
+                PaginationParams(limit=limit, offset=offset, filter=filter, sort=sort)
+            )
+        return self._aiter_offset_pages(fetch_page, limit, max_workers, first_page)
+
+    def iter_all_portfolio_item_subitems(self, item_id: str, limit: int = 100,
+                                         params: Optional[Dict] = None,
+                                         max_workers: int = 8,
+                                         first_page: Optional[Dict] = None) -> AsyncIterator[Dict]:
+        """
+        Iterate over all subitems (projects) of a portfolio item
+
+        Args:
+            item_id: Portfolio item ID
+            limit: Number of items per page
+            max_workers: Maximum number of pages fetched at the same time
+            params: Additional query parameters
+            first_page: Already fetched page at offset 0, if any
+        """
+        def fetch_page(offset: int):
+            page_params = dict(params or {})
+            page_params.update({'_limit': limit, '_offset': offset})
+            return self.get_portfolio_item_subitems(item_id, page_params)
+        return self._aiter_offset_pages(fetch_page, limit, max_workers, first_page)
+
+    def iter_all_subitem_branches(self, subitem_id: str, limit: int = 100,
+                                  params: Optional[Dict] = None,
+                                  max_workers: int = 8) -> AsyncIterator[Dict]:
+        """
+        Iterate over all branches of a portfolio subitem
+
+        Args:
+            subitem_id: Portfolio subitem ID
+            limit: Number of items per page
+            max_workers: Maximum number of pages fetched at the same time
+            params: Additional query parameters
+        """
+        def fetch_page(offset: int):
+            page_params = dict(params or {})
+            page_params.update({'_limit': limit, '_offset': offset})
+            return self.get_subitem_branches(subitem_id, page_params)
+        return self._aiter_offset_pages(fetch_page, limit, max_workers)
+
+    def iter_all_test_issues(self, subitem_id: str, test_id: str = 'latest',
+                             limit: int = 100, max_workers: int = 4,
+                             first_page: Optional[Dict] = None) -> AsyncIterator[Dict]:
+        """
+        Iterate over all issues of a test (the latest one by default)
+
+        Args:
+            subitem_id: Portfolio subitem ID
+            test_id: Test ID
+            limit: Number of items per page
+            max_workers: Maximum number of pages fetched at the same time
+            first_page: Already fetched page at offset 0, if any
+        """
+        def fetch_page(offset: int):
+            return self.get_test_issues(subitem_id, test_id, offset=offset, limit=limit)
+        return self._aiter_offset_pages(fetch_page, limit, max_workers, first_page)
+
+
+async def main():
+    """Main function to demonstrate usage"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    logger = logging.getLogger(__name__)
+
+    # Your API token here
+    API_TOKEN = "your_api_token"
+    BASE_URL = 'https://poc.polaris.blackduck.com'
+
+    async with AsyncPolarisPortfolioAPI(BASE_URL, API_TOKEN) as portfolio_api, \
+            AsyncPolarisFindingsAPI(BASE_URL, API_TOKEN) as findings_api:
+        portfolios = await portfolio_api.get_portfolios()
+        portfolio_id = portfolios['_items'][0]['id']
+
+        applications = [item async for item in portfolio_api.iter_all_portfolio_items(portfolio_id)]
+        logger.info(f"Found {len(applications)} applications")
+
+        # Count issues of the first projects concurrently
+        projects = [subitem async for subitem in
+                    portfolio_api.iter_all_portfolio_item_subitems(applications[0]['id'])]
+        counts = await asyncio.gather(*(
+            findings_api.count_issues(project_id=project['id']) for project in projects
+        ))
+        for project, count in zip(projects, counts):
+            logger.info(f"{project['name']}: {count}")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
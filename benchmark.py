@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# benchmark.py - End-to-end throughput benchmarks against the local mock Polaris server
+
+import argparse
+import contextlib
+import importlib.util
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+from mock_server import MockDataset, MockPolarisServer
+
+API_TOKEN = 'benchmark-token'
+APP_NAME = 'bench-app-0'
+PROJECT_NAME = 'bench-project-0'
+DEFAULT_SIZES = (1000, 10000, 100000)
+SCENARIOS = ('reporter', 'issues_detail', 'issues_summary', 'export')
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB, None where unsupported"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _load_report_module():
+    """Import polaris-report.py, whose file name is not a valid module name"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'polaris-report.py')
+    spec = importlib.util.spec_from_file_location('polaris_report', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _run_reporter(base_url: str, workdir: str, concurrency: int) -> None:
+    """PolarisReporter.generate_report with details, snippets and assist per finding"""
+    report = _load_report_module()
+    config = report.ReportConfig(
+        base_url=base_url,
+        api_token=API_TOKEN,
+        app_name=APP_NAME,
+        project_name=PROJECT_NAME,
+        concurrency=concurrency,
+        cache_dir=workdir,
+        output_format='jsonl',
+        output_file=os.path.join(workdir, 'report.jsonl')
+    )
+    report.PolarisReporter(config).generate_report()
+
+
+def _run_issues_detail(base_url: str, workdir: str, summary_only: bool = False) -> None:
+    """get_issues_detail.py main(), run in the work directory it writes its report to"""
+    import get_issues_detail
+    argv = ['get_issues_detail.py', base_url, API_TOKEN, APP_NAME, PROJECT_NAME]
+    if summary_only:
+        argv.append('--summary-only')
+    sys.argv = argv
+    os.environ['POLARIS_CACHE_DIR'] = workdir
+    os.chdir(workdir)
+    get_issues_detail.main()
+
+
+def _run_export(base_url: str, workdir: str, concurrency: int) -> None:
+    """PolarisExporter.run(), the Python port of polaris-api-shell.sh"""
+    from polaris_export import PolarisExporter
+    from portfolio import PolarisPortfolioAPI
+    PolarisExporter(
+        PolarisPortfolioAPI(base_url, API_TOKEN),
+        output_dir=os.path.join(workdir, 'polaris_output'),
+        app_filter=APP_NAME,
+        project_filter=PROJECT_NAME,
+        max_workers=concurrency
+    ).run()
+
+
+def _run_scenario(scenario: str, base_url: str, workdir: str, concurrency: int,
+                  results) -> None:
+    """
+    Run one scenario in a fresh interpreter and report timing and memory
+
+    Runs in a spawned child process, so peak memory covers this scenario
+    only and not the server or earlier runs.
+    """
+    logging.basicConfig(level=logging.WARNING)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    baseline = _peak_rss_mb()
+    error = None
+    started = time.perf_counter()
+    try:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            if scenario == 'reporter':
+                _run_reporter(base_url, workdir, concurrency)
+            elif scenario == 'issues_detail':
+                _run_issues_detail(base_url, workdir)
+            elif scenario == 'issues_summary':
+                _run_issues_detail(base_url, workdir, summary_only=True)
+            elif scenario == 'export':
+                _run_export(base_url, workdir, concurrency)
+            else:
+                raise ValueError(f"Unknown scenario: {scenario}")
+    except BaseException as e:
+        # get_issues_detail.py exits through sys.exit on errors
+        error = f"{type(e).__name__}: {e}"
+    results.put({
+        'elapsed': time.perf_counter() - started,
+        'baseline_rss_mb': baseline,
+        'peak_rss_mb': _peak_rss_mb(),
+        'error': error
+    })
+
+
+def run_benchmark(server: MockPolarisServer, scenario: str, concurrency: int = 8) -> Dict:
+    """
+    Run a scenario against a started server
+
+    Returns:
+        Wall time, requests served and requests/sec, peak memory, errors
+    """
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    before = server.stats.snapshot()
+    with tempfile.TemporaryDirectory(prefix='polaris_bench_') as workdir:
+        process = context.Process(target=_run_scenario,
+                                  args=(scenario, server.base_url, workdir, concurrency, results))
+        process.start()
+        result = results.get()
+        process.join()
+    after = server.stats.snapshot()
+
+    requests = after['requests'] - before['requests']
+    result.update({
+        'scenario': scenario,
+        'issues': len(server.dataset.issue_ids),
+        'requests': requests,
+        'requests_per_sec': requests / result['elapsed'] if result['elapsed'] else 0.0,
+        'server_errors': after['errors'] - before['errors'],
+        'throttled': after['throttled'] - before['throttled'],
+        'bytes_sent': after['bytes_sent'] - before['bytes_sent']
+    })
+    if result['peak_rss_mb'] is not None and result['baseline_rss_mb'] is not None:
+        result['rss_growth_mb'] = result['peak_rss_mb'] - result['baseline_rss_mb']
+    return result
+
+
+def print_results(results: List[Dict]) -> None:
+    """Print the results as a table"""
+    print(f"\n{'scenario':<16}{'issues':>9}{'time (s)':>10}{'requests':>10}{'req/s':>9}"
+          f"{'peak MB':>9}{'growth MB':>11}  errors")
+    for result in results:
+        peak = result.get('peak_rss_mb')
+        growth = result.get('rss_growth_mb')
+        errors = result['server_errors'] + result['throttled']
+        print(f"{result['scenario']:<16}{result['issues']:>9}{result['elapsed']:>10.2f}"
+              f"{result['requests']:>10}{result['requests_per_sec']:>9.0f}"
+              f"{peak if peak is not None else float('nan'):>9.1f}"
+              f"{growth if growth is not None else float('nan'):>11.1f}  "
+              f"{errors}{' ' + result['error'] if result.get('error') else ''}")
+
+
+def main() -> None:
+    """Benchmark the report, detail and export paths at several dataset sizes"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    parser = argparse.ArgumentParser(description='Polaris client benchmarks against a mock server')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help='Issue counts to benchmark (default: 1000 10000 100000)')
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS),
+                        help='Scenarios to run (default: all)')
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help='Client concurrency of the reporter and export (default: 8)')
+    parser.add_argument('--fixtures', default='polaris_output',
+                        help='Fixture directory the issues are cloned from (default: polaris_output)')
+    parser.add_argument('--latency', type=float, default=0.0, help='Server seconds per response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Random extra seconds per response')
+    parser.add_argument('--assist-latency', type=float, default=0.0,
+                        help='Extra server seconds per assist response')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='Fraction of requests answered with 500')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0,
+                        help='Fraction of requests answered with 429')
+    parser.add_argument('--quota', type=float,
+                        help='Requests per second the server serves before answering 429')
+    parser.add_argument('--output', help='Also write the results to this JSON file')
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        dataset = MockDataset.synthetic(size, fixtures_dir=args.fixtures)
+        with MockPolarisServer(dataset, latency=args.latency, jitter=args.jitter,
+                               assist_latency=args.assist_latency, error_rate=args.error_rate,
+                               rate_limit_rate=args.rate_limit_rate,
+                               quota=args.quota) as server:
+            for scenario in args.scenarios:
+                logging.info(f"Running {scenario} with {size} issues")
+                result = run_benchmark(server, scenario, args.concurrency)
+                results.append(result)
+                logging.info(
+                    f"{scenario}: {result['elapsed']:.2f}s, {result['requests']} requests "
+                    f"({result['requests_per_sec']:.0f}/s)"
+                )
+
+    print_results(results)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
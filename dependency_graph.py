@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+# dependency_graph.py - Dependency graph of a project built from component origins
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Union
+from findings import PolarisFindingsAPI
+
+# Keys a match may hold its dependency path under, from direct dependency to origin
+PATH_KEYS = ('dependencyPath', 'path', 'paths', 'dependencies')
+# Keys whose non-empty value marks a component version as vulnerable
+VULNERABILITY_KEYS = ('vulnerabilities', 'vulnerabilityCount', 'securityRisk')
+
+
+def node_id(node: Union[Dict, str]) -> Optional[str]:
+    """Component version ID of a path node or origin"""
+    if not isinstance(node, dict):
+        return str(node) if node else None
+    version = node.get('componentVersion') or {}
+    return node.get('componentVersionId') or version.get('id') or node.get('id')
+
+
+def node_info(node: Union[Dict, str]) -> Dict:
+    """Name, version and vulnerability flag of a path node or origin"""
+    if not isinstance(node, dict):
+        return {}
+    version = node.get('componentVersion') or {}
+    component = node.get('component') or version.get('component') or {}
+    info = {
+        'name': node.get('componentName') or component.get('name') or node.get('name'),
+        'version': node.get('versionName') or version.get('version') or version.get('name')
+                   or node.get('version')
+    }
+    for source in (node, version):
+        for key in VULNERABILITY_KEYS:
+            value = source.get(key)
+            if value and str(value).lower() not in ('none', 'ok', '0'):
+                info['vulnerable'] = True
+    return {key: value for key, value in info.items() if value is not None}
+
+
+def match_paths(response: Dict) -> Iterator[List[Union[Dict, str]]]:
+    """Dependency paths in an origin matches response"""
+    for item in response.get('_items', []):
+        for key in PATH_KEYS:
+            value = item.get(key)
+            if not value:
+                continue
+            if isinstance(value[0], list):
+                yield from value
+            else:
+                yield value
+            break
+
+
+class DependencyGraph:
+    """
+    Adjacency index of the component versions of a project
+
+    Edges point from a dependency to what it pulls in; roots are the direct
+    dependencies. Both directions are indexed, so "which direct dependency
+    pulls in this version" and "which vulnerable versions does this direct
+    dependency reach" are plain graph walks with no API calls.
+    """
+
+    def __init__(self, project_id: str, fingerprint: Optional[str] = None):
+        self.project_id = project_id
+        self.fingerprint = fingerprint
+        self.built_at = time.time()
+        self.nodes: Dict[str, Dict] = {}
+        self.children: Dict[str, Set[str]] = {}
+        self.parents: Dict[str, Set[str]] = {}
+        self.roots: Set[str] = set()
+
+    # Construction
+    def add_node(self, version_id: str, info: Optional[Dict] = None) -> None:
+        """Add a component version, merging known attributes"""
+        node = self.nodes.setdefault(version_id, {})
+        for key, value in (info or {}).items():
+            if value is not None and node.get(key) is None:
+                node[key] = value
+        self.children.setdefault(version_id, set())
+        self.parents.setdefault(version_id, set())
+
+    def add_path(self, path: Iterable[Union[Dict, str]]) -> None:
+        """Add a dependency path, starting at a direct dependency"""
+        previous = None
+        for node in path:
+            version_id = node_id(node)
+            if not version_id:
+                continue
+            self.add_node(version_id, node_info(node))
+            if previous is None:
+                self.roots.add(version_id)
+            elif previous != version_id:
+                self.children[previous].add(version_id)
+                self.parents[version_id].add(previous)
+            previous = version_id
+
+    def mark_vulnerable(self, version_ids: Iterable[str]) -> None:
+        """Flag component versions as vulnerable, e.g. from component version triage"""
+        for version_id in version_ids:
+            if version_id in self.nodes:
+                self.nodes[version_id]['vulnerable'] = True
+
+    # Queries
+    def direct_dependencies_of(self, version_id: str) -> Set[str]:
+        """Direct dependencies that pull in a component version"""
+        seen = {version_id}
+        queue = deque([version_id])
+        result = set()
+        while queue:
+            current = queue.popleft()
+            if current in self.roots:
+                result.add(current)
+            for parent in self.parents.get(current, ()):
+                if parent not in seen:
+                    seen.add(parent)
+                    queue.append(parent)
+        return result
+
+    def paths_to(self, version_id: str, max_paths: int = 1000) -> List[List[str]]:
+        """
+        Every dependency path from a direct dependency to a component version
+
+        Args:
+            version_id: Target component version
+            max_paths: Stop after this many paths
+        """
+        paths: List[List[str]] = []
+        stack = [(version_id, [version_id])]
+        while stack and len(paths) < max_paths:
+            current, path = stack.pop()
+            if current in self.roots:
+                paths.append(path[::-1])
+            for parent in self.parents.get(current, ()):
+                if parent not in path:
+                    stack.append((parent, path + [parent]))
+        return paths
+
+    def reachable_from(self, version_id: str) -> Set[str]:
+        """Every component version a dependency pulls in, transitively"""
+        seen: Set[str] = set()
+        queue = deque(self.children.get(version_id, ()))
+        while queue:
+            current = queue.popleft()
+            if current in seen:
+                continue
+            seen.add(current)
+            queue.extend(self.children.get(current, ()))
+        return seen
+
+    def vulnerable_reachable_from(self, version_id: str) -> Set[str]:
+        """Vulnerable component versions a dependency pulls in, itself included"""
+        candidates = self.reachable_from(version_id) | {version_id}
+        return {node for node in candidates if self.nodes.get(node, {}).get('vulnerable')}
+
+    def label(self, version_id: str) -> str:
+        """Readable name of a component version"""
+        node = self.nodes.get(version_id, {})
+        if node.get('name'):
+            return f"{node['name']} {node.get('version') or ''}".strip()
+        return version_id
+
+    # Persistence
+    def to_dict(self) -> Dict:
+        return {
+            'project_id': self.project_id,
+            'fingerprint': self.fingerprint,
+            'built_at': self.built_at,
+            'nodes': self.nodes,
+            'edges': {parent: sorted(children) for parent, children in self.children.items()
+                      if children},
+            'roots': sorted(self.roots)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'DependencyGraph':
+        graph = cls(data['project_id'], data.get('fingerprint'))
+        graph.built_at = data.get('built_at', graph.built_at)
+        for version_id, info in data.get('nodes', {}).items():
+            graph.add_node(version_id, info)
+        for parent, children in data.get('edges', {}).items():
+            for child in children:
+                graph.add_node(parent)
+                graph.add_node(child)
+                graph.children[parent].add(child)
+                graph.parents[child].add(parent)
+        graph.roots = set(data.get('roots', []))
+        return graph
+
+    def save(self, path: str) -> None:
+        """Write the graph as JSON atomically"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional['DependencyGraph']:
+        """Read a saved graph, None if missing or unreadable"""
+        try:
+            with open(path, encoding='utf-8') as f:
+                return cls.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError):
+            return None
+
+
+class DependencyGraphBuilder:
+    """
+    Builds project dependency graphs from component origins and their matches
+
+    All origins are listed first and their matches fetched concurrently on a
+    bounded pool. Graphs are saved per project together with a fingerprint of
+    the origin listing (or the given scan ID); a later build for the same
+    scan loads the saved graph instead of crawling the matches again.
+    """
+
+    def __init__(self, findings_api: PolarisFindingsAPI,
+                 cache_dir: str = '.polaris_cache/dependency_graphs',
+                 max_workers: int = 8):
+        """
+        Initialize the builder
+
+        Args:
+            findings_api: Findings API client
+            cache_dir: Directory the graphs are saved to
+            max_workers: Number of origin match requests in flight
+        """
+        self.findings_api = findings_api
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.logger = logging.getLogger(__name__)
+
+    def _path(self, project_id: str) -> str:
+        return os.path.join(self.cache_dir, f"{project_id}.json")
+
+    @staticmethod
+    def fingerprint(origins: List[Dict]) -> str:
+        """Fingerprint of an origin listing, changes when a new scan changes the origins"""
+        raw = json.dumps(sorted(json.dumps(origin, sort_keys=True, default=str)
+                                for origin in origins))
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def _matches(self, origin_id: str, project_id: str) -> Optional[Dict]:
+        try:
+            return self.findings_api.get_component_origin_matches(origin_id, project_id)
+        except Exception as e:
+            self.logger.warning(f"Error getting matches of origin {origin_id}: {str(e)}")
+            return None
+
+    def build(self, project_id: str, scan_id: Optional[str] = None,
+              force: bool = False) -> DependencyGraph:
+        """
+        Build the dependency graph of a project, reusing a saved one for the same scan
+
+        Args:
+            project_id: Project ID
+            scan_id: Identifier of the scan; the origin listing fingerprint if omitted
+            force: Rebuild even if a saved graph matches
+        """
+        started = time.time()
+        origins = [
+            origin
+            for page in self.findings_api.get_component_origins_paginated(project_id)
+            for origin in page.get('_items', [])
+        ]
+        fingerprint = scan_id or self.fingerprint(origins)
+
+        if not force:
+            cached = DependencyGraph.load(self._path(project_id))
+            if cached is not None and cached.fingerprint == fingerprint:
+                self.logger.info(f"Using saved dependency graph of project {project_id}")
+                return cached
+
+        graph = DependencyGraph(project_id, fingerprint)
+        for origin in origins:
+            version_id = node_id(origin)
+            if version_id:
+                graph.add_node(version_id, node_info(origin))
+
+        origin_ids = [origin['id'] for origin in origins if origin.get('id')]
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+            responses = executor.map(lambda origin_id: self._matches(origin_id, project_id),
+                                     origin_ids)
+            for origin, response in zip((o for o in origins if o.get('id')), responses):
+                if not response:
+                    continue
+                for path in match_paths(response):
+                    if not path:
+                        continue
+                    # Paths end at the origin; append it if the server leaves it out
+                    if node_id(path[-1]) != node_id(origin):
+                        path = list(path) + [origin]
+                    graph.add_path(path)
+
+        graph.save(self._path(project_id))
+        self.logger.info(
+            f"Built dependency graph of {len(graph.nodes)} versions from {len(origins)} origins "
+            f"in {time.time() - started:.1f}s"
+        )
+        return graph
+
+
+def main() -> None:
+    """Build a project dependency graph and show where vulnerable versions come from"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    parser = argparse.ArgumentParser(description='Project dependency graph from component origins')
+    parser.add_argument('base_url', help='Polaris base URL')
+    parser.add_argument('api_token', help='API token')
+    parser.add_argument('project_id', help='Project ID')
+    parser.add_argument('--workers', type=int, default=8, help='Parallel match requests (default: 8)')
+    parser.add_argument('--force', action='store_true', help='Rebuild even if a saved graph matches')
+    args = parser.parse_args()
+
+    builder = DependencyGraphBuilder(PolarisFindingsAPI(args.base_url, args.api_token),
+                                     max_workers=args.workers)
+    graph = builder.build(args.project_id, force=args.force)
+    print(f"{len(graph.nodes)} component versions, {len(graph.roots)} direct dependencies")
+    for root in sorted(graph.roots, key=graph.label):
+        vulnerable = graph.vulnerable_reachable_from(root)
+        if vulnerable:
+            print(f"{graph.label(root)} pulls in: {', '.join(sorted(map(graph.label, vulnerable)))}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,37 +1,43 @@
 # findings.py - Polaris Findings API Client
 
 import requests
-from typing import Dict, List, Optional, Union, Iterator
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Union, Iterator
 import logging
-import time
+from page_prefetch import iter_prefetched
+from response_cache import ResponseCache
+from transport import PolarisTransport, get_shared_transport
 
 class PolarisFindingsAPI:
     """
     A class to handle all Polaris Findings API endpoints
     """
     
-    def __init__(self, base_url: str, api_token: str):
+    def __init__(self, base_url: str, api_token: str, cache: Optional[ResponseCache] = None,
+                 transport: Optional[PolarisTransport] = None):
         """
         Initialize the API handler
         
         Args:
             base_url: Base URL for the Polaris instance
             api_token: API token for authentication
+            cache: Optional on-disk cache for GET responses
+            transport: Pooled HTTP transport, the shared default if omitted
         """
         self.base_url = base_url.rstrip('/')
         self.api_token = api_token
         self.headers = {
-            'Api-Token': api_token
-        }
-        self.logger = logging.getLogger(__name__)
-        self.session = requests.Session()
-        self.session.headers.update({
             'Api-Token': api_token,
             'Accept-Language': 'en-US'
-        })
+        }
+        self.cache = cache
+        self.transport = transport or get_shared_transport()
+        self.session = self.transport.session
+        self.logger = logging.getLogger(__name__)
 
     def _make_request(self, method: str, endpoint: str, accept_type: str, 
-                     params: Optional[Dict] = None, data: Optional[Dict] = None) -> Dict:
+                     params: Optional[Dict] = None, data: Optional[Dict] = None,
+                     raw: bool = False, output_file: Optional[Union[str, BinaryIO]] = None,
+                     hasher: Optional[Any] = None) -> Any:
         """
         Make HTTP request to Polaris API with improved error handling
         
@@ -41,26 +47,40 @@ class PolarisFindingsAPI:
             accept_type: Accept header type
             params: Query parameters
             data: Request body data
+            raw: Return the undecoded response bytes
+            output_file: Stream the response body to this file path or binary
+                         buffer instead of decoding it
+            hasher: hashlib object updated with the streamed body
             
         Returns:
-            API response as dictionary
+            API response as dictionary, the response bytes if `raw` is set, or
+            the number of bytes written if `output_file` is given
         """
         headers = self.headers.copy()
         headers['Accept'] = accept_type
         
-        url = f"{self.base_url}{endpoint}"
-        
         try:
-            response = self.session.request(
-                method=method,
-                url=url,
-                headers=headers,
+            if output_file:
+                return self.transport.download(
+                    method,
+                    self.base_url,
+                    endpoint,
+                    headers,
+                    output_file,
+                    params=params,
+                    data=data,
+                    hasher=hasher
+                )
+            request = self.transport.request_raw if raw else self.transport.request_json
+            return request(
+                method,
+                self.base_url,
+                endpoint,
+                headers,
                 params=params,
-                json=data,
-                timeout=30  # Add timeout
+                data=data,
+                cache=self.cache
             )
-            response.raise_for_status()
-            return response.json()
         except requests.exceptions.Timeout:
             self.logger.error("Request timed out")
             raise
@@ -117,49 +137,100 @@ class PolarisFindingsAPI:
             params=default_params
         )
 
-    def get_issues_paginated(self, project_id: str, page_size: int = 100) -> Iterator[Dict]:
+    def get_issues_paginated(self, project_id: str, page_size: int = 100,
+                             branch_id: str = None,
+                             params: Optional[Dict] = None,
+                             cursor: Optional[str] = None,
+                             prefetch: int = 0) -> Iterator[Dict]:
         """
         Get all issues using pagination
         
         Args:
             project_id: Project ID
             page_size: Number of items per page
+            branch_id: Optional branch ID
+            params: Additional query parameters
+            cursor: Start at the page with this cursor, e.g. one saved by an
+                    earlier run, instead of the first page
+            prefetch: Fetch the following pages in the background, keeping up
+                      to this many ahead of the consumer; 0 fetches each page
+                      only when the previous one has been processed
             
         Yields:
-            Each page of issues
+            Each page of issues; the cursor of the page after a page is
+            `get_next_cursor(page)`
         """
-        params = {
+        default_params = {
             'projectId': project_id,
             '_first': page_size,
             '_includeType': True,
             '_includeOccurrenceProperties': True,
             '_includeTriageProperties': True
         }
+        if branch_id:
+            default_params['branchId'] = branch_id
+        if params:
+            default_params.update(params)
+        params = default_params
         
-        while True:
-            response = self._make_request(
+        def fetch_page(page_cursor: Optional[str]) -> Dict:
+            page_params = dict(params)
+            if page_cursor:
+                page_params['_cursor'] = page_cursor
+            return self._make_request(
                 'GET',
                 '/api/findings/issues',
                 'application/vnd.polaris.findings.issues-1+json',
-                params=params
+                params=page_params
             )
             
+        if prefetch > 0:
+            yield from iter_prefetched(fetch_page, self.get_next_cursor, cursor, prefetch)
+            return
+            
+        while True:
+            response = fetch_page(cursor)
+            
             yield response
             
             # Check for next page
-            next_link = next(
-                (link for link in response.get('_links', []) 
-                 if link.get('rel') == 'next'),
-                None
-            )
+            cursor = self.get_next_cursor(response)
+            if not cursor:
+                break
+
+    def _iter_cursor_pages(self, fetch_page: Callable[[Dict], Any], params: Dict) -> Iterator[Dict]:
+        """
+        Walk a cursor-paginated listing
+        
+        `fetch_page(params)` is called with `params` plus the `_cursor` of
+        each following page.
+        
+        Yields:
+            Each page
+        """
+        params = dict(params)
+        while True:
+            response = fetch_page(dict(params))
+            yield response
             
-            if not next_link:
+            cursor = self.get_next_cursor(response)
+            if not cursor:
                 break
-                
-            # Extract cursor from next link
-            cursor = next_link['href'].split('_cursor=')[1].split('&')[0]
             params['_cursor'] = cursor
 
+    @staticmethod
+    def get_next_cursor(response: Dict) -> Optional[str]:
+        """Extract the cursor of the next page from a paginated response"""
+        next_link = next(
+            (link for link in response.get('_links', []) 
+             if link.get('rel') == 'next'),
+            None
+        )
+        if not next_link or '_cursor=' not in next_link.get('href', ''):
+            return None
+            
+        return next_link['href'].split('_cursor=')[1].split('&')[0]
+
     def get_issues_with_filter(self, project_id: str, 
                              severity: Optional[str] = None,
                              language: Optional[str] = None,
@@ -203,24 +274,28 @@ class PolarisFindingsAPI:
             params=params
         )
 
-    def get_group_counts(self, project_id: str, group_by: str) -> Dict:
+    def get_group_counts(self, project_id: str, group_by: str,
+                         params: Optional[Dict] = None) -> Dict:
         """
         Get counts grouped by a specific field
         
         Args:
             project_id: Project ID
             group_by: Field to group by (e.g., 'occurrence:severity', 'occurrence:language')
+            params: Additional query parameters, e.g. a `_filter` or `branchId`
         """
-        params = {
+        default_params = {
             'projectId': project_id,
             '_group': group_by
         }
+        if params:
+            default_params.update(params)
         
         return self._make_request(
             'GET',
             '/api/findings/issues/_actions/count',
             'application/vnd.polaris.findings.issues-1+json',
-            params=params
+            params=default_params
         )
 
     def get_issue_triage_history(self, issue_id: str, app_id: str = None,
@@ -340,6 +415,23 @@ class PolarisFindingsAPI:
             params=default_params
         )
 
+    def get_occurrences_paginated(self, project_id: str, page_size: int = 100,
+                                  params: Optional[Dict] = None) -> Iterator[Dict]:
+        """
+        Get all occurrences of a project using cursor pagination
+        
+        Yields:
+            Each page of occurrences
+        """
+        default_params = {'_first': page_size}
+        if params:
+            default_params.update(params)
+            
+        return self._iter_cursor_pages(
+            lambda page_params: self.get_occurrences(project_id=project_id, params=page_params),
+            default_params
+        )
+
     def get_occurrence_by_id(self, occurrence_id: str, app_id: str = None,
                             project_id: str = None) -> Dict:
         """Get occurrence by ID"""
@@ -375,6 +467,30 @@ class PolarisFindingsAPI:
             params=params
         )
 
+    def download_occurrence_snippet(self, occurrence_id: str, target: Union[str, BinaryIO],
+                                    app_id: str = None, project_id: str = None,
+                                    hasher: Optional[Any] = None) -> int:
+        """
+        Stream the undecoded code snippet JSON of an occurrence to a file or buffer
+        
+        Returns:
+            Number of bytes written
+        """
+        params = {}
+        if app_id:
+            params['applicationId'] = app_id
+        if project_id:
+            params['projectId'] = project_id
+            
+        return self._make_request(
+            'GET',
+            f'/api/findings/occurrences/{occurrence_id}/snippet',
+            'application/vnd.polaris.findings.occurrences-1+json',
+            params=params,
+            output_file=target,
+            hasher=hasher
+        )
+
     def get_occurrence_assist(self, occurrence_id: str, app_id: str = None,
                             project_id: str = None) -> Dict:
         """Get AI assistance for occurrence"""
@@ -391,30 +507,18 @@ class PolarisFindingsAPI:
             params=params
         )
 
-    def get_occurrence_assist_with_retry(self, occurrence_id: str, project_id: str,
-                                       max_retries: int = 3, delay: float = 1.0) -> Dict:
+    def get_occurrence_assist_with_retry(self, occurrence_id: str, project_id: str) -> Dict:
         """
-        Get AI assistance with retry logic
+        Get AI assistance for an occurrence of a project
+
+        Failed requests, 429 and 503 responses are retried by the transport,
+        with its `max_retries` and backoff.
         """
-        params = {'projectId': project_id}
-        
-        for attempt in range(max_retries):
-            try:
-                return self._make_request(
-                    'GET',
-                    f'/api/findings/occurrences/{occurrence_id}/assist',
-                    'application/vnd.polaris.findings.occurrences-1+json',
-                    params=params
-                )
-            except requests.exceptions.RequestException as e:
-                if attempt == max_retries - 1:
-                    raise
-                self.logger.warning(f"Retry {attempt + 1}/{max_retries} after error: {str(e)}")
-                time.sleep(delay * (attempt + 1))  # Exponential backoff
+        return self.get_occurrence_assist(occurrence_id, project_id=project_id)
 
     def get_occurrence_artifact(self, occurrence_id: str, artifact_id: str,
-                              app_id: str = None, project_id: str = None) -> Dict:
-        """Get occurrence artifact"""
+                              app_id: str = None, project_id: str = None) -> bytes:
+        """Get occurrence artifact as raw bytes (the endpoint returns text/plain)"""
         params = {}
         if app_id:
             params['applicationId'] = app_id
@@ -425,7 +529,40 @@ class PolarisFindingsAPI:
             'GET',
             f'/api/findings/occurrences/{occurrence_id}/artifacts/{artifact_id}',
             'text/plain',
-            params=params
+            params=params,
+            raw=True
+        )
+
+    def download_occurrence_artifact(self, occurrence_id: str, artifact_id: str,
+                                     target: Union[str, BinaryIO], app_id: str = None,
+                                     project_id: str = None, hasher: Optional[Any] = None) -> int:
+        """
+        Stream an occurrence artifact to a file or buffer
+        
+        Args:
+            occurrence_id: Occurrence ID
+            artifact_id: Artifact ID
+            target: File path or writable binary object
+            app_id: Optional application ID
+            project_id: Optional project ID
+            hasher: hashlib object updated with the artifact content
+            
+        Returns:
+            Number of bytes written
+        """
+        params = {}
+        if app_id:
+            params['applicationId'] = app_id
+        if project_id:
+            params['projectId'] = project_id
+            
+        return self._make_request(
+            'GET',
+            f'/api/findings/occurrences/{occurrence_id}/artifacts/{artifact_id}',
+            'text/plain',
+            params=params,
+            output_file=target,
+            hasher=hasher
         )
 
     # Component Version endpoints
@@ -522,6 +659,23 @@ class PolarisFindingsAPI:
             params=default_params
         )
 
+    def get_component_origins_paginated(self, project_id: str, page_size: int = 100,
+                                        params: Optional[Dict] = None) -> Iterator[Dict]:
+        """
+        Get all component origins of a project using cursor pagination
+        
+        Yields:
+            Each page of component origins
+        """
+        default_params = {'_first': page_size}
+        if params:
+            default_params.update(params)
+            
+        return self._iter_cursor_pages(
+            lambda page_params: self.get_component_origins(project_id, params=page_params),
+            default_params
+        )
+
     def get_component_origin_matches(self, origin_id: str, project_id: str,
                                    params: Optional[Dict] = None) -> Dict:
         """Get dependency paths for component origin"""
@@ -568,6 +722,29 @@ class PolarisFindingsAPI:
             params=default_params
         )
 
+    def get_licenses_paginated(self, project_id: str = None, page_size: int = 100,
+                               include_text: bool = False,
+                               params: Optional[Dict] = None) -> Iterator[Dict]:
+        """
+        Get all licenses using cursor pagination
+        
+        Unlike `get_licenses`, license texts are left out unless requested.
+        
+        Yields:
+            Each page of licenses
+        """
+        default_params = {
+            '_includeLicenseText': include_text,
+            '_first': page_size
+        }
+        if params:
+            default_params.update(params)
+            
+        return self._iter_cursor_pages(
+            lambda page_params: self.get_licenses(project_id=project_id, params=page_params),
+            default_params
+        )
+
     def count_licenses(self, project_id: str, params: Optional[Dict] = None) -> Dict:
         """Count licenses with optional grouping"""
         default_params = {
@@ -610,6 +787,23 @@ class PolarisFindingsAPI:
             params=params
         )
 
+    def get_taxon_issue_types_paginated(self, taxon_id: str, page_size: int = 100,
+                                        params: Optional[Dict] = None) -> Iterator[Dict]:
+        """
+        Get all issue types of a taxon using cursor pagination
+        
+        Yields:
+            Each page of issue types
+        """
+        default_params = {'_first': page_size}
+        if params:
+            default_params.update(params)
+            
+        return self._iter_cursor_pages(
+            lambda page_params: self.get_taxon_issue_types(taxon_id, params=page_params),
+            default_params
+        )
+
     def get_taxonomies(self, include_descendants: bool = False,
                       include_only_standards: bool = False) -> Dict:
         """
@@ -1,44 +1,24 @@
 #!/usr/bin/env python3
 
+import os
 import sys
 import logging
 from datetime import datetime
 import json
 from findings import PolarisFindingsAPI
-from portfolio import PolarisPortfolioAPI, PaginationParams
+from issue_summary import fetch_issue_summary, print_count_summary, summary_total
+from models import Finding
+from portfolio import PolarisPortfolioAPI
+from portfolio_resolver import PortfolioResolver
+from response_cache import ResponseCache
 
 def find_project_and_app(portfolio_api: PolarisPortfolioAPI, app_name: str, project_name: str):
     """
     Find application ID and project ID by their names
     """
-    portfolios = portfolio_api.get_portfolios()
-    if not portfolios.get('_items'):
-        return None, None
-        
-    portfolio_id = portfolios['_items'][0]['id']
-    
-    # Get portfolio items with pagination
-    pagination = PaginationParams(limit=100)
-    items = portfolio_api.get_portfolio_items(portfolio_id, pagination)
-    
-    # Find application
-    app_id = None
-    project_id = None
-    
-    for item in items.get('_items', []):
-        if item.get('name') == app_name:
-            app_id = item.get('id')
-            
-            # Get projects in this application
-            if app_id:
-                subitems = portfolio_api.get_portfolio_item_subitems(app_id)
-                for subitem in subitems.get('_items', []):
-                    if subitem.get('name') == project_name:
-                        project_id = subitem.get('id')
-                        break
-            break
-            
-    return app_id, project_id
+    cache_dir = os.environ.get('POLARIS_CACHE_DIR') or '.polaris_cache'
+    resolver = PortfolioResolver(portfolio_api, path=os.path.join(cache_dir, 'portfolio_index.json'))
+    return resolver.resolve_project(app_name, project_name)
 
 def save_report(data: dict, prefix: str = "issues_report"):
     """Save data to a JSON file"""
@@ -61,12 +41,11 @@ def print_issues_summary(issues: list):
     status_count = {}
     
     for issue in issues:
-        occurrence = issue.get('occurrence', {})
-        severity = occurrence.get('severity', 'Unknown')
+        finding = Finding.from_dict(issue)
+        severity = finding.occurrence.severity or issue.get('occurrence', {}).get('severity', 'Unknown')
         severity_count[severity] = severity_count.get(severity, 0) + 1
         
-        triage = issue.get('triage', {})
-        status = triage.get('status', 'Unknown')
+        status = finding.triage.status or issue.get('triage', {}).get('status', 'Unknown')
         status_count[status] = status_count.get(status, 0) + 1
     
     print("\nIssues by severity:")
@@ -83,19 +62,27 @@ def main():
         format='%(asctime)s - %(levelname)s - %(message)s'
     )
 
-    if len(sys.argv) != 5:
-        print("Usage: python get_issues_detail.py <base_url> <api_token> <application_name> <project_name>")
+    # --summary-only builds the distributions from grouped counts instead of issues
+    args = [arg for arg in sys.argv[1:] if arg != '--summary-only']
+    summary_only = len(args) != len(sys.argv) - 1
+    
+    if len(args) != 4:
+        print("Usage: python get_issues_detail.py <base_url> <api_token> <application_name> <project_name> [--summary-only]")
         sys.exit(1)
     
-    base_url = sys.argv[1]
-    api_token = sys.argv[2]
-    app_name = sys.argv[3]      # e.g., "allenl_applications"
-    project_name = sys.argv[4]  # e.g., "WebGoat"
+    base_url = args[0]
+    api_token = args[1]
+    app_name = args[2]      # e.g., "allenl_applications"
+    project_name = args[3]  # e.g., "WebGoat"
     
     try:
-        # Initialize APIs
-        findings_api = PolarisFindingsAPI(base_url, api_token)
-        portfolio_api = PolarisPortfolioAPI(base_url, api_token)
+        # Initialize APIs, sharing a response cache when POLARIS_CACHE_DIR is set
+        cache = None
+        cache_dir = os.environ.get('POLARIS_CACHE_DIR')
+        if cache_dir:
+            cache = ResponseCache(os.path.join(cache_dir, 'responses.sqlite'))
+        findings_api = PolarisFindingsAPI(base_url, api_token, cache=cache)
+        portfolio_api = PolarisPortfolioAPI(base_url, api_token, cache=cache)
         
         # Get project and application IDs
         logging.info(f"Looking for project '{project_name}' in application '{app_name}'")
@@ -109,6 +96,21 @@ def main():
             logging.error(f"Project '{project_name}' not found in application '{app_name}'")
             sys.exit(1)
         
+        if summary_only:
+            logging.info("Counting issues...")
+            summary = fetch_issue_summary(findings_api, project_id)
+            report_file = save_report({
+                'application_name': app_name,
+                'project_name': project_name,
+                'application_id': app_id,
+                'project_id': project_id,
+                'total_issues': summary_total(summary),
+                'summary': summary
+            }, f"issues_summary_{app_name}_{project_name}")
+            print_count_summary(summary)
+            print(f"\nSummary saved to: {report_file}")
+            return
+        
         # Get issues using findings API
         logging.info("Fetching issues...")
         issues = findings_api.get_issues(
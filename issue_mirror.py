@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+# issue_mirror.py - Incremental local mirror of Polaris project issues
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence
+from findings import PolarisFindingsAPI
+from partitioned_fetch import DEFAULT_PARTITION_KEYS, iter_issues_partitioned, plan_partitions
+
+@dataclass
+class SyncResult:
+    """Outcome of one mirror sync"""
+    project_id: str
+    branch_id: Optional[str]
+    unchanged: bool = False
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    retriaged: List[str] = field(default_factory=list)
+    total: int = 0
+    elapsed: float = 0.0
+
+
+class IssueMirror:
+    """
+    Local SQLite mirror of the issues of Polaris projects and branches
+
+    A sync lists issue IDs with their triage properties only and compares
+    them with the stored issues and triage hashes; it stops there when
+    nothing changed. Otherwise it fetches full details just for new issues,
+    updates the triage of re-triaged ones and deletes issues that disappeared.
+    """
+
+    def __init__(self, findings_api: PolarisFindingsAPI,
+                 path: str = '.polaris_cache/issues.sqlite',
+                 page_size: int = 500, max_workers: int = 8,
+                 partition_by: Optional[Sequence[str]] = None):
+        """
+        Initialize the mirror
+
+        Args:
+            findings_api: Findings API client
+            path: SQLite database file
+            page_size: Page size used when listing issue IDs
+            max_workers: Number of parallel detail requests for new issues, and of
+                         partition streams when listing with `partition_by`
+            partition_by: List issue IDs with one parallel stream per value of
+                          these group fields instead of a single cursor listing
+        """
+        self.findings_api = findings_api
+        self.page_size = page_size
+        self.max_workers = max_workers
+        self.partition_by = partition_by
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS issues (
+                project_id TEXT NOT NULL,
+                branch_id TEXT NOT NULL,
+                issue_id TEXT NOT NULL,
+                triage_hash TEXT NOT NULL,
+                data TEXT NOT NULL,
+                synced_at REAL NOT NULL,
+                PRIMARY KEY (project_id, branch_id, issue_id)
+            );
+            CREATE TABLE IF NOT EXISTS sync_state (
+                project_id TEXT NOT NULL,
+                branch_id TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                issue_count INTEGER NOT NULL,
+                synced_at REAL NOT NULL,
+                PRIMARY KEY (project_id, branch_id)
+            );
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def _triage_hash(issue: Dict) -> str:
+        """Hash the triage properties of an issue"""
+        triage = sorted(
+            (prop.get('key', ''), json.dumps(prop.get('value'), sort_keys=True))
+            for prop in issue.get('triageProperties', [])
+        )
+        return hashlib.sha1(json.dumps(triage).encode('utf-8')).hexdigest()
+
+    def _fingerprint(self, hashes: Dict[str, str]) -> str:
+        """Build a fingerprint of an issue set from its issue IDs and triage hashes"""
+        return hashlib.sha1(json.dumps(sorted(hashes.items())).encode('utf-8')).hexdigest()
+
+    def _count_issues(self, project_id: str, branch_id: Optional[str]) -> int:
+        """Count all issues of a project with an ungrouped count call"""
+        params = {'_includeAverageAge': False}
+        if branch_id:
+            params['branchId'] = branch_id
+        response = self.findings_api.count_issues(project_id=project_id, params=params)
+        return sum(item.get('count', 0) for item in response.get('_items', []))
+
+    def _list_triage_state(self, project_id: str, branch_id: Optional[str]) -> Dict[str, Dict]:
+        """List all issues of a project with triage properties only"""
+        params = {
+            '_includeType': False,
+            '_includeOccurrenceProperties': False,
+            '_includeTriageProperties': True
+        }
+        if self.partition_by:
+            # Issues missing from the listing are deleted from the mirror, so the
+            # partitions are only trusted if they add up to an ungrouped count
+            total = self._count_issues(project_id, branch_id)
+            partitions = plan_partitions(self.findings_api, project_id, self.partition_by,
+                                         self.max_workers, branch_id)
+            planned = sum(partition.count for partition in partitions)
+            if planned == total:
+                issues = {
+                    issue['id']: issue for issue in iter_issues_partitioned(
+                        self.findings_api, project_id, max_workers=self.max_workers,
+                        page_size=self.page_size, branch_id=branch_id, params=params,
+                        partitions=partitions
+                    )
+                }
+                if len(issues) == total:
+                    return issues
+                self.logger.warning(f"Partitioned listing returned {len(issues)} of {total} "
+                                    f"issues, listing again with a single cursor")
+            else:
+                self.logger.warning(f"Partitions hold {planned} of {total} issues, "
+                                    f"listing with a single cursor")
+
+        issues = {}
+        for page in self.findings_api.get_issues_paginated(
+            project_id=project_id,
+            page_size=self.page_size,
+            branch_id=branch_id,
+            params=params
+        ):
+            for issue in page.get('_items', []):
+                issues[issue['id']] = issue
+        return issues
+
+    def _stored_hashes(self, project_id: str, branch_key: str) -> Dict[str, str]:
+        rows = self._conn.execute(
+            "SELECT issue_id, triage_hash FROM issues WHERE project_id = ? AND branch_id = ?",
+            (project_id, branch_key)
+        ).fetchall()
+        return dict(rows)
+
+    def sync(self, project_id: str, branch_id: Optional[str] = None,
+             force: bool = False) -> SyncResult:
+        """
+        Bring the local mirror of a project (and branch) up to date
+
+        Args:
+            project_id: Project ID
+            branch_id: Optional branch ID, the default branch if omitted
+            force: Fetch full details of every issue again, not just of new ones
+        """
+        started = time.time()
+        branch_key = branch_id or ''
+        result = SyncResult(project_id=project_id, branch_id=branch_id)
+
+        remote = self._list_triage_state(project_id, branch_id)
+        remote_hashes = {issue_id: self._triage_hash(issue) for issue_id, issue in remote.items()}
+        stored = self._stored_hashes(project_id, branch_key)
+
+        result.added = [issue_id for issue_id in remote if issue_id not in stored]
+        result.removed = [issue_id for issue_id in stored if issue_id not in remote]
+        result.retriaged = [
+            issue_id for issue_id, triage_hash in remote_hashes.items()
+            if issue_id in stored and stored[issue_id] != triage_hash
+        ]
+        fingerprint = self._fingerprint(remote_hashes)
+        now = time.time()
+
+        if not (result.added or result.removed or result.retriaged or force):
+            with self._lock:
+                self._save_state(project_id, branch_key, fingerprint, len(remote), now)
+                self._conn.commit()
+            self.logger.info(f"Issues of project {project_id} unchanged since last sync")
+            result.unchanged = True
+            result.total = len(remote)
+            result.elapsed = time.time() - started
+            return result
+
+        # Fetch full details only for new issues, unless forced
+        def fetch(issue_id: str) -> Dict:
+            return self.findings_api.get_issue_by_id(issue_id, project_id=project_id)
+
+        fetched_ids = list(remote) if force else result.added
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+            added_rows = [
+                (project_id, branch_key, issue['id'], self._triage_hash(issue),
+                 json.dumps(issue, ensure_ascii=False), now)
+                for issue in executor.map(fetch, fetched_ids)
+            ]
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO issues "
+                "(project_id, branch_id, issue_id, triage_hash, data, synced_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                added_rows
+            )
+            # A forced sync stored the full details of re-triaged issues already
+            if not force:
+                for issue_id in result.retriaged:
+                    self._update_triage(project_id, branch_key, remote[issue_id], now)
+            self._conn.executemany(
+                "DELETE FROM issues WHERE project_id = ? AND branch_id = ? AND issue_id = ?",
+                [(project_id, branch_key, issue_id) for issue_id in result.removed]
+            )
+            self._save_state(project_id, branch_key, fingerprint, len(remote), now)
+            self._conn.commit()
+
+        result.total = len(remote)
+        result.elapsed = time.time() - started
+        self.logger.info(
+            f"Synced project {project_id}: {len(result.added)} added, "
+            f"{len(result.removed)} removed, {len(result.retriaged)} re-triaged, "
+            f"{result.total} total in {result.elapsed:.1f}s"
+        )
+        return result
+
+    def _save_state(self, project_id: str, branch_key: str, fingerprint: str,
+                    issue_count: int, now: float) -> None:
+        """Record the outcome of a sync"""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO sync_state "
+            "(project_id, branch_id, fingerprint, issue_count, synced_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (project_id, branch_key, fingerprint, issue_count, now)
+        )
+
+    def _update_triage(self, project_id: str, branch_key: str, issue: Dict, now: float) -> None:
+        """Replace the triage properties of a stored issue"""
+        row = self._conn.execute(
+            "SELECT data FROM issues WHERE project_id = ? AND branch_id = ? AND issue_id = ?",
+            (project_id, branch_key, issue['id'])
+        ).fetchone()
+        data = json.loads(row[0])
+        data['triageProperties'] = issue.get('triageProperties', [])
+        self._conn.execute(
+            "UPDATE issues SET triage_hash = ?, data = ?, synced_at = ? "
+            "WHERE project_id = ? AND branch_id = ? AND issue_id = ?",
+            (self._triage_hash(issue), json.dumps(data, ensure_ascii=False), now,
+             project_id, branch_key, issue['id'])
+        )
+
+    def iter_issues(self, project_id: str, branch_id: Optional[str] = None) -> Iterator[Dict]:
+        """Iterate over the mirrored issues of a project"""
+        cursor = self._conn.execute(
+            "SELECT data FROM issues WHERE project_id = ? AND branch_id = ? ORDER BY issue_id",
+            (project_id, branch_id or '')
+        )
+        for (data,) in cursor:
+            yield json.loads(data)
+
+    def get_issue(self, project_id: str, issue_id: str,
+                  branch_id: Optional[str] = None) -> Optional[Dict]:
+        """Get a mirrored issue by ID"""
+        row = self._conn.execute(
+            "SELECT data FROM issues WHERE project_id = ? AND branch_id = ? AND issue_id = ?",
+            (project_id, branch_id or '', issue_id)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def count(self, project_id: str, branch_id: Optional[str] = None) -> int:
+        """Count the mirrored issues of a project"""
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM issues WHERE project_id = ? AND branch_id = ?",
+            (project_id, branch_id or '')
+        ).fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection"""
+        self._conn.close()
+
+
+def main() -> None:
+    """Sync the mirror of one project and optionally dump it to JSON"""
+    parser = argparse.ArgumentParser(description='Incremental Polaris issue mirror')
+    parser.add_argument('base_url', help='Polaris base URL')
+    parser.add_argument('api_token', help='API token')
+    parser.add_argument('project_id', help='Project ID')
+    parser.add_argument('--branch-id', help='Branch ID')
+    parser.add_argument('--db', default='.polaris_cache/issues.sqlite', help='Mirror database file')
+    parser.add_argument('--force', action='store_true',
+                        help='Fetch full details of every issue again, not just of new ones')
+    parser.add_argument('--dump', help='Write all mirrored issues to this JSON file')
+    parser.add_argument('--partition-by', nargs='?', const=','.join(DEFAULT_PARTITION_KEYS),
+                        metavar='FIELDS',
+                        help='List issues with parallel streams, one per value of these comma '
+                             f"separated group fields (default: {','.join(DEFAULT_PARTITION_KEYS)})")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+    try:
+        mirror = IssueMirror(
+            PolarisFindingsAPI(args.base_url, args.api_token), path=args.db,
+            partition_by=args.partition_by.split(',') if args.partition_by else None
+        )
+        mirror.sync(args.project_id, args.branch_id, force=args.force)
+
+        if args.dump:
+            with open(args.dump, 'w', encoding='utf-8') as f:
+                json.dump(list(mirror.iter_issues(args.project_id, args.branch_id)), f,
+                          indent=2, ensure_ascii=False)
+            logging.info(f"Issues saved to: {args.dump}")
+        mirror.close()
+    except Exception as e:
+        logging.error(f"Error occurred: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
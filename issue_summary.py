@@ -0,0 +1,114 @@
+# issue_summary.py - Issue distributions built from server-side grouped counts
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+from findings import PolarisFindingsAPI
+
+# Summary name and the `_group` field it is counted by
+SUMMARY_GROUPS = {
+    'severity': 'occurrence:severity',
+    'status': 'triage:status',
+    'cwe': 'occurrence:cwe',
+    'language': 'occurrence:language',
+    'component': 'occurrence:component-name',
+}
+
+logger = logging.getLogger(__name__)
+
+
+def parse_group_counts(response: Dict) -> Dict[str, int]:
+    """
+    Turn a grouped count response into a {value: count} mapping
+
+    Items are expected as `{"group": [{"key": ..., "value": ...}], "count": n}`;
+    a flat `{"key"/"value": ..., "count": n}` item is accepted as well.
+    """
+    counts = {}
+    for item in response.get('_items', []):
+        group = item.get('group', item)
+        if isinstance(group, list):
+            values = [entry.get('value') for entry in group if entry.get('value') not in (None, '')]
+            value = ', '.join(str(v) for v in values)
+        elif isinstance(group, dict):
+            value = group.get('value', 'Unknown')
+        else:
+            value = group
+        if value is None or value == '':
+            value = 'Unknown'
+        counts[str(value)] = counts.get(str(value), 0) + item.get('count', 0)
+    return counts
+
+
+def fetch_issue_summaries(findings_api: PolarisFindingsAPI, project_ids: Iterable[str],
+                          groups: Optional[Dict[str, str]] = None,
+                          max_workers: int = 8) -> Dict[str, Dict[str, Dict[str, int]]]:
+    """
+    Build issue distributions for several projects from grouped count calls
+
+    Every (project, group) count is issued on one bounded worker pool, so a
+    project costs one request per group instead of a full issue download.
+
+    Args:
+        findings_api: Findings API client
+        project_ids: Project IDs to summarize
+        groups: Summary name to `_group` field, SUMMARY_GROUPS by default
+        max_workers: Number of count requests in flight
+
+    Returns:
+        {project_id: {summary name: {value: count}}}
+
+    Raises:
+        Exception: The first failed count; a partial summary is never returned
+    """
+    groups = groups or SUMMARY_GROUPS
+    tasks = [(project_id, name, field) for project_id in project_ids
+             for name, field in groups.items()]
+
+    def fetch(task) -> Dict[str, int]:
+        project_id, name, field = task
+        try:
+            return parse_group_counts(findings_api.get_group_counts(project_id, field))
+        except Exception as e:
+            logger.error(f"Error counting {name} for project {project_id}: {str(e)}")
+            raise
+
+    summaries: Dict[str, Dict[str, Dict[str, int]]] = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        for (project_id, name, _), counts in zip(tasks, executor.map(fetch, tasks)):
+            summaries.setdefault(project_id, {})[name] = counts
+    return summaries
+
+
+def fetch_issue_summary(findings_api: PolarisFindingsAPI, project_id: str,
+                        groups: Optional[Dict[str, str]] = None,
+                        max_workers: int = 8) -> Dict[str, Dict[str, int]]:
+    """Build the issue distributions of one project from grouped count calls"""
+    return fetch_issue_summaries(findings_api, [project_id], groups, max_workers).get(project_id, {})
+
+
+def summary_total(summary: Dict[str, Dict[str, int]]) -> int:
+    """Total number of issues, taken from the severity distribution"""
+    return sum(summary.get('severity', {}).values())
+
+
+def print_count_summary(summary: Dict[str, Dict[str, int]],
+                        top: Optional[Dict[str, int]] = None) -> None:
+    """
+    Print issue distributions
+
+    Args:
+        summary: {summary name: {value: count}}
+        top: Print only the N largest values for the given summary names
+    """
+    top = top if top is not None else {'cwe': 10, 'component': 10}
+    print(f"\nTotal issues found: {summary_total(summary)}")
+
+    for name, counts in summary.items():
+        print(f"\nIssues by {name}:")
+        if name in top:
+            items: List = sorted(counts.items(), key=lambda kv: kv[1], reverse=True)[:top[name]]
+        else:
+            items = sorted(counts.items())
+        for value, count in items:
+            print(f"  {value}: {count}")
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# issue_table.py - Columnar in-memory issue table for fast aggregation
+
+import argparse
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+import json_codec
+from models import Finding
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Table columns and the Finding attribute each one is read from
+COLUMNS = {
+    'severity': lambda f: f.occurrence.severity,
+    'cwe': lambda f: f.occurrence.cwe,
+    'type': lambda f: f.type_name,
+    'location': lambda f: f.occurrence.location or f.occurrence.filename,
+    'component_name': lambda f: f.occurrence.component_name,
+    'vulnerability_source': lambda f: f.occurrence.vulnerability_source,
+    'status': lambda f: f.triage.status,
+}
+UNKNOWN = 'Unknown'
+
+
+def flatten_issue(issue: Dict) -> Dict:
+    """
+    Reduce an issue to the table columns
+
+    Accepts findings API issues (`occurrenceProperties`/`triageProperties`),
+    issue-management issues (`attributes`) and the flat records written to
+    polaris_output/.
+    """
+    finding = Finding.from_dict(issue)
+    record = {'id': finding.id}
+    for column, getter in COLUMNS.items():
+        value = getter(finding)
+        if value is None:
+            # Flat records carry the column directly
+            value = issue.get(column)
+        if column == 'cwe' and value is not None and not str(value).startswith('CWE-') \
+                and str(value) != UNKNOWN:
+            value = f"CWE-{value}"
+        record[column] = UNKNOWN if value is None else str(value)
+    return record
+
+
+class IssueTable:
+    """
+    Dictionary-encoded columnar view of a set of issues
+
+    Every column is stored as an int32 code array plus the list of distinct
+    values it indexes, so 100k issues take a few MB and group-by, filter
+    and sort run as vectorized NumPy operations instead of dict walks.
+    """
+
+    def __init__(self, ids: List[str], codes: Dict[str, 'np.ndarray'],
+                 dictionaries: Dict[str, List[str]]):
+        if np is None:
+            raise ImportError("numpy is required for IssueTable (pip install numpy)")
+        self.ids = ids
+        self.codes = codes
+        self.dictionaries = dictionaries
+
+    # Construction
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]) -> 'IssueTable':
+        """Build a table from issues in any supported shape"""
+        if np is None:
+            raise ImportError("numpy is required for IssueTable (pip install numpy)")
+        ids: List[str] = []
+        lookups: Dict[str, Dict[str, int]] = {column: {} for column in COLUMNS}
+        buffers = {column: array('i') for column in COLUMNS}
+
+        for issue in records:
+            record = flatten_issue(issue)
+            ids.append(record['id'])
+            for column, lookup in lookups.items():
+                value = record[column]
+                code = lookup.get(value)
+                if code is None:
+                    code = lookup[value] = len(lookup)
+                buffers[column].append(code)
+
+        codes = {column: np.frombuffer(buffers[column], dtype=np.int32).copy()
+                 if buffers[column] else np.zeros(0, dtype=np.int32)
+                 for column in COLUMNS}
+        dictionaries = {column: list(lookup) for column, lookup in lookups.items()}
+        return cls(ids, codes, dictionaries)
+
+    @classmethod
+    def from_pages(cls, pages: Iterable[Dict]) -> 'IssueTable':
+        """Build a table from API issue pages, e.g. `get_issues_paginated`"""
+        return cls.from_records(issue for page in pages for issue in page.get('_items', []))
+
+    @classmethod
+    def from_json(cls, path: str) -> 'IssueTable':
+        """
+        Load a table from an existing JSON output
+
+        Supports 5_issues_all.json, temp_all_issues.json, raw API pages such
+        as debug_first_page.json and polaris_report_*.json reports.
+        """
+        with open(path, 'rb') as f:
+            data = json_codec.loads(f.read())
+        if isinstance(data, dict):
+            for key in ('issues', 'findings', '_items'):
+                if key in data:
+                    data = data[key]
+                    break
+        return cls.from_records(data)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _take(self, index: 'np.ndarray') -> 'IssueTable':
+        """New table with the rows at the given positions"""
+        return IssueTable(
+            [self.ids[i] for i in index.tolist()],
+            {column: codes[index] for column, codes in self.codes.items()},
+            self.dictionaries
+        )
+
+    # Access
+    def column(self, name: str) -> 'np.ndarray':
+        """Decoded values of a column"""
+        values = np.array(self.dictionaries[name], dtype=object)
+        return values[self.codes[name]] if len(values) else np.array([], dtype=object)
+
+    def to_records(self) -> Iterator[Dict]:
+        """Iterate over rows as flat dicts"""
+        for row, issue_id in enumerate(self.ids):
+            record = {'id': issue_id}
+            for column, codes in self.codes.items():
+                record[column] = self.dictionaries[column][codes[row]]
+            yield record
+
+    # Aggregation
+    def group_count(self, name: str) -> Dict[str, int]:
+        """Count rows per value of a column, largest first"""
+        counts = np.bincount(self.codes[name], minlength=len(self.dictionaries[name]))
+        order = np.argsort(-counts, kind='stable')
+        return {self.dictionaries[name][code]: int(counts[code])
+                for code in order.tolist() if counts[code]}
+
+    def group_by(self, names: Sequence[str]) -> Dict[Tuple[str, ...], int]:
+        """Count rows per combination of column values, largest first"""
+        if not len(self):
+            return {}
+        stacked = np.stack([self.codes[name] for name in names], axis=1)
+        combos, counts = np.unique(stacked, axis=0, return_counts=True)
+        order = np.argsort(-counts, kind='stable')
+        return {
+            tuple(self.dictionaries[name][code] for name, code in zip(names, combos[i].tolist())):
+                int(counts[i])
+            for i in order.tolist()
+        }
+
+    def filter(self, **conditions: Union[str, Sequence[str]]) -> 'IssueTable':
+        """
+        Keep rows whose columns match the given value or any of the given values
+
+        Example: table.filter(severity=['high', 'critical'], status='new')
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for name, wanted in conditions.items():
+            wanted = [wanted] if isinstance(wanted, str) else list(wanted)
+            lookup = {value: code for code, value in enumerate(self.dictionaries[name])}
+            wanted_codes = [lookup[value] for value in wanted if value in lookup]
+            mask &= np.isin(self.codes[name], wanted_codes)
+        return self._take(np.flatnonzero(mask))
+
+    def sort_by(self, name: str, descending: bool = False,
+                order: Optional[Sequence[str]] = None) -> 'IssueTable':
+        """
+        Sort rows by a column, keeping the original order within equal values
+
+        Args:
+            name: Column to sort by
+            descending: Sort from largest to smallest
+            order: Explicit value order (e.g. critical, high, medium, low);
+                   lexical order of the values if omitted
+        """
+        dictionary = self.dictionaries[name]
+        if order is not None:
+            position = {value: i for i, value in enumerate(order)}
+            ranks = [position.get(value, len(order)) for value in dictionary]
+        else:
+            sorted_values = sorted(dictionary)
+            position = {value: i for i, value in enumerate(sorted_values)}
+            ranks = [position[value] for value in dictionary]
+        keys = np.array(ranks, dtype=np.int32)[self.codes[name]] if dictionary \
+            else np.zeros(0, dtype=np.int32)
+        index = np.argsort(-keys if descending else keys, kind='stable')
+        return self._take(index)
+
+    def head(self, count: int) -> 'IssueTable':
+        """First rows of the table"""
+        return self._take(np.arange(min(count, len(self))))
+
+
+def main() -> None:
+    """Print distributions of an existing issue JSON output"""
+    parser = argparse.ArgumentParser(description='Aggregate issues from a JSON output')
+    parser.add_argument('path', help='e.g. polaris_output/5_issues_all.json')
+    parser.add_argument('--group-by', nargs='+', default=['severity'],
+                        help=f"Columns to group by: {', '.join(COLUMNS)}")
+    parser.add_argument('--top', type=int, default=20, help='Number of groups to print')
+    args = parser.parse_args()
+
+    table = IssueTable.from_json(args.path)
+    print(f"Total issues: {len(table)}")
+    groups = table.group_by(args.group_by)
+    for key, count in list(groups.items())[:args.top]:
+        print(f"  {' / '.join(key)}: {count}")
+
+
+if __name__ == '__main__':
+    main()
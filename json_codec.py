@@ -0,0 +1,26 @@
+# json_codec.py - JSON decoding with an optional fast backend
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Name of the backend used by loads()
+BACKEND = 'orjson' if orjson is not None else 'json'
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """
+    Decode a JSON document
+
+    Uses orjson when it is installed, which parses response bytes directly and
+    is several times faster on large issue pages, and the stdlib otherwise.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data).decode('utf-8')
+    return json.loads(data)
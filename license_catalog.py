@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# license_catalog.py - Cross-project license catalog with deduplicated license texts
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from findings import PolarisFindingsAPI
+
+# Keys the license text may be returned under
+TEXT_KEYS = ('licenseText', 'text')
+
+
+def split_license_text(license: Dict) -> Tuple[Dict, Optional[str]]:
+    """Split a license record into (metadata without the text, text or None)"""
+    metadata = {key: value for key, value in license.items() if key not in TEXT_KEYS}
+    text = next((license[key] for key in TEXT_KEYS if license.get(key)), None)
+    return metadata, text
+
+
+class License:
+    """License metadata whose text is resolved from the catalog on first access"""
+
+    __slots__ = ('id', 'name', 'metadata', '_catalog')
+
+    def __init__(self, metadata: Dict, catalog: 'LicenseCatalog'):
+        self.id = metadata.get('id')
+        self.name = metadata.get('name')
+        self.metadata = metadata
+        self._catalog = catalog
+
+    @property
+    def text(self) -> Optional[str]:
+        """License text, fetched once per license ID across all projects"""
+        return self._catalog.get_text(self.id)
+
+    def __repr__(self) -> str:
+        return f"License(id={self.id!r}, name={self.name!r})"
+
+
+class LicenseCatalog:
+    """
+    License texts stored once per license ID and shared by every project
+
+    Project listings are requested without `_includeLicenseText`, so only
+    metadata is transferred and held in memory. Texts live in SQLite and are
+    read on demand; a text missing from the catalog is fetched once with
+    `get_license_by_id(include_text=True)`, with concurrent requests for the
+    same license waiting on that single fetch.
+    """
+
+    def __init__(self, findings_api: PolarisFindingsAPI,
+                 path: str = '.polaris_cache/licenses.sqlite',
+                 ttl: float = 30 * 86400):
+        """
+        Initialize the catalog
+
+        Args:
+            findings_api: Findings API client
+            path: SQLite database file
+            ttl: Seconds a stored license text is reused
+        """
+        self.findings_api = findings_api
+        self.path = path
+        self.ttl = ttl
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS licenses (
+                id TEXT PRIMARY KEY,
+                metadata TEXT NOT NULL,
+                text TEXT,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    # Storage
+    def add(self, license: Dict) -> Dict:
+        """
+        Store a license record, keeping an already stored text if it has none
+
+        Returns:
+            The license metadata without its text
+        """
+        metadata, text = split_license_text(license)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO licenses (id, metadata, text, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET metadata = excluded.metadata, "
+                "text = COALESCE(excluded.text, licenses.text), "
+                "updated_at = CASE WHEN excluded.text IS NULL THEN licenses.updated_at "
+                "ELSE excluded.updated_at END",
+                (metadata['id'], json.dumps(metadata, ensure_ascii=False), text, time.time())
+            )
+            self._conn.commit()
+        return metadata
+
+    def _stored_text(self, license_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text FROM licenses WHERE id = ? AND updated_at > ?",
+                (license_id, time.time() - self.ttl)
+            ).fetchone()
+        return row[0] if row else None
+
+    def get_text(self, license_id: str) -> Optional[str]:
+        """Text of a license, from the catalog or fetched once from the server"""
+        text = self._stored_text(license_id)
+        if text is not None:
+            return text
+
+        with self._lock:
+            future = self._in_flight.get(license_id)
+            owner = future is None
+            if owner:
+                future = self._in_flight[license_id] = Future()
+        if not owner:
+            return future.result()
+
+        try:
+            text = self._stored_text(license_id)
+            if text is None:
+                license = self.findings_api.get_license_by_id(license_id, include_text=True)
+                self.add(license)
+                text = split_license_text(license)[1]
+            future.set_result(text)
+            return text
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[license_id]
+
+    def prefetch_texts(self, license_ids: Iterable[str], max_workers: int = 8) -> int:
+        """
+        Make sure the texts of the given licenses are in the catalog
+
+        Returns:
+            Number of licenses whose text is available
+        """
+        ids = list(dict.fromkeys(license_ids))
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            return sum(1 for text in executor.map(self.get_text, ids) if text is not None)
+
+    # Listings
+    def iter_project_licenses(self, project_id: Optional[str] = None,
+                              page_size: int = 100,
+                              params: Optional[Dict] = None) -> Iterator[License]:
+        """
+        Iterate over the licenses of a project, metadata only
+
+        Every license is recorded in the catalog; its text is resolved when
+        `License.text` is first read.
+        """
+        for page in self.findings_api.get_licenses_paginated(
+            project_id, page_size=page_size, params=params
+        ):
+            for license in page.get('_items', []):
+                if license.get('id'):
+                    yield License(self.add(license), self)
+
+    def list_project_licenses(self, project_id: Optional[str] = None,
+                              params: Optional[Dict] = None) -> List[License]:
+        """All licenses of a project, metadata only"""
+        return list(self.iter_project_licenses(project_id, params=params))
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+def main() -> None:
+    """List the licenses of a project and optionally print their texts"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    parser = argparse.ArgumentParser(description='Project licenses from the shared license catalog')
+    parser.add_argument('base_url', help='Polaris base URL')
+    parser.add_argument('api_token', help='API token')
+    parser.add_argument('project_id', help='Project ID')
+    parser.add_argument('--texts', action='store_true', help='Print the license texts')
+    parser.add_argument('--path', default='.polaris_cache/licenses.sqlite',
+                        help='Catalog database (default: .polaris_cache/licenses.sqlite)')
+    args = parser.parse_args()
+
+    catalog = LicenseCatalog(PolarisFindingsAPI(args.base_url, args.api_token), path=args.path)
+    licenses = catalog.list_project_licenses(args.project_id)
+    if args.texts:
+        catalog.prefetch_texts(license.id for license in licenses)
+    for license in licenses:
+        print(f"{license.id}: {license.name}")
+        if args.texts:
+            print(license.text or '(no text)')
+            print()
+    catalog.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,852 @@
+#!/usr/bin/env python3
+# mock_server.py - Local stand-in for the Polaris findings and portfolio APIs
+
+import argparse
+import base64
+import gzip
+import json
+import logging
+import os
+import random
+import re
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, quote, unquote, urlencode, urlsplit
+
+# Triage status of every Nth synthetic issue
+TRIAGE_STATUSES = ('dismissed', 'to-be-fixed', 'not-dismissed', 'not-dismissed', 'not-dismissed')
+# RSQL comparison: field, operator, value(s)
+_COMPARISON = re.compile(r"^\s*([\w:.\-]+)\s*(==|!=|=in=|=out=)\s*(.+?)\s*$")
+
+# Used when no fixture issues are available to clone
+_DEFAULT_TEMPLATE = {
+    'id': '00000000-0000-4000-8000-000000000000',
+    'type': {
+        'id': '6a3c0e3b-0000-4000-8000-000000000001',
+        'name': 'sql_injection|java',
+        '_localized': {'name': 'SQL Injection', 'otherDetail': [
+            {'key': 'description', 'value': 'Untrusted data is used in an SQL query.'},
+            {'key': 'remediation', 'value': 'Use parameterized queries.'}
+        ]}
+    },
+    'attributes': [
+        {'key': 'language', 'value': 'Java'},
+        {'key': 'filename', 'value': 'UserDao.java'},
+        {'key': 'location', 'value': 'src/main/java/UserDao.java'},
+        {'key': 'line-number', 'value': 42},
+        {'key': 'cwe', 'value': 'CWE-89'},
+        {'key': 'severity', 'value': 'high'}
+    ]
+}
+
+
+def _uuid(kind: int, number: int) -> str:
+    """Deterministic UUID-shaped ID, `kind` tells issues, occurrences and artifacts apart"""
+    return f"00000000-0000-4000-{kind:04x}-{number:012x}"
+
+
+def _parse_uuid(value: str, kind: int) -> Optional[int]:
+    prefix = f"00000000-0000-4000-{kind:04x}-"
+    if not value.startswith(prefix):
+        return None
+    try:
+        return int(value[len(prefix):], 16)
+    except ValueError:
+        return None
+
+
+def encode_cursor(offset: int) -> str:
+    """Opaque page cursor in the server's format, e.g. 'AAAAZA==' for offset 100"""
+    return base64.b64encode(struct.pack('>I', offset)).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> int:
+    # Clients may pass the cursor still URL encoded, as it appears in the next link
+    while '%' in cursor:
+        cursor = unquote(cursor)
+    return struct.unpack('>I', base64.b64decode(cursor))[0]
+
+
+def _split_top_level(text: str, separator: str) -> List[str]:
+    """Split on a separator outside quotes and parentheses"""
+    parts, depth, quote_char, current = [], 0, None, []
+    for char in text:
+        if quote_char:
+            if char == quote_char:
+                quote_char = None
+        elif char in '\'"':
+            quote_char = char
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append(''.join(current))
+            current = []
+            continue
+        current.append(char)
+    parts.append(''.join(current))
+    return parts
+
+
+def _unquote_value(value: str) -> str:
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in '\'"':
+        return value[1:-1]
+    return value
+
+
+def parse_rsql(expression: Optional[str]) -> List[List[Tuple[str, str, List[str]]]]:
+    """
+    Parse the RSQL subset the clients send
+
+    `;` joins conditions with AND, `,` with OR; comparisons are `==`, `!=`,
+    `=in=(a,b)` and `=out=(a,b)`. Parentheses for grouping are not supported.
+
+    Returns:
+        AND list of OR lists of (field, operator, values)
+    """
+    if not expression:
+        return []
+    clauses = []
+    for clause in _split_top_level(expression, ';'):
+        alternatives = []
+        for comparison in _split_top_level(clause, ','):
+            match = _COMPARISON.match(comparison)
+            if not match:
+                raise ValueError(f"Unsupported filter: {comparison}")
+            field, operator, value = match.groups()
+            if operator in ('=in=', '=out='):
+                values = [_unquote_value(v) for v in _split_top_level(value.strip('()'), ',')]
+            else:
+                values = [_unquote_value(value)]
+            alternatives.append((field, operator, values))
+        clauses.append(alternatives)
+    return clauses
+
+
+def rsql_matches(filters: List[List[Tuple[str, str, List[str]]]], lookup) -> bool:
+    """
+    Evaluate a parsed filter, `lookup(field)` returns the value of a field
+
+    Like the server, a missing (NULL) value matches no comparison, not even
+    `!=` or `=out=`.
+    """
+    for alternatives in filters:
+        for field, operator, values in alternatives:
+            value = lookup(field)
+            if value is None:
+                continue
+            found = str(value) in values
+            if found == (operator in ('==', '=in=')):
+                break
+        else:
+            return False
+    return True
+
+
+class MockDataset:
+    """
+    Portfolio hierarchy and issues served by MockPolarisServer
+
+    Issues are cloned from template issues (the issue management records in
+    `polaris_output/`), so a dataset of any size holds one small entry per
+    issue: its ID and template. Responses are assembled from per-template
+    JSON fragments encoded once.
+    """
+
+    def __init__(self, templates: Sequence[Dict], issue_ids: List[str],
+                 portfolio: Dict, applications: List[Dict],
+                 projects: Dict[str, List[Dict]], branches: Dict[str, List[Dict]],
+                 project_issues: Dict[str, range]):
+        """
+        Initialize the dataset
+
+        Args:
+            templates: Issue management records the issues are cloned from
+            issue_ids: ID of every issue; issue N uses template N % len(templates)
+            portfolio: The single portfolio
+            applications: Portfolio items
+            projects: Portfolio subitems by portfolio item ID
+            branches: Branches by subitem ID
+            project_issues: Issue numbers of each subitem
+        """
+        self.templates = list(templates) or [_DEFAULT_TEMPLATE]
+        self.issue_ids = issue_ids
+        self.portfolio = portfolio
+        self.applications = applications
+        self.projects = projects
+        self.branches = branches
+        self.project_issues = project_issues
+        self._issue_numbers = {issue_id: n for n, issue_id in enumerate(issue_ids)}
+        self._prepare_templates()
+
+    # Construction
+    @staticmethod
+    def _load_json(path: str):
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @classmethod
+    def load_templates(cls, fixtures_dir: str = 'polaris_output') -> List[Dict]:
+        """Unique issue management records of the fixture pages"""
+        templates: Dict[str, Dict] = {}
+        for name in ('debug_first_page.json', 'latest_issues.json', 'temp_page.json'):
+            page = cls._load_json(os.path.join(fixtures_dir, name)) or {}
+            for issue in page.get('_items', []) if isinstance(page, dict) else []:
+                if issue.get('id') and issue.get('attributes') is not None:
+                    templates.setdefault(issue['id'], issue)
+        return list(templates.values())
+
+    @classmethod
+    def from_fixtures(cls, fixtures_dir: str = 'polaris_output',
+                      issue_count: Optional[int] = None) -> 'MockDataset':
+        """
+        Dataset with the portfolio, applications, projects and issues of the fixtures
+
+        All issues belong to the first fixture project. With `issue_count` the
+        fixture issues are cloned (with new IDs) up to that many issues.
+        """
+        templates = cls.load_templates(fixtures_dir) or [_DEFAULT_TEMPLATE]
+        portfolio_file = cls._load_json(os.path.join(fixtures_dir, '1_portfolios.json')) or {}
+        portfolio = {'id': portfolio_file.get('portfolio_id') or _uuid(1, 0), 'name': 'Portfolio'}
+        applications = cls._load_json(
+            os.path.join(fixtures_dir, '2_portfolio_items_all.json')) or []
+        subitems = cls._load_json(
+            os.path.join(fixtures_dir, '3_portfolio_subitems_all.json')) or []
+        branch_file = cls._load_json(os.path.join(fixtures_dir, '4_branches.json')) or {}
+        if not applications or not subitems:
+            return cls.synthetic(issue_count or len(templates), templates=templates)
+
+        projects: Dict[str, List[Dict]] = {}
+        for subitem in subitems:
+            projects.setdefault(subitem.get('portfolioItemId') or applications[0]['id'],
+                                []).append(subitem)
+        branches = {
+            subitem['id']: branch_file.get('branches') or [subitem.get('defaultBranch')
+                                                          or {'id': _uuid(4, 0), 'name': 'main'}]
+            for subitem in subitems
+        }
+        if issue_count is None:
+            issue_ids = [template['id'] for template in templates]
+        else:
+            issue_ids = [_uuid(0x8000, n) for n in range(issue_count)]
+        return cls(templates, issue_ids, portfolio, applications, projects, branches,
+                   {subitems[0]['id']: range(len(issue_ids))})
+
+    @classmethod
+    def synthetic(cls, issue_count: int, applications: int = 1, projects_per_application: int = 1,
+                  templates: Optional[Sequence[Dict]] = None,
+                  fixtures_dir: str = 'polaris_output') -> 'MockDataset':
+        """
+        Dataset of `issue_count` cloned issues spread evenly over generated projects
+
+        Applications are named bench-app-<i> and projects bench-project-<j>,
+        each with a single 'main' branch.
+        """
+        templates = list(templates or cls.load_templates(fixtures_dir) or [_DEFAULT_TEMPLATE])
+        portfolio = {'id': _uuid(1, 0), 'name': 'Benchmark Portfolio'}
+        apps, projects, branches, project_issues = [], {}, {}, {}
+        total_projects = max(1, applications * projects_per_application)
+        per_project, remainder = divmod(issue_count, total_projects)
+        start = 0
+        for i in range(max(1, applications)):
+            app = {'id': _uuid(2, i), 'name': f'bench-app-{i}', 'itemType': 'APPLICATION',
+                   'portfolioId': portfolio['id'], 'inTrash': False}
+            apps.append(app)
+            for j in range(max(1, projects_per_application)):
+                number = i * projects_per_application + j
+                subitem = {'id': _uuid(3, number), 'name': f'bench-project-{j}',
+                           'subItemType': 'PROJECT', 'portfolioItemId': app['id'],
+                           'inTrash': False}
+                projects.setdefault(app['id'], []).append(subitem)
+                branches[subitem['id']] = [{'id': _uuid(4, number), 'name': 'main',
+                                            'isDefault': True}]
+                size = per_project + (1 if number < remainder else 0)
+                project_issues[subitem['id']] = range(start, start + size)
+                start += size
+        issue_ids = [_uuid(0x8000, n) for n in range(issue_count)]
+        return cls(templates, issue_ids, portfolio, apps, projects, branches, project_issues)
+
+    def _prepare_templates(self) -> None:
+        """Encode the parts of every template that all its clones share"""
+        self._fields: List[Dict[str, object]] = []
+        self._findings_parts: List[bytes] = []
+        self._management_parts: List[bytes] = []
+        self._snippets: List[str] = []
+        for template in self.templates:
+            attributes = template.get('attributes') or []
+            issue_type = template.get('type') or {}
+            fields = {f"occurrence:{entry['key']}": entry.get('value') for entry in attributes}
+            fields['type:id'] = issue_type.get('id')
+            fields['type:name'] = issue_type.get('name')
+            self._fields.append(fields)
+
+            findings = {
+                'type': issue_type,
+                'occurrenceProperties': attributes,
+                'firstDetectedOn': template.get('firstDetectedOn', '2024-12-13T05:11:49Z')
+            }
+            self._findings_parts.append(json.dumps(findings, ensure_ascii=False)[1:].encode())
+            management = {key: value for key, value in template.items()
+                          if key not in ('id', '_cursor', '_links')}
+            self._management_parts.append(json.dumps(management, ensure_ascii=False)[1:].encode())
+
+            location = fields.get('occurrence:location') or 'src/main.c'
+            name = (issue_type.get('_localized') or {}).get('name') or issue_type.get('name')
+            self._snippets.append('\n'.join([
+                f"// {location}",
+                f"// {name}",
+                "    String input = request.getParameter(\"value\");",
+                "    process(input);",
+                "    return render(input);"
+            ]))
+
+    # Issue access
+    def issue_number(self, issue_id: str) -> Optional[int]:
+        return self._issue_numbers.get(issue_id)
+
+    def occurrence_number(self, occurrence_id: str) -> Optional[int]:
+        n = _parse_uuid(occurrence_id, 0x9000)
+        return n if n is not None and n < len(self.issue_ids) else None
+
+    def occurrence_id(self, n: int) -> str:
+        return _uuid(0x9000, n)
+
+    def template_index(self, n: int) -> int:
+        return n % len(self.templates)
+
+    def triage_status(self, n: int) -> str:
+        return TRIAGE_STATUSES[n % len(TRIAGE_STATUSES)]
+
+    def field(self, n: int, name: str):
+        """Value of a filter/group field ('occurrence:severity', 'triage:status', ...)"""
+        if name == 'triage:status':
+            return self.triage_status(n)
+        if name == 'id':
+            return self.issue_ids[n]
+        return self._fields[self.template_index(n)].get(name)
+
+    def findings_issue(self, n: int) -> bytes:
+        """Issue n in the findings API shape, JSON encoded"""
+        return (
+            f'{{"id":"{self.issue_ids[n]}","occurrence":{{"id":"{self.occurrence_id(n)}"}},'
+            f'"triageProperties":[{{"key":"status","value":"{self.triage_status(n)}"}}],'
+        ).encode() + self._findings_parts[self.template_index(n)]
+
+    def management_issue(self, n: int) -> bytes:
+        """Issue n in the issue management (specialization layer) shape, JSON encoded"""
+        return f'{{"id":"{self.issue_ids[n]}",'.encode() + \
+            self._management_parts[self.template_index(n)]
+
+    def snippet(self, n: int) -> Dict:
+        """Code snippet of occurrence n; clones of one template share the snippet text"""
+        fields = self._fields[self.template_index(n)]
+        line = fields.get('occurrence:line-number') or 1
+        return {
+            'content': self._snippets[self.template_index(n)],
+            'filename': fields.get('occurrence:filename'),
+            'startLine': max(1, int(line) - 2),
+            'endLine': int(line) + 2
+        }
+
+    def assist(self, n: int) -> Dict:
+        template = self.templates[self.template_index(n)]
+        details = {entry.get('key'): entry.get('value') for entry in
+                   ((template.get('type') or {}).get('_localized') or {}).get('otherDetail', [])}
+        return {
+            'occurrenceId': self.occurrence_id(n),
+            'explanation': details.get('description') or 'Untrusted data reaches a sensitive sink.',
+            'remediation': details.get('remediation') or 'Validate the data before using it.',
+            'suggestedFix': self._snippets[self.template_index(n)].replace('process(input)',
+                                                                          'process(sanitize(input))')
+        }
+
+    def artifact(self, n: int, artifact_index: int, size: int) -> bytes:
+        line = f"artifact {artifact_index} of occurrence {self.occurrence_id(n)}\n".encode()
+        return (line * (size // len(line) + 1))[:size]
+
+    def all_projects(self) -> List[Dict]:
+        return [subitem for subitems in self.projects.values() for subitem in subitems]
+
+
+class ServerStats:
+    """Thread-safe request counters of a MockPolarisServer"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.throttled = 0
+        self.bytes_sent = 0
+        self.by_route: Dict[str, int] = {}
+
+    def record(self, route: str, status: int, size: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.bytes_sent += size
+            self.by_route[route] = self.by_route.get(route, 0) + 1
+            if status == 429:
+                self.throttled += 1
+            elif status >= 500:
+                self.errors += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'errors': self.errors,
+                'throttled': self.throttled,
+                'bytes_sent': self.bytes_sent,
+                'by_route': dict(self.by_route)
+            }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Routes requests to MockPolarisServer; one instance per connection"""
+
+    protocol_version = 'HTTP/1.1'
+    # Send headers and body in one segment; separate small writes on a
+    # keep-alive connection stall on delayed ACKs for ~40ms per response
+    disable_nagle_algorithm = True
+    wbufsize = 64 * 1024
+    server: 'MockPolarisServer'
+
+    def log_message(self, format: str, *args) -> None:
+        logging.getLogger(__name__).debug(format % args)
+
+    def do_GET(self) -> None:
+        self.server.dispatch(self)
+
+    do_POST = do_GET
+    do_PATCH = do_GET
+    do_DELETE = do_GET
+
+
+class MockPolarisServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server implementing the Polaris endpoints the clients use
+
+    Portfolio listings are offset paginated, findings issues and occurrences
+    cursor paginated, both with RSQL `_filter` support; grouped issue counts,
+    issue and occurrence details, snippets, assist and artifacts are served
+    from a MockDataset. Latency, server errors and 429 responses with a
+    Retry-After header can be injected to exercise client behaviour.
+
+    Use as a context manager, or call start() and stop(); `base_url` is the
+    value to pass to the API clients.
+    """
+
+    daemon_threads = True
+    # Listen backlog; the default of 5 drops connections under concurrent clients
+    request_queue_size = 128
+
+    def __init__(self, dataset: MockDataset, host: str = '127.0.0.1', port: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0, assist_latency: float = 0.0,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0,
+                 retry_after: float = 1, quota: Optional[float] = None,
+                 compression: bool = True, artifact_size: int = 4096, api_token: Optional[str] = None,
+                 seed: int = 0):
+        """
+        Initialize the server
+
+        Args:
+            dataset: Data to serve
+            host: Interface to bind
+            port: Port to bind, 0 for a free port
+            latency: Seconds added to every response
+            jitter: Random extra seconds, up to this much, added to every response
+            assist_latency: Extra seconds added to assist responses
+            error_rate: Fraction of requests answered with 500
+            rate_limit_rate: Fraction of requests answered with 429
+            retry_after: Retry-After seconds sent with 429 responses
+            quota: Requests per second served before answering 429, with a
+                   Retry-After until the next request is allowed; unlimited if None
+            compression: Gzip responses when the client accepts it
+            artifact_size: Size of each occurrence artifact in bytes
+            api_token: Require this Api-Token header if set
+            seed: Seed of the latency and fault injection
+        """
+        super().__init__((host, port), _Handler)
+        self.dataset = dataset
+        self.latency = latency
+        self.jitter = jitter
+        self.assist_latency = assist_latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.quota = quota
+        self._quota_tokens = quota or 0.0
+        self._quota_updated = time.monotonic()
+        self._quota_lock = threading.Lock()
+        self.compression = compression
+        self.artifact_size = artifact_size
+        self.api_token = api_token
+        self.stats = ServerStats()
+        self.logger = logging.getLogger(__name__)
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._filter_cache: Dict[Tuple[str, str], List[int]] = {}
+        self._filter_lock = threading.Lock()
+        self._thread = None
+        self._routes = [
+            ('GET', re.compile(r'^/api/portfolio/portfolios$'), self._portfolios),
+            ('GET', re.compile(r'^/api/portfolio/portfolios/([^/]+)/portfolio-items$'),
+             self._portfolio_items),
+            ('GET', re.compile(r'^/api/portfolio/portfolio-items/([^/]+)$'), self._portfolio_item),
+            ('GET', re.compile(r'^/api/portfolio/portfolio-items/([^/]+)/portfolio-sub-items$'),
+             self._subitems),
+            ('GET', re.compile(r'^/api/portfolio/portfolio-sub-items$'), self._all_subitems),
+            ('GET', re.compile(r'^/api/portfolio/portfolio-sub-items/([^/]+)/branches$'),
+             self._branches),
+            ('GET', re.compile(r'^/api/specialization-layer-service/issues/_actions/list$'),
+             self._test_issues),
+            ('GET', re.compile(r'^/api/findings/issues$'), self._issues),
+            ('GET', re.compile(r'^/api/findings/issues/_actions/count$'), self._issue_counts),
+            ('GET', re.compile(r'^/api/findings/issues/([^/_][^/]*)$'), self._issue),
+            ('GET', re.compile(r'^/api/findings/occurrences$'), self._occurrences),
+            ('GET', re.compile(r'^/api/findings/occurrences/([^/]+)$'), self._occurrence),
+            ('GET', re.compile(r'^/api/findings/occurrences/([^/]+)/snippet$'), self._snippet),
+            ('GET', re.compile(r'^/api/findings/occurrences/([^/]+)/assist$'), self._assist),
+            ('GET', re.compile(r'^/api/findings/occurrences/([^/]+)/artifacts/([^/]+)$'),
+             self._artifact),
+        ]
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    # Lifecycle
+    def start(self) -> 'MockPolarisServer':
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self.serve_forever, name='mock-polaris',
+                                        daemon=True)
+        self._thread.start()
+        self.logger.info(f"Mock Polaris server listening on {self.base_url}")
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket"""
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> 'MockPolarisServer':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    # Request handling
+    def _roll(self) -> Tuple[float, float]:
+        with self._random_lock:
+            return self._random.random(), self._random.random()
+
+    @staticmethod
+    def _route_label(pattern: re.Pattern) -> str:
+        """Readable route name for the statistics, e.g. /api/findings/issues/{id}"""
+        return re.sub(r'\([^)]*\)', '{id}', pattern.pattern.strip('^$'))
+
+    def dispatch(self, request: _Handler) -> None:
+        """Apply latency and faults, route the request and send the response"""
+        url = urlsplit(request.path)
+        params = parse_qs(url.query, keep_blank_values=True)
+        method = request.command
+        # Drain a request body so the connection stays usable
+        length = int(request.headers.get('Content-Length') or 0)
+        if length:
+            request.rfile.read(length)
+
+        route_name, handler, groups = 'unknown', None, ()
+        for route_method, pattern, route_handler in self._routes:
+            match = pattern.match(url.path)
+            if match:
+                route_name = self._route_label(pattern)
+                if route_method == method:
+                    handler, groups = route_handler, match.groups()
+                    break
+
+        fault, jitter = self._roll()
+        delay = self.latency + jitter * self.jitter
+        if handler == self._assist:
+            delay += self.assist_latency
+        if delay > 0:
+            time.sleep(delay)
+
+        headers = {}
+        if self.api_token is not None and request.headers.get('Api-Token') != self.api_token:
+            status, body = 401, {'title': 'Unauthorized'}
+        elif fault < self.rate_limit_rate:
+            status, body = 429, {'title': 'Too Many Requests'}
+            headers['Retry-After'] = f"{self.retry_after:g}"
+        elif self.quota and (wait := self._take_quota()) > 0:
+            status, body = 429, {'title': 'Too Many Requests'}
+            headers['Retry-After'] = f"{wait:.3f}"
+        elif fault < self.rate_limit_rate + self.error_rate:
+            status, body = 500, {'title': 'Injected server error'}
+        elif handler is None:
+            status, body = (405 if route_name != 'unknown' else 404), {'title': 'Not Found'}
+        else:
+            try:
+                status, body = handler(params, url, *groups)
+            except (ValueError, KeyError, IndexError, struct.error) as e:
+                status, body = 400, {'title': 'Bad Request', 'detail': str(e)}
+        self._send(request, route_name, status, body, headers)
+
+    def _take_quota(self) -> float:
+        """Take one request from the quota bucket, or return the seconds until one is available"""
+        with self._quota_lock:
+            now = time.monotonic()
+            self._quota_tokens = min(self.quota, self._quota_tokens
+                                     + (now - self._quota_updated) * self.quota)
+            self._quota_updated = now
+            if self._quota_tokens >= 1:
+                self._quota_tokens -= 1
+                return 0.0
+            return (1 - self._quota_tokens) / self.quota
+
+    def _send(self, request: _Handler, route: str, status: int, body, headers: Dict) -> None:
+        if isinstance(body, bytes):
+            content_type = 'text/plain' if route.endswith('/artifacts/{id}') \
+                else 'application/json'
+        else:
+            body = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            content_type = 'application/json'
+        if self.compression and len(body) > 1024 \
+                and 'gzip' in request.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body, compresslevel=1)
+            headers['Content-Encoding'] = 'gzip'
+
+        request.send_response(status)
+        request.send_header('Content-Type', content_type)
+        request.send_header('Content-Length', str(len(body)))
+        for key, value in headers.items():
+            request.send_header(key, value)
+        request.end_headers()
+        request.wfile.write(body)
+        self.stats.record(route, status, len(body))
+
+    # Pagination helpers
+    @staticmethod
+    def _param(params: Dict[str, List[str]], name: str, default=None):
+        values = params.get(name)
+        return values[0] if values else default
+
+    def _offset_page(self, items: List[Dict], params: Dict[str, List[str]]) -> Dict:
+        """Offset paginated listing with an optional RSQL name filter"""
+        filters = parse_rsql(self._param(params, '_filter'))
+        if filters:
+            items = [item for item in items if rsql_matches(filters, item.get)]
+        offset = int(self._param(params, '_offset', 0))
+        limit = max(1, int(self._param(params, '_limit', 100)))
+        return {
+            '_items': items[offset:offset + limit],
+            '_links': [],
+            '_collection': {
+                'itemCount': len(items),
+                'currentPage': offset // limit + 1,
+                'pageCount': max(1, -(-len(items) // limit))
+            }
+        }
+
+    def _project_issue_numbers(self, project_id: Optional[str],
+                               filter_text: Optional[str]) -> Sequence[int]:
+        """Issue numbers of a project (all projects if None) matching a filter, cached"""
+        if project_id is None:
+            numbers: Sequence[int] = range(len(self.dataset.issue_ids))
+        else:
+            numbers = self.dataset.project_issues.get(project_id, range(0))
+        if not filter_text:
+            return numbers
+        key = (project_id or '', filter_text)
+        with self._filter_lock:
+            cached = self._filter_cache.get(key)
+        if cached is None:
+            filters = parse_rsql(filter_text)
+            dataset = self.dataset
+            cached = [n for n in numbers
+                      if rsql_matches(filters, lambda field: dataset.field(n, field))]
+            with self._filter_lock:
+                self._filter_cache[key] = cached
+        return cached
+
+    def _cursor_page(self, url, params: Dict[str, List[str]], numbers: Sequence[int],
+                     encode_item) -> bytes:
+        """Cursor paginated listing with a `next` link, assembled from encoded items"""
+        cursor = self._param(params, '_cursor')
+        offset = decode_cursor(cursor) if cursor else 0
+        first = max(1, int(self._param(params, '_first', 100)))
+        page = numbers[offset:offset + first]
+        links = []
+        if offset + first < len(numbers):
+            query = {key: values[0] for key, values in params.items() if key != '_cursor'}
+            query['_cursor'] = encode_cursor(offset + first)
+            links.append({'href': f"{self.base_url}{url.path}?{urlencode(query, quote_via=quote)}",
+                          'rel': 'next', 'method': 'GET'})
+        tail = json.dumps({'_links': links, '_collection': {'itemCount': len(numbers)}})
+        return b'{"_items":[' + b','.join(encode_item(n) for n in page) + b'],' + \
+            tail[1:].encode()
+
+    # Portfolio endpoints
+    def _portfolios(self, params, url):
+        return 200, self._offset_page([self.dataset.portfolio], params)
+
+    def _portfolio_items(self, params, url, portfolio_id):
+        if portfolio_id != self.dataset.portfolio['id']:
+            return 404, {'title': 'Portfolio not found'}
+        return 200, self._offset_page(self.dataset.applications, params)
+
+    def _portfolio_item(self, params, url, item_id):
+        for item in self.dataset.applications:
+            if item['id'] == item_id:
+                return 200, item
+        return 404, {'title': 'Portfolio item not found'}
+
+    def _subitems(self, params, url, item_id):
+        return 200, self._offset_page(self.dataset.projects.get(item_id, []), params)
+
+    def _all_subitems(self, params, url):
+        return 200, self._offset_page(self.dataset.all_projects(), params)
+
+    def _branches(self, params, url, subitem_id):
+        return 200, self._offset_page(self.dataset.branches.get(subitem_id, []), params)
+
+    def _test_issues(self, params, url):
+        numbers = self._project_issue_numbers(self._param(params, 'portfolioSubItemId'), None)
+        offset = int(self._param(params, '_offset', 0))
+        limit = max(1, int(self._param(params, '_limit', 100)))
+        page = numbers[offset:offset + limit]
+        tail = json.dumps({'_links': [], '_collection': {
+            'itemCount': len(numbers),
+            'currentPage': offset // limit + 1,
+            'pageCount': max(1, -(-len(numbers) // limit))
+        }})
+        return 200, b'{"_items":[' + \
+            b','.join(self.dataset.management_issue(n) for n in page) + b'],' + tail[1:].encode()
+
+    # Findings endpoints
+    def _issues(self, params, url):
+        numbers = self._project_issue_numbers(self._param(params, 'projectId'),
+                                              self._param(params, '_filter'))
+        return 200, self._cursor_page(url, params, numbers, self.dataset.findings_issue)
+
+    def _issue_counts(self, params, url):
+        numbers = self._project_issue_numbers(self._param(params, 'projectId'),
+                                              self._param(params, '_filter'))
+        groups = [group for value in params.get('_group', []) for group in value.split(',')
+                  if group]
+        if not groups:
+            return 200, {'_items': [{'count': len(numbers)}]}
+        counts: Dict[Tuple, int] = {}
+        for n in numbers:
+            key = tuple(self.dataset.field(n, group) for group in groups)
+            counts[key] = counts.get(key, 0) + 1
+        items = [
+            {'group': [{'key': group, 'value': value} for group, value in zip(groups, key)],
+             'count': count}
+            for key, count in sorted(counts.items(), key=lambda item: -item[1])
+        ]
+        return 200, {'_items': items, '_collection': {'itemCount': len(items)}}
+
+    def _issue(self, params, url, issue_id):
+        n = self.dataset.issue_number(issue_id)
+        if n is None:
+            return 404, {'title': 'Issue not found'}
+        return 200, self.dataset.findings_issue(n)
+
+    def _occurrence_record(self, n: int) -> bytes:
+        return json.dumps({
+            'id': self.dataset.occurrence_id(n),
+            'issueId': self.dataset.issue_ids[n],
+            'artifacts': [{'id': _uuid(0xa000, n)}],
+            'properties': self.dataset.templates[self.dataset.template_index(n)].get('attributes')
+        }).encode()
+
+    def _occurrences(self, params, url):
+        numbers = self._project_issue_numbers(self._param(params, 'projectId'),
+                                              self._param(params, '_filter'))
+        return 200, self._cursor_page(url, params, numbers, self._occurrence_record)
+
+    def _occurrence_number(self, occurrence_id: str) -> int:
+        n = self.dataset.occurrence_number(occurrence_id)
+        if n is None:
+            raise KeyError(f"Unknown occurrence {occurrence_id}")
+        return n
+
+    def _occurrence(self, params, url, occurrence_id):
+        return 200, self._occurrence_record(self._occurrence_number(occurrence_id))
+
+    def _snippet(self, params, url, occurrence_id):
+        return 200, self.dataset.snippet(self._occurrence_number(occurrence_id))
+
+    def _assist(self, params, url, occurrence_id):
+        return 200, self.dataset.assist(self._occurrence_number(occurrence_id))
+
+    def _artifact(self, params, url, occurrence_id, artifact_id):
+        n = self._occurrence_number(occurrence_id)
+        return 200, self.dataset.artifact(n, _parse_uuid(artifact_id, 0xa000) or 0,
+                                          self.artifact_size)
+
+
+def main() -> None:
+    """Run the mock server in the foreground"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    parser = argparse.ArgumentParser(description='Local mock Polaris server')
+    parser.add_argument('--port', type=int, default=8080, help='Port (default: 8080)')
+    parser.add_argument('--fixtures', default='polaris_output',
+                        help='Fixture directory (default: polaris_output)')
+    parser.add_argument('--issues', type=int,
+                        help='Clone the fixture issues up to this many issues')
+    parser.add_argument('--synthetic', action='store_true',
+                        help='Generate bench-app/bench-project instead of the fixture portfolio')
+    parser.add_argument('--applications', type=int, default=1,
+                        help='With --synthetic, number of applications (default: 1)')
+    parser.add_argument('--projects', type=int, default=1,
+                        help='With --synthetic, projects per application (default: 1)')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added per response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Random extra seconds per response')
+    parser.add_argument('--assist-latency', type=float, default=0.0,
+                        help='Extra seconds per assist response')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='Fraction of requests answered with 500')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0,
+                        help='Fraction of requests answered with 429')
+    parser.add_argument('--retry-after', type=float, default=1,
+                        help='Retry-After seconds of 429 responses (default: 1)')
+    parser.add_argument('--quota', type=float,
+                        help='Requests per second served before answering 429 (default: unlimited)')
+    args = parser.parse_args()
+
+    if args.synthetic:
+        dataset = MockDataset.synthetic(args.issues or 1000, args.applications, args.projects,
+                                        fixtures_dir=args.fixtures)
+    else:
+        dataset = MockDataset.from_fixtures(args.fixtures, args.issues)
+    server = MockPolarisServer(
+        dataset, port=args.port, latency=args.latency, jitter=args.jitter,
+        assist_latency=args.assist_latency, error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate, retry_after=args.retry_after, quota=args.quota
+    )
+    print(f"Serving {len(dataset.issue_ids)} issues on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+# models.py - Compact typed models for Polaris issues and their property lists
+
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class PropertySet:
+    """
+    Base class for a key/value property list indexed into slots in one pass
+
+    The API returns properties as `[{"key": ..., "value": ...}, ...]`. Keys
+    listed in FIELDS become slot attributes; all other properties are kept as
+    compact (key, value) tuples and only turned into a dict when `extra` is
+    first used. If a key repeats, the first value wins.
+    """
+
+    __slots__ = ('_keys', '_extra_raw', '_extra')
+
+    # Property key to slot attribute
+    FIELDS: Dict[str, str] = {}
+
+    def __init__(self, properties: Optional[List[Dict]] = None):
+        for attr in self.FIELDS.values():
+            setattr(self, attr, None)
+        keys = []
+        extra = []
+        for prop in properties or ():
+            key = prop.get('key')
+            value = prop.get('value')
+            keys.append(key)
+            attr = self.FIELDS.get(key)
+            if attr is None:
+                extra.append((key, value))
+            elif getattr(self, attr) is None:
+                setattr(self, attr, value)
+        self._keys = tuple(keys)
+        self._extra_raw = tuple(extra)
+        self._extra = None
+
+    @property
+    def extra(self) -> Dict:
+        """Properties without a dedicated attribute, decoded on first access"""
+        if self._extra is None:
+            self._extra = {}
+            for key, value in self._extra_raw:
+                self._extra.setdefault(key, value)
+            self._extra_raw = ()
+        return self._extra
+
+    def has(self, key: str) -> bool:
+        """Whether the property list contained the key"""
+        return key in self._keys
+
+    def get(self, key: str, default=None):
+        """Value of a property by its API key"""
+        attr = self.FIELDS.get(key)
+        value = getattr(self, attr) if attr is not None else self.extra.get(key)
+        return default if value is None else value
+
+    def items(self) -> Iterator[Tuple[str, object]]:
+        """All properties in their original order"""
+        seen = set()
+        for key in self._keys:
+            if key not in seen:
+                seen.add(key)
+                yield key, self.get(key)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+
+class Occurrence(PropertySet):
+    """Occurrence properties (`occurrenceProperties` or `attributes`) of an issue"""
+
+    FIELDS = {
+        'severity': 'severity',
+        'filename': 'filename',
+        'line-number': 'line_number',
+        'location': 'location',
+        'language': 'language',
+        'cwe': 'cwe',
+        'description': 'description',
+        'technical-description': 'technical_description',
+        'solution': 'solution',
+        'component-name': 'component_name',
+        'component-version-name': 'component_version',
+        'vulnerability-id': 'vulnerability_id',
+        'vulnerability-source': 'vulnerability_source',
+        'published-date': 'published_date',
+        'overall-score': 'overall_score',
+    }
+    __slots__ = tuple(FIELDS.values())
+
+    @property
+    def cwe_label(self) -> str:
+        """CWE as 'CWE-<id>', or 'Unknown'"""
+        if self.cwe is None:
+            return 'Unknown'
+        cwe = str(self.cwe)
+        return cwe if cwe.startswith('CWE-') else f"CWE-{cwe}"
+
+
+class Triage(PropertySet):
+    """Triage properties of an issue"""
+
+    FIELDS = {
+        'status': 'status',
+        'dismissal-reason': 'dismissal_reason',
+        'comment': 'comment',
+    }
+    __slots__ = tuple(FIELDS.values())
+
+
+class Finding:
+    """An issue with its occurrence and triage properties indexed into attributes"""
+
+    __slots__ = ('id', 'type_name', 'occurrence', 'triage', 'first_detected_on', 'type_id')
+
+    def __init__(self, id: Optional[str], type_name: Optional[str], occurrence: Occurrence,
+                 triage: Triage, first_detected_on: Optional[str] = None,
+                 type_id: Optional[str] = None):
+        self.id = id
+        self.type_name = type_name
+        self.occurrence = occurrence
+        self.triage = triage
+        self.first_detected_on = first_detected_on
+        self.type_id = type_id
+
+    @classmethod
+    def from_dict(cls, issue: Dict) -> 'Finding':
+        """
+        Build a finding from an API issue
+
+        Accepts findings API issues (`occurrenceProperties`) as well as
+        issue-management issues (`attributes`).
+        """
+        issue_type = issue.get('type')
+        type_id = None
+        if isinstance(issue_type, dict):
+            type_id = issue_type.get('id')
+            issue_type = issue_type.get('_localized', {}).get('name') or issue_type.get('name')
+        properties = issue.get('occurrenceProperties')
+        if properties is None:
+            properties = issue.get('attributes')
+        return cls(
+            issue.get('id'),
+            issue_type,
+            Occurrence(properties),
+            Triage(issue.get('triageProperties')),
+            issue.get('firstDetectedOn'),
+            type_id
+        )
+
+    def __repr__(self) -> str:
+        return f"Finding(id={self.id!r}, type_name={self.type_name!r})"
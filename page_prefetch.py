@@ -0,0 +1,112 @@
+# page_prefetch.py - Background prefetching of cursor-paginated API listings
+
+import asyncio
+import queue
+import threading
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterator, Optional
+
+# Marks the end of a listing in the page queue
+_DONE = object()
+
+
+def iter_prefetched(fetch_page: Callable[[Optional[str]], Dict],
+                    next_cursor: Callable[[Dict], Optional[str]],
+                    cursor: Optional[str] = None, depth: int = 1) -> Iterator[Dict]:
+    """
+    Yield the pages of a cursor listing while the next ones are fetched in the background
+
+    A worker thread requests page N+1 as soon as page N has arrived and its
+    next cursor is known, so the consumer processes one page while the
+    following one is on the network. At most `depth` fetched pages wait in
+    the queue; the worker blocks once it is full. Pages are yielded in order
+    and a failed request is raised at the position of its page. Closing the
+    iterator early stops the worker after its current request.
+
+    Args:
+        fetch_page: Function returning the page at a cursor, the first page for None
+        next_cursor: Function returning the cursor after a page, None on the last page
+        cursor: Cursor of the first page to fetch
+        depth: Maximum number of fetched pages buffered ahead of the consumer
+    """
+    pages: queue.Queue = queue.Queue(maxsize=max(1, depth))
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        # Wake up regularly so a closed iterator does not leave the worker blocked
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def work() -> None:
+        page_cursor = cursor
+        try:
+            while not stop.is_set():
+                page = fetch_page(page_cursor)
+                if not put((page, None)):
+                    return
+                page_cursor = next_cursor(page)
+                if not page_cursor:
+                    break
+            put(_DONE)
+        except BaseException as e:
+            put((None, e))
+
+    worker = threading.Thread(target=work, name='page-prefetch', daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = pages.get()
+            if item is _DONE:
+                return
+            page, error = item
+            if error is not None:
+                raise error
+            yield page
+    finally:
+        stop.set()
+
+
+async def aiter_prefetched(fetch_page: Callable[[Optional[str]], Awaitable[Dict]],
+                           next_cursor: Callable[[Dict], Optional[str]],
+                           cursor: Optional[str] = None,
+                           depth: int = 1) -> AsyncIterator[Dict]:
+    """
+    Asyncio counterpart of `iter_prefetched`, fetching in a task instead of a thread
+
+    Args:
+        fetch_page: Coroutine function returning the page at a cursor
+        next_cursor: Function returning the cursor after a page, None on the last page
+        cursor: Cursor of the first page to fetch
+        depth: Maximum number of fetched pages buffered ahead of the consumer
+    """
+    pages: asyncio.Queue = asyncio.Queue(maxsize=max(1, depth))
+
+    async def work() -> None:
+        page_cursor = cursor
+        try:
+            while True:
+                page = await fetch_page(page_cursor)
+                await pages.put((page, None))
+                page_cursor = next_cursor(page)
+                if not page_cursor:
+                    break
+            await pages.put(_DONE)
+        except Exception as e:
+            await pages.put((None, e))
+
+    worker = asyncio.ensure_future(work())
+    try:
+        while True:
+            item = await pages.get()
+            if item is _DONE:
+                return
+            page, error = item
+            if error is not None:
+                raise error
+            yield page
+    finally:
+        worker.cancel()
@@ -0,0 +1,206 @@
+# partitioned_fetch.py - Parallel cursor streams over disjoint RSQL partitions of a project's issues
+
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence
+from findings import PolarisFindingsAPI
+from rsql import rsql_value
+
+# Group fields tried in order; a partition larger than one worker's share is
+# split again by the next field
+DEFAULT_PARTITION_KEYS = ('occurrence:severity', 'occurrence:language', 'type:id')
+
+# Marks a finished partition stream in the page queue
+_DONE = object()
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IssuePartition:
+    """A disjoint slice of a project's issues, selected by RSQL conditions"""
+    conditions: List[str] = field(default_factory=list)
+    count: int = 0
+
+    @property
+    def filter(self) -> Optional[str]:
+        """RSQL `_filter` of the partition, None for all issues"""
+        return ';'.join(self.conditions) or None
+
+
+def _group_values(response: Dict) -> Dict[Optional[str], int]:
+    """{value: count} of a single-field grouped count response, None for issues without a value"""
+    counts: Dict[Optional[str], int] = {}
+    for item in response.get('_items', []):
+        group = item.get('group', item)
+        if isinstance(group, list):
+            group = group[0] if group else {}
+        value = group.get('value') if isinstance(group, dict) else group
+        value = None if value in (None, '') else str(value)
+        counts[value] = counts.get(value, 0) + item.get('count', 0)
+    return counts
+
+
+def split_partition(findings_api: PolarisFindingsAPI, project_id: str, partition: IssuePartition,
+                    key: str, branch_id: Optional[str] = None) -> List[IssuePartition]:
+    """
+    Split a partition into one partition per value of `key`
+
+    A missing (NULL) value matches no RSQL comparison, so issues without a
+    value for `key` could not be selected by any partition. If the counts
+    include such issues the partition is returned whole, with its count
+    updated, to be split by another key.
+    """
+    params = {'_includeAverageAge': False}
+    if branch_id:
+        params['branchId'] = branch_id
+    if partition.filter:
+        params['_filter'] = partition.filter
+    counts = _group_values(findings_api.get_group_counts(project_id, key, params=params))
+
+    if counts.get(None):
+        logger.debug(f"Not partitioning by {key}: {counts[None]} issues have no value")
+        return [IssuePartition(list(partition.conditions), sum(counts.values()))]
+    return [
+        IssuePartition(partition.conditions + [f"{key}=={rsql_value(value)}"], counts[value])
+        for value in sorted(value for value in counts if value is not None) if counts[value]
+    ]
+
+
+def plan_partitions(findings_api: PolarisFindingsAPI, project_id: str,
+                    keys: Sequence[str] = DEFAULT_PARTITION_KEYS, workers: int = 8,
+                    branch_id: Optional[str] = None,
+                    base_filter: Optional[str] = None) -> List[IssuePartition]:
+    """
+    Partition a project's issues by grouped counts, balanced across `workers`
+
+    The issues are split by the first key. Every partition holding more than
+    an equal share of the issues per worker is split again by the next key,
+    until all fit or the keys run out; the count requests of one level run
+    in parallel. A key that some issues of a partition have no value for
+    leaves it whole for the next key (see `split_partition`). Partitions are returned largest first, so handing them to a
+    pool in order keeps the workers evenly busy.
+
+    Args:
+        findings_api: Findings API client
+        project_id: Project ID
+        keys: Group fields to partition by, e.g. 'occurrence:severity'
+        workers: Number of streams the partitions are fetched with
+        branch_id: Optional branch ID
+        base_filter: RSQL filter every partition is restricted to
+    """
+    base = IssuePartition()
+    if base_filter:
+        # ';' binds tighter than ',', so an OR filter needs parentheses
+        base.conditions.append(f"({base_filter})" if ',' in base_filter else base_filter)
+    if not keys:
+        return [base]
+
+    partitions = split_partition(findings_api, project_id, base, keys[0], branch_id)
+    share = sum(partition.count for partition in partitions) / max(1, workers)
+    for key in keys[1:]:
+        large = [partition for partition in partitions if partition.count > share]
+        if not large:
+            break
+        partitions = [partition for partition in partitions if partition.count <= share]
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(large)))) as executor:
+            for parts in executor.map(
+                lambda partition: split_partition(findings_api, project_id, partition, key,
+                                                  branch_id),
+                large
+            ):
+                partitions.extend(parts)
+    return sorted(partitions, key=lambda partition: -partition.count)
+
+
+def iter_issues_partitioned(findings_api: PolarisFindingsAPI, project_id: str,
+                            partition_by: Sequence[str] = DEFAULT_PARTITION_KEYS,
+                            max_workers: int = 8, page_size: int = 100,
+                            branch_id: Optional[str] = None, params: Optional[Dict] = None,
+                            partitions: Optional[List[IssuePartition]] = None) -> Iterator[Dict]:
+    """
+    Fetch all issues of a project with one cursor stream per partition in parallel
+
+    Cursor pagination is serial, so a single listing of a large project is
+    bound by one request at a time. This plans partitions from grouped
+    counts (`plan_partitions`) and runs up to `max_workers` partition
+    listings at the same time. Issues are yielded as pages arrive, in no
+    particular order; at most twice `max_workers` pages are buffered.
+
+    Args:
+        findings_api: Findings API client
+        project_id: Project ID
+        partition_by: Group fields to partition by
+        max_workers: Number of partitions fetched at the same time
+        page_size: Number of issues per page
+        branch_id: Optional branch ID
+        params: Additional query parameters; a `_filter` restricts every partition
+        partitions: Partitions planned beforehand, planned here if omitted
+
+    Yields:
+        Each issue once
+    """
+    params = dict(params or {})
+    base_filter = params.pop('_filter', None)
+    if partitions is None:
+        partitions = plan_partitions(findings_api, project_id, partition_by, max_workers,
+                                     branch_id, base_filter)
+    expected = sum(partition.count for partition in partitions)
+    workers = max(1, min(max_workers, len(partitions)))
+    logger.info(f"Fetching {expected} issues in {len(partitions)} partitions "
+                f"with {workers} streams")
+
+    pages: queue.Queue = queue.Queue(maxsize=2 * workers)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        # Wake up regularly so a closed iterator does not leave workers blocked
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def fetch(partition: IssuePartition) -> None:
+        error = None
+        try:
+            partition_params = dict(params)
+            if partition.filter:
+                partition_params['_filter'] = partition.filter
+            for page in findings_api.get_issues_paginated(
+                project_id, page_size=page_size, branch_id=branch_id, params=partition_params
+            ):
+                if not put(page):
+                    return
+        except BaseException as e:
+            error = e
+        put((_DONE, error))
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        # Largest partitions first, so the small ones fill in at the end
+        for partition in partitions:
+            executor.submit(fetch, partition)
+        remaining = len(partitions)
+        yielded = 0
+        while remaining:
+            item = pages.get()
+            if isinstance(item, tuple) and item[0] is _DONE:
+                remaining -= 1
+                if item[1] is not None:
+                    raise item[1]
+                continue
+            for issue in item.get('_items', []):
+                yielded += 1
+                yield issue
+        if yielded != expected:
+            logger.warning(f"Partitions held {yielded} issues, {expected} were counted; "
+                           f"issues changed during the fetch or a partition filter missed some")
+    finally:
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -1,26 +1,69 @@
 #!/usr/bin/env python3
 
+import os
 import sys
+import time
 import logging
 import argparse
+import threading
 from datetime import datetime
 import json
-from typing import Dict, List, Optional, Any, Iterator
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, Iterator, Tuple
+from dataclasses import dataclass, field, asdict
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from assist_cache import AssistCache
 from findings import PolarisFindingsAPI
-from portfolio import PolarisPortfolioAPI, PaginationParams
+from models import Finding
+from partitioned_fetch import DEFAULT_PARTITION_KEYS, iter_issues_partitioned, plan_partitions
+from portfolio import PolarisPortfolioAPI
+from portfolio_resolver import PortfolioResolver
+from response_cache import ResponseCache
+from taxonomy_index import TaxonomyIndex
+from report_checkpoint import ReportCheckpoint, default_checkpoint_path
+from report_writer import JsonArrayReportWriter, JsonLinesReportWriter
+from request_metrics import RequestMetrics
+from rate_limiter import AdaptiveRateLimiter
+from transport import PolarisTransport
 
 @dataclass
 class ReportConfig:
     """Report configuration class"""
     base_url: str
     api_token: str
-    app_name: str
-    project_name: str
+    app_name: Optional[str]
+    project_name: Optional[str]
     branch: Optional[str] = None
     page_size: int = 100
+    prefetch_pages: int = 2
+    partition_by: Optional[List[str]] = None
     max_retries: int = 3
+    max_rate: Optional[float] = None
     timeout: int = 30
+    concurrency: int = 8
+    cache_dir: Optional[str] = None
+    output_format: str = 'json'
+    output_file: Optional[str] = None
+    all_projects: bool = False
+    project_concurrency: int = 4
+    include_details: bool = False
+    assist_cache: bool = True
+    include_standards: bool = False
+    metrics: bool = True
+    metrics_output: Optional[str] = None
+    resume: bool = False
+    checkpoint_file: Optional[str] = None
+
+@dataclass
+class ProjectScanResult:
+    """Outcome of one project in a portfolio-wide scan"""
+    application: str
+    project: str
+    project_id: str
+    issues: int = 0
+    by_severity: Dict[str, int] = field(default_factory=dict)
+    elapsed: float = 0.0
+    error: Optional[str] = None
 
 class ReportFormatter:
     """Formats report data for output"""
@@ -43,64 +86,26 @@ class ReportFormatter:
     def print_finding(finding: dict, index: int) -> None:
         """Print individual finding details"""
         try:
-            # Get type info from localized name
-            finding_type = finding.get('type', {}).get('_localized', {}).get('name', 'Unknown')
-            
-            # Get properties from occurrenceProperties
-            occurrence_props = finding.get('occurrenceProperties', [])
-            
-            # Extract all necessary information at once
-            info = {
-                'severity': 'Unknown',
-                'filename': 'Unknown',
-                'line_number': 'Unknown',
-                'location': 'Unknown',
-                'cwe': 'Unknown',
-                'description': None,
-                'technical_description': None,
-                'component_name': None,
-                'vulnerability_id': None,
-                'solution': None
-            }
-            
-            # Update info from occurrence properties
-            for prop in occurrence_props:
-                key = prop.get('key', '')
-                value = prop.get('value', '')
-                
-                if key == 'severity':
-                    info['severity'] = value
-                elif key == 'filename':
-                    info['filename'] = value
-                elif key == 'line-number':
-                    info['line_number'] = value
-                elif key == 'location':
-                    info['location'] = value
-                elif key == 'cwe':
-                    info['cwe'] = f"CWE-{value}"
-                elif key == 'description':
-                    info['description'] = value
-                elif key == 'technical-description':
-                    info['technical_description'] = value
-                elif key == 'component-name':
-                    info['component_name'] = value
-                elif key == 'vulnerability-id':
-                    info['vulnerability_id'] = value
-                elif key == 'solution':
-                    info['solution'] = value
+            # Index the occurrence properties once
+            model = Finding.from_dict(finding)
+            occurrence = model.occurrence
             
             # Print basic info
             print(f"Finding #{index}")
-            print(f"Type:          {finding_type}")
-            print(f"Severity:      {severity}")
-            print(f"File Path:     {file_path}")
-            print(f"Line Number:   {line_number}")
-            print(f"CWE:          {cwe}")
+            print(f"Type:          {model.type_name or 'Unknown'}")
+            print(f"Severity:      {occurrence.severity or 'Unknown'}")
+            print(f"File Path:     {occurrence.filename or occurrence.location or 'Unknown'}")
+            print(f"Line Number:   {occurrence.line_number or 'Unknown'}")
+            print(f"CWE:          {occurrence.cwe_label}")
             
             # Print additional properties
-            for prop in occurrence_props:
-                if prop['key'] not in ['cwe', 'severity']:
-                    print(f"{prop['key']}:".ljust(14) + str(prop['value']))
+            for key, value in occurrence.items():
+                if key not in ['cwe', 'severity']:
+                    print(f"{key}:".ljust(14) + str(value))
+            
+            # Print standards from the taxonomy index
+            for taxonomy, labels in (finding.get('standards') or {}).items():
+                print(f"{taxonomy}: {', '.join(labels)}")
             
             print()
             
@@ -153,57 +158,99 @@ class ReportFormatter:
         except Exception as e:
             logging.error(f"Error printing remediation: {str(e)}")
 
+    @staticmethod
+    def print_project_breakdown(results: List[ProjectScanResult]) -> None:
+        """Print the per-project issue counts of a portfolio-wide scan"""
+        print("=" * 80)
+        print(" " * 30 + "PER-PROJECT BREAKDOWN")
+        print("=" * 80)
+        for result in sorted(results, key=lambda r: r.issues, reverse=True):
+            name = f"{result.application} / {result.project}"
+            if result.error:
+                print(f"{name}: ERROR {result.error}")
+                continue
+            severities = ', '.join(f"{severity} {count}" for severity, count
+                                   in sorted(result.by_severity.items()))
+            print(f"{name}: {result.issues} issues ({severities or 'none'}) in {result.elapsed:.1f}s")
+        print()
+
 class PolarisReporter:
     """Main reporter class"""
     
     def __init__(self, config: ReportConfig):
         """Initialize reporter with configuration"""
         self.config = config
-        self.findings_api = PolarisFindingsAPI(config.base_url, config.api_token)
-        self.portfolio_api = PolarisPortfolioAPI(config.base_url, config.api_token)
+        self.cache = None
+        if config.cache_dir:
+            self.cache = ResponseCache(os.path.join(config.cache_dir, 'responses.sqlite'))
+        # Per-endpoint latency, bytes and status counts of both clients
+        self.metrics = RequestMetrics() if config.metrics or config.metrics_output else None
+        # Both clients share one connection pool sized for the enrichment workers,
+        # plus as many partition streams when the listing is partitioned
+        pool_size = config.concurrency * (2 if config.partition_by else 1) + 2
+        self.transport = PolarisTransport(
+            pool_maxsize=max(10, pool_size),
+            timeout=config.timeout,
+            metrics=self.metrics,
+            # Without a cap the shared limiter adapts to the tenant's 429s
+            rate_limiter=AdaptiveRateLimiter(max_rate=config.max_rate) if config.max_rate else None,
+            max_retries=config.max_retries
+        )
+        self.findings_api = PolarisFindingsAPI(
+            config.base_url, config.api_token, cache=self.cache, transport=self.transport
+        )
+        self.portfolio_api = PolarisPortfolioAPI(
+            config.base_url, config.api_token, cache=self.cache, transport=self.transport
+        )
+        self.resolver = PortfolioResolver(
+            self.portfolio_api,
+            path=os.path.join(config.cache_dir or '.polaris_cache', 'portfolio_index.json')
+        )
+        # AI assist responses are shared by every occurrence of the same pattern,
+        # persisted like the response cache only with a cache directory
+        self.assist_cache = None
+        if config.assist_cache and config.cache_dir:
+            self.assist_cache = AssistCache(
+                os.path.join(config.cache_dir, 'assist.sqlite'),
+                scope=f"{config.base_url.rstrip('/')}\0{config.api_token}"
+            )
+        # Standards (OWASP, CWE, ...) per issue type come from a local taxonomy index
+        self.taxonomy = None
+        if config.include_standards:
+            self.taxonomy = TaxonomyIndex(
+                self.findings_api,
+                path=os.path.join(config.cache_dir or '.polaris_cache', 'taxonomy_index.json')
+            )
         self.logger = logging.getLogger(__name__)
 
-    def find_project_ids(self) -> tuple[Optional[str], Optional[str]]:
-        """Find application and project IDs"""
+    def find_project_ids(self) -> tuple[Optional[str], Optional[str], Optional[str]]:
+        """Find application, project and branch IDs, the branch ID None without --branch"""
         try:
-            # Get portfolios
-            portfolios = self.portfolio_api.get_portfolios()
-            if not portfolios.get('_items'):
-                self.logger.error("No portfolios found")
-                return None, None
+            app_id, project_id, branch_id = self.resolver.resolve(
+                self.config.app_name, self.config.project_name, self.config.branch
+            )
+            if not app_id or not project_id:
+                self.logger.error(f"Application '{self.config.app_name}' or project '{self.config.project_name}' not found")
+                return None, None, None
+            if self.config.branch and not branch_id:
+                self.logger.error(f"Branch '{self.config.branch}' not found in project '{self.config.project_name}'")
+                return None, None, None
                 
-            portfolio_id = portfolios['_items'][0]['id']
-            
-            # Get portfolio items (applications)
-            pagination = PaginationParams(limit=100)
-            items = self.portfolio_api.get_portfolio_items(portfolio_id, pagination)
-            
-            # Find matching application
-            for item in items.get('_items', []):
-                if item['name'] == self.config.app_name:
-                    app_id = item['id']
-                    
-                    # Get application subitems (projects)
-                    subitems = self.portfolio_api.get_portfolio_item_subitems(app_id)
-                    
-                    # Find matching project
-                    for subitem in subitems.get('_items', []):
-                        if subitem['name'] == self.config.project_name:
-                            return app_id, subitem['id']
-                            
-            self.logger.error(f"Application '{self.config.app_name}' or project '{self.config.project_name}' not found")
-            return None, None
+            return app_id, project_id, branch_id
             
         except Exception as e:
             self.logger.error(f"Error finding project IDs: {str(e)}")
-            return None, None
+            return None, None, None
 
-    def get_issues_info(self, project_id: str) -> Optional[Dict]:
+    def get_issues_info(self, project_id: str, branch_id: Optional[str] = None) -> Optional[Dict]:
         """Get issues summary information"""
         try:
+            params = {'_first': 1}
+            if branch_id:
+                params['branchId'] = branch_id
             results = self.findings_api.get_issues(
                 project_id=project_id,
-                params={'_first': 1}
+                params=params
             )
             return {
                 'total_issues': results.get('_collection', {}).get('itemCount', 0)
@@ -212,18 +259,84 @@ class PolarisReporter:
             self.logger.error(f"Error getting issues info: {str(e)}")
             return None
 
-    def get_findings(self, project_id: str) -> Iterator[Dict]:
-        """Get all findings using pagination"""
+    def get_findings(self, project_id: str, cursor: Optional[str] = None,
+                     skip_ids: Optional[List[str]] = None,
+                     cursors: Optional[Dict[str, Optional[str]]] = None,
+                     branch_id: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Get all findings using pagination
+        
+        Args:
+            project_id: Project ID
+            cursor: Start at the page with this cursor instead of the first page
+            skip_ids: Findings of the first page to leave out, already reported
+            cursors: Filled with the cursor of the page each finding came from
+            branch_id: Only findings of this branch
+            
+        With `partition_by` configured, findings are fetched by parallel
+        partition streams in no particular order, and the cursor arguments
+        do not apply. If the planned partitions do not add up to the issue
+        count of the project, the single cursor listing is used instead.
+            
+        Raises:
+            The request error if a page cannot be fetched, or a RuntimeError
+            if the partition streams return fewer or more issues than the
+            project holds, so an incomplete run is not mistaken for a
+            complete one
+        """
+        skip = set(skip_ids or ())
         try:
+            if self.config.partition_by:
+                partitions = plan_partitions(
+                    self.findings_api,
+                    project_id,
+                    keys=self.config.partition_by,
+                    workers=self.config.concurrency,
+                    branch_id=branch_id
+                )
+                planned = sum(partition.count for partition in partitions)
+                issues_info = self.get_issues_info(project_id, branch_id)
+                total = issues_info['total_issues'] if issues_info else None
+                if total is None or planned != total:
+                    self.logger.warning(f"Partitions hold {planned} of {total} issues, "
+                                        f"fetching findings with a single listing instead")
+                else:
+                    fetched = 0
+                    for finding in iter_issues_partitioned(
+                        self.findings_api,
+                        project_id,
+                        max_workers=self.config.concurrency,
+                        page_size=self.config.page_size,
+                        branch_id=branch_id,
+                        partitions=partitions
+                    ):
+                        fetched += 1
+                        yield finding
+                    if fetched != total:
+                        raise RuntimeError(f"Partitioned listing returned {fetched} of {total} issues, "
+                                           f"run again without --partition-by")
+                    return
+                
             for page in self.findings_api.get_issues_paginated(
                 project_id=project_id,
-                page_size=self.config.page_size
+                page_size=self.config.page_size,
+                cursor=cursor,
+                branch_id=branch_id,
+                # Fetch the next pages while this one is being enriched
+                prefetch=self.config.prefetch_pages
             ):
                 for finding in page.get('_items', []):
+                    if finding.get('id') in skip:
+                        continue
+                    if cursors is not None:
+                        cursors[finding['id']] = cursor
                     yield finding
+                cursor = self.findings_api.get_next_cursor(page)
+                skip = set()
                     
         except Exception as e:
             self.logger.error(f"Error getting findings: {str(e)}")
+            raise
 
     def get_finding_details(self, finding_id: str, project_id: str) -> Optional[Dict]:
         """Get detailed information for a finding"""
@@ -241,11 +354,17 @@ class PolarisReporter:
             # Debug log the structure
             self.logger.debug(f"Finding structure: {json.dumps(finding, indent=2)}")
             
+            if self.taxonomy is not None:
+                type_id = Finding.from_dict(finding).type_id
+                if type_id:
+                    finding['standards'] = self.taxonomy.standards_for_issue_type(type_id)
+            
             # Get occurrence details if available
             occurrence = finding.get('occurrence', {})
             occurrence_id = occurrence.get('id')
             
             if occurrence_id:
+                snippet = None
                 try:
                     # Get code snippet
                     snippet = self.findings_api.get_occurrence_snippet(
@@ -257,12 +376,19 @@ class PolarisReporter:
                     self.logger.warning(f"Error getting code snippet: {str(e)}")
                     
                 try:
-                    # Get AI remediation
-                    assist = self.findings_api.get_occurrence_assist_with_retry(
-                        occurrence_id=occurrence_id,
-                        project_id=project_id,
-                        max_retries=self.config.max_retries
-                    )
+                    # Get AI remediation, once per issue type and snippet pattern
+                    def fetch_assist() -> Dict:
+                        return self.findings_api.get_occurrence_assist_with_retry(
+                            occurrence_id=occurrence_id,
+                            project_id=project_id
+                        )
+                    
+                    model = Finding.from_dict(finding)
+                    issue_type = model.type_id or model.type_name
+                    if self.assist_cache is not None and snippet is not None and issue_type:
+                        assist = self.assist_cache.get_or_fetch(issue_type, snippet, fetch_assist)
+                    else:
+                        assist = fetch_assist()
                     finding['ai_remediation'] = assist
                 except Exception as e:
                     self.logger.warning(f"Error getting AI remediation: {str(e)}")
@@ -273,56 +399,356 @@ class PolarisReporter:
             self.logger.error(f"Error getting finding details: {str(e)}")
             return None
 
+    def enrich_findings(self, findings: Iterator[Dict], project_id: str,
+                        workers: Optional[int] = None,
+                        start: int = 1) -> Iterator[Tuple[int, Dict, Optional[Dict]]]:
+        """
+        Fetch finding details with a bounded worker pool
+        
+        At most `workers` findings (`concurrency` by default) are enriched at
+        the same time. Results are yielded in the original order as soon as
+        the oldest pending finding completes, so output starts before the
+        whole page is done. Indexes count from `start`.
+        
+        Yields:
+            Tuples of (index, finding, detailed_finding)
+        """
+        workers = max(1, workers or self.config.concurrency)
+        pending = deque()
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for index, finding in enumerate(findings, start):
+                future = executor.submit(self.get_finding_details, finding['id'], project_id)
+                pending.append((index, finding, future))
+                
+                # Keep the window bounded so memory does not grow with the project
+                while len(pending) >= workers * 2 or (pending and pending[0][2].done()):
+                    index_done, finding_done, future_done = pending.popleft()
+                    yield index_done, finding_done, future_done.result()
+                    
+            while pending:
+                index_done, finding_done, future_done = pending.popleft()
+                yield index_done, finding_done, future_done.result()
+
+    def _log_assist_stats(self) -> None:
+        """Log how many AI assist requests the assist cache saved"""
+        if self.assist_cache is None:
+            return
+        stats = self.assist_cache.stats()
+        if any(stats.values()):
+            self.logger.info(
+                f"AI assist: {stats['misses']} fetched, {stats['hits']} from cache, "
+                f"{stats['coalesced']} coalesced with in-flight requests"
+            )
+
+    def report_metrics(self) -> None:
+        """Print the per-endpoint request summary and export it if configured"""
+        if self.metrics is None:
+            return
+        if self.config.metrics:
+            print("\n=== API Requests ===")
+            print(self.metrics.summary())
+        if self.config.metrics_output:
+            self.metrics.write(self.config.metrics_output)
+            self.logger.info(f"Request metrics saved to: {self.config.metrics_output}")
+
+    def _default_report_filename(self) -> str:
+        """Build the timestamped report file name for the configured format"""
+        extension = 'jsonl' if self.config.output_format == 'jsonl' else 'json'
+        return f"polaris_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+
+    def _open_writer(self, filename: str, header: Dict, offset: Optional[int] = None,
+                     count: int = 0):
+        """Open the streaming report writer for the configured format, or continue one at `offset`"""
+        if self.config.output_format == 'jsonl':
+            return JsonLinesReportWriter(filename, header, offset=offset, count=count)
+        return JsonArrayReportWriter(filename, header, offset=offset, count=count)
+        
+    def _checkpoint(self) -> Tuple[ReportCheckpoint, Dict]:
+        """Checkpoint of this run and the run parameters a resumed run must match"""
+        path = self.config.checkpoint_file or default_checkpoint_path(
+            self.config.cache_dir or '.polaris_cache',
+            self.config.app_name, self.config.project_name, self.config.branch
+        )
+        run = {
+            'base_url': self.config.base_url,
+            'application': self.config.app_name,
+            'project': self.config.project_name,
+            'branch': self.config.branch,
+            'output_format': self.config.output_format
+        }
+        return ReportCheckpoint(path), run
+
     def generate_report(self) -> None:
         """Generate and save the full report"""
         try:
             # Find project
-            app_id, project_id = self.find_project_ids()
+            app_id, project_id, branch_id = self.find_project_ids()
             if not app_id or not project_id:
                 return
                 
-            # Get issues info
-            issues_info = self.get_issues_info(project_id)
-            if not issues_info:
+            # Progress is checkpointed after every written finding; a partitioned
+            # listing has no single cursor to continue at
+            checkpoint, run = self._checkpoint()
+            checkpointing = not self.config.partition_by
+            resuming = self.config.resume and checkpoint.load() and checkpoint.matches(run)
+            if self.config.resume and not resuming:
+                self.logger.warning("No checkpoint of an interrupted run found, starting from the first page")
+                
+            if resuming:
+                report_data = checkpoint.state['header']
+                filename = checkpoint.state['output_file']
+                writer = self._open_writer(filename, report_data,
+                                           offset=checkpoint.offset, count=checkpoint.written)
+                self.logger.info(f"Resuming {filename} after {checkpoint.written} findings")
+            else:
+                # Get issues info
+                issues_info = self.get_issues_info(project_id, branch_id)
+                if not issues_info:
+                    return
+                    
+                # Prepare report header
+                report_data = {
+                    'application': self.config.app_name,
+                    'project': self.config.project_name,
+                    'branch': self.config.branch,
+                    'total_issues': issues_info['total_issues'],
+                    'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                }
+                
+                # Findings are written to disk as they are produced
+                filename = self.config.output_file or self._default_report_filename()
+                writer = self._open_writer(filename, report_data)
+                if checkpointing:
+                    checkpoint.start(run, filename, report_data, writer.offset)
+                
+            # Print header
+            ReportFormatter.print_header(report_data)
+            
+            cursors: Dict[str, Optional[str]] = {}
+            with writer:
+                for index, finding, detailed_finding in self.enrich_findings(
+                    self.get_findings(project_id, checkpoint.cursor, checkpoint.page_ids, cursors,
+                                      branch_id=branch_id),
+                    project_id,
+                    start=checkpoint.written + 1
+                ):
+                    cursor = cursors.pop(finding['id'], None)
+                    self.logger.info(f"Processing finding {index} of {report_data['total_issues']}")
+                    
+                    if detailed_finding:
+                        # Print finding details
+                        ReportFormatter.print_finding(detailed_finding, index)
+                        ReportFormatter.print_code_snippet(detailed_finding)
+                        ReportFormatter.print_remediation(detailed_finding)
+                        
+                        writer.write_finding(detailed_finding)
+                        if checkpointing:
+                            checkpoint.record(cursor, finding['id'], writer.offset)
+                
+            if checkpointing:
+                checkpoint.remove()
+            self._log_assist_stats()
+            self.logger.info(f"Report saved to: {filename}")
+            
+        except Exception as e:
+            self.logger.error(f"Error generating report: {str(e)}")
+            if self.config.resume or os.path.exists(self._checkpoint()[0].path):
+                self.logger.error("Run again with --resume to continue where the report stopped")
+            raise
+
+class ScanProgress:
+    """Thread safe progress and throughput counters of a portfolio-wide scan"""
+    
+    def __init__(self, total_projects: int, log_every: int = 1000):
+        self.total_projects = total_projects
+        self.log_every = log_every
+        self.projects_done = 0
+        self.issues = 0
+        self.started = time.time()
+        self._next_log = log_every
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+        
+    @property
+    def rate(self) -> float:
+        """Issues processed per second so far"""
+        elapsed = time.time() - self.started
+        return self.issues / elapsed if elapsed > 0 else 0.0
+        
+    def add_issues(self, count: int) -> None:
+        """Record processed issues, logging every `log_every` issues"""
+        with self._lock:
+            self.issues += count
+            if self.issues < self._next_log:
+                return
+            self._next_log = self.issues + self.log_every
+            issues, projects_done = self.issues, self.projects_done
+        self.logger.info(
+            f"Progress: {issues} issues, {projects_done}/{self.total_projects} projects, "
+            f"{self.rate:.1f} issues/s"
+        )
+        
+    def project_done(self, result: ProjectScanResult) -> None:
+        """Record a finished project"""
+        with self._lock:
+            self.projects_done += 1
+            projects_done = self.projects_done
+        status = f"failed: {result.error}" if result.error else \
+            f"{result.issues} issues in {result.elapsed:.1f}s"
+        self.logger.info(
+            f"[{projects_done}/{self.total_projects}] {result.application} / {result.project} "
+            f"{status} - {self.issues} issues total, {self.rate:.1f} issues/s"
+        )
+
+class PortfolioReporter(PolarisReporter):
+    """
+    Reports on every project of the portfolio in one run
+    
+    Projects are taken from the portfolio index and scanned `concurrency` at
+    a time. `concurrency` also bounds the API requests in flight across all
+    projects, while `project_concurrency` bounds the finding details one
+    project fetches at once. All findings go to one combined report, each
+    tagged with its application and project, followed by a per-project
+    breakdown.
+    """
+    
+    def __init__(self, config: ReportConfig):
+        """Initialize reporter with configuration"""
+        super().__init__(config)
+        self._request_slots = threading.BoundedSemaphore(max(1, config.concurrency))
+        self._write_lock = threading.Lock()
+        
+    def _limited(self, iterator: Iterator) -> Iterator:
+        """Advance an iterator that issues one request per item under the global limit"""
+        while True:
+            with self._request_slots:
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+            
+    def get_finding_details(self, finding_id: str, project_id: str) -> Optional[Dict]:
+        """Get detailed information for a finding under the global request limit"""
+        with self._request_slots:
+            return super().get_finding_details(finding_id, project_id)
+            
+    def list_projects(self) -> List[Tuple[str, str, Dict, Optional[str]]]:
+        """
+        List (application name, project name, project entry, branch ID) of every project to scan
+        
+        The --branch of every project is resolved here, one after another,
+        so branches missing from the index are looked up before the scan
+        threads start. The branch ID is None without --branch or if the
+        project has no such branch.
+        """
+        projects = []
+        for app_name, _, project_name, project in self.resolver.iter_projects(self.config.app_name):
+            if self.config.project_name is not None and project_name != self.config.project_name:
+                continue
+            branch_id = None
+            if self.config.branch:
+                _, _, branch_id = self.resolver.resolve(app_name, project_name, self.config.branch)
+            projects.append((app_name, project_name, project, branch_id))
+        return projects
+        
+    def scan_project(self, app_name: str, project_name: str, project: Dict,
+                     branch_id: Optional[str], writer, progress: ScanProgress) -> ProjectScanResult:
+        """Fetch the findings of one project and append them to the combined report"""
+        result = ProjectScanResult(app_name, project_name, project['id'])
+        started = time.time()
+        context = {'application': app_name, 'project': project_name, 'project_id': project['id']}
+        
+        try:
+            if self.config.branch and branch_id is None:
+                result.error = f"branch '{self.config.branch}' not found"
+                return result
+                    
+            pages = self._limited(iter(self.findings_api.get_issues_paginated(
+                project_id=project['id'],
+                page_size=self.config.page_size,
+                branch_id=branch_id
+            )))
+            findings = (finding for page in pages for finding in page.get('_items', []))
+            if self.config.include_details:
+                findings = (
+                    detailed or finding for _, finding, detailed in self.enrich_findings(
+                        findings, project['id'], workers=self.config.project_concurrency
+                    )
+                )
+                
+            for finding in findings:
+                severity = Finding.from_dict(finding).occurrence.severity or 'Unknown'
+                result.by_severity[severity] = result.by_severity.get(severity, 0) + 1
+                result.issues += 1
+                finding['_project'] = context
+                with self._write_lock:
+                    writer.write_finding(finding)
+                progress.add_issues(1)
+                
+        except Exception as e:
+            self.logger.error(f"Error scanning {app_name} / {project_name}: {str(e)}")
+            result.error = str(e)
+        finally:
+            result.elapsed = round(time.time() - started, 2)
+        return result
+        
+    def generate_report(self) -> None:
+        """Scan every project and save the combined report"""
+        try:
+            projects = self.list_projects()
+            if not projects:
+                self.logger.error("No projects found in the portfolio")
                 return
                 
-            # Prepare report header
             report_data = {
+                'mode': 'portfolio',
                 'application': self.config.app_name,
-                'project': self.config.project_name,
                 'branch': self.config.branch,
-                'total_issues': issues_info['total_issues'],
-                'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'findings': []
+                'total_projects': len(projects),
+                'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             }
+            self.logger.info(f"Scanning {len(projects)} projects")
             
-            # Print header
-            ReportFormatter.print_header(report_data)
-            
-            # Process each finding
-            for index, finding in enumerate(self.get_findings(project_id), 1):
-                self.logger.info(f"Processing finding {index} of {issues_info['total_issues']}")
-                
-                # Get detailed finding info
-                detailed_finding = self.get_finding_details(finding['id'], project_id)
-                if detailed_finding:
-                    # Print finding details
-                    ReportFormatter.print_finding(detailed_finding, index)
-                    ReportFormatter.print_code_snippet(detailed_finding)
-                    ReportFormatter.print_remediation(detailed_finding)
-                    
-                    # Add to report data
-                    report_data['findings'].append(detailed_finding)
-                    
-            # Save report to file
-            filename = f"polaris_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(report_data, f, indent=2, ensure_ascii=False)
+            progress = ScanProgress(len(projects))
+            results = []
+            filename = self.config.output_file or self._default_report_filename()
+            writer = self._open_writer(filename, report_data)
+            try:
+                with ThreadPoolExecutor(max_workers=max(1, self.config.concurrency)) as executor:
+                    futures = [
+                        executor.submit(self.scan_project, app_name, project_name, project,
+                                        branch_id, writer, progress)
+                        for app_name, project_name, project, branch_id in projects
+                    ]
+                    for future in as_completed(futures):
+                        result = future.result()
+                        progress.project_done(result)
+                        results.append(result)
+            finally:
+                elapsed = time.time() - progress.started
+                writer.close({
+                    'projects': [asdict(result) for result in results],
+                    'totals': {
+                        'projects': len(results),
+                        'failed_projects': sum(1 for result in results if result.error),
+                        'issues': progress.issues,
+                        'elapsed_seconds': round(elapsed, 1),
+                        'issues_per_second': round(progress.rate, 1)
+                    }
+                })
                 
+            ReportFormatter.print_project_breakdown(results)
+            self.logger.info(
+                f"Scanned {len(results)} projects, {progress.issues} issues in "
+                f"{elapsed:.1f}s ({progress.rate:.1f} issues/s)"
+            )
+            self._log_assist_stats()
             self.logger.info(f"Report saved to: {filename}")
             
         except Exception as e:
-            self.logger.error(f"Error generating report: {str(e)}")
+            self.logger.error(f"Error generating portfolio report: {str(e)}")
             raise
 
 def setup_logging(debug: bool = False) -> None:
@@ -338,11 +764,61 @@ def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description='Polaris Scan Report Generator')
     parser.add_argument('base_url', help='Polaris base URL')
     parser.add_argument('api_token', help='API token')
-    parser.add_argument('application_name', help='Application name')
-    parser.add_argument('project_name', help='Project name')
+    parser.add_argument('application_name', nargs='?',
+                        help='Application name (optional with --all-projects)')
+    parser.add_argument('project_name', nargs='?',
+                        help='Project name (optional with --all-projects)')
     parser.add_argument('--branch', help='Branch name')
+    parser.add_argument('--all-projects', action='store_true',
+                        help='Report on every project of the portfolio, or of the given application')
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help='Number of findings enriched in parallel; with --all-projects the '
+                             'number of API requests in flight across all projects (default: 8)')
+    parser.add_argument('--project-concurrency', type=int, default=4,
+                        help='With --all-projects, finding details fetched in parallel per project (default: 4)')
+    parser.add_argument('--details', action='store_true',
+                        help='With --all-projects, also fetch snippet and AI remediation per finding')
+    parser.add_argument('--prefetch-pages', type=int, default=2,
+                        help='Issue pages fetched in the background ahead of the one being '
+                             'processed, 0 to disable (default: 2)')
+    parser.add_argument('--partition-by', nargs='?', const=','.join(DEFAULT_PARTITION_KEYS),
+                        metavar='FIELDS',
+                        help='Fetch the issues with parallel streams, one per value of these '
+                             'comma separated group fields, splitting large partitions by the '
+                             f"next field (default: {','.join(DEFAULT_PARTITION_KEYS)})")
+    parser.add_argument('--max-rate', type=float,
+                        help='Never send more than this many API requests per second '
+                             '(default: adapt to the server\'s rate limiting)')
+    parser.add_argument('--timeout', type=int, default=30,
+                        help='Default request read timeout in seconds (default: 30)')
+    parser.add_argument('--cache-dir',
+                        help='Directory for the persistent API response and AI assist caches '
+                             '(disabled if omitted)')
+    parser.add_argument('--output-format', choices=['json', 'jsonl'], default='json',
+                        help='Report format: JSON document or JSON Lines (default: json)')
+    parser.add_argument('--output', help='Report file name (default: timestamped file)')
+    parser.add_argument('--standards', action='store_true',
+                        help='Add the standards (OWASP, CWE, ...) of each issue type from the taxonomy index')
+    parser.add_argument('--no-assist-cache', action='store_true',
+                        help='With --cache-dir, request AI remediation for every occurrence '
+                             'instead of once per pattern')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue an interrupted report from its checkpoint')
+    parser.add_argument('--checkpoint',
+                        help='Checkpoint file (default: <cache dir>/checkpoints/report_<app>_<project>.json)')
+    parser.add_argument('--no-metrics', action='store_true',
+                        help='Do not record or print per-endpoint request metrics')
+    parser.add_argument('--metrics-output',
+                        help='Write request metrics to this file: Prometheus text for .prom, JSON otherwise')
     parser.add_argument('--debug', action='store_true', help='Enable debug logging')
-    return parser.parse_args()
+    args = parser.parse_args()
+    if not args.all_projects and not (args.application_name and args.project_name):
+        parser.error('application_name and project_name are required without --all-projects')
+    if args.all_projects and args.resume:
+        parser.error('--resume is only supported for single project reports')
+    if args.partition_by and (args.resume or args.all_projects):
+        parser.error('--partition-by is not supported with --resume or --all-projects')
+    return args
 
 def main() -> None:
     """Main entry point"""
@@ -357,12 +833,32 @@ def main() -> None:
             api_token=args.api_token,
             app_name=args.application_name,
             project_name=args.project_name,
-            branch=args.branch
+            branch=args.branch,
+            concurrency=args.concurrency,
+            prefetch_pages=args.prefetch_pages,
+            partition_by=args.partition_by.split(',') if args.partition_by else None,
+            max_rate=args.max_rate,
+            timeout=args.timeout,
+            cache_dir=args.cache_dir,
+            output_format=args.output_format,
+            output_file=args.output,
+            all_projects=args.all_projects,
+            project_concurrency=args.project_concurrency,
+            include_details=args.details,
+            assist_cache=not args.no_assist_cache,
+            include_standards=args.standards,
+            metrics=not args.no_metrics,
+            metrics_output=args.metrics_output,
+            resume=args.resume,
+            checkpoint_file=args.checkpoint
         )
         
         # Create and run reporter
-        reporter = PolarisReporter(config)
-        reporter.generate_report()
+        reporter = PortfolioReporter(config) if config.all_projects else PolarisReporter(config)
+        try:
+            reporter.generate_report()
+        finally:
+            reporter.report_metrics()
         
     except Exception as e:
         logging.error(f"Error: {str(e)}")
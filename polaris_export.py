@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+# polaris_export.py - Export portfolio and issue data to polaris_output/ in one streaming pass
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional
+import json_codec
+from models import Occurrence
+from portfolio import PolarisPortfolioAPI, PaginationParams
+from report_writer import write_json_array
+
+PORTFOLIO_ITEM_FIELDS = [
+    'id', 'name', 'description', 'itemType', 'subscriptionTypeUsed', 'portfolioId',
+    'inTrash', 'createdAt', 'updatedAt', 'autoDeleteSetting',
+    'branchRetentionPeriodSetting', 'autoDeleteSettingsCustomized'
+]
+PORTFOLIO_ITEM_SUMMARY_FIELDS = [
+    'id', 'name', 'description', 'itemType', 'createdAt', 'updatedAt', 'inTrash'
+]
+SUBITEM_FIELDS = [
+    'id', 'name', 'description', 'subItemType', 'portfolioItemId', 'inTrash',
+    'createdAt', 'updatedAt', 'autoDeleteSetting', 'branchRetentionPeriodSetting',
+    'autoDeleteSettingsCustomized', 'defaultBranch', 'entryPointUrl',
+    'entryPointPrivate', 'profile'
+]
+SUBITEM_SUMMARY_FIELDS = [
+    'id', 'name', 'description', 'subItemType', 'createdAt', 'updatedAt',
+    'inTrash', 'portfolioItemId'
+]
+BRANCH_FIELDS = [
+    'id', 'name', 'description', 'source', 'isDefault', 'createdAt', 'updatedAt',
+    'autoDeleteSetting', 'branchRetentionPeriodSetting'
+]
+# Output field, issue attribute key and default value when the attribute is missing
+ISSUE_ATTRIBUTES = [
+    ('severity', 'severity', 'Unknown'),
+    ('description', 'description', None),
+    ('cwe', 'cwe', 'Unknown'),
+    ('location', 'location', 'Unknown'),
+    ('published_date', 'published-date', None),
+    ('component_name', 'component-name', 'Unknown'),
+    ('component_version', 'component-version-name', 'Unknown'),
+    ('overall_score', 'overall-score', None),
+    ('vulnerability_id', 'vulnerability-id', None),
+    ('vulnerability_source', 'vulnerability-source', 'Unknown'),
+]
+
+
+def select_fields(item: Dict, fields: List[str]) -> Dict:
+    """Keep the given fields of an item, missing ones as null"""
+    return {field: item.get(field) for field in fields}
+
+
+def format_issue(issue: Dict) -> Dict:
+    """Flatten an issue and its attribute list into the export format"""
+    attributes = Occurrence(issue.get('attributes'))
+    formatted = {
+        'id': issue.get('id'),
+        'type': (issue.get('type') or {}).get('_localized', {}).get('name') or 'Unknown'
+    }
+    for field, key, default in ISSUE_ATTRIBUTES:
+        formatted[field] = attributes.get(key) if attributes.has(key) else default
+    return formatted
+
+
+def write_json(path: str, data) -> None:
+    """Write a JSON file the way jq prints it"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+
+class IssueSpool:
+    """
+    Collects formatted issues on disk and aggregates statistics on the way
+
+    Issues are appended to a temporary JSON Lines file; only their byte
+    offsets, grouped by severity, and the distribution counters stay in memory.
+    That is enough to replay them in the shell script's
+    `sort_by(.severity) | reverse` order.
+    """
+
+    def __init__(self, directory: str):
+        self._file = tempfile.TemporaryFile(mode='w+b', dir=directory)
+        self._offsets: Dict[str, array] = {}
+        self.count = 0
+        self.severity_distribution = {'critical': 0, 'high': 0, 'medium': 0, 'low': 0}
+        self.cwe_distribution: Dict = {}
+        self.component_distribution: Dict = {}
+        self.vulnerability_source_distribution: Dict = {}
+
+    def add(self, issue: Dict) -> None:
+        """Spool one formatted issue"""
+        offset = self._file.tell()
+        self._file.write(json.dumps(issue, ensure_ascii=False).encode('utf-8'))
+        self._file.write(b'\n')
+        self._offsets.setdefault(issue['severity'], array('q')).append(offset)
+        self.count += 1
+
+        severity = str(issue['severity']).lower()
+        self.severity_distribution[severity] = self.severity_distribution.get(severity, 0) + 1
+        for counter, field in ((self.cwe_distribution, 'cwe'),
+                               (self.component_distribution, 'component_name'),
+                               (self.vulnerability_source_distribution, 'vulnerability_source')):
+            counter[issue[field]] = counter.get(issue[field], 0) + 1
+
+    def iter_sorted(self, limit: Optional[int] = None) -> Iterator[Dict]:
+        """Replay the spooled issues sorted by severity, descending"""
+        emitted = 0
+        for severity in sorted(self._offsets, reverse=True):
+            for offset in reversed(self._offsets[severity]):
+                if limit is not None and emitted >= limit:
+                    return
+                self._file.seek(offset)
+                yield json_codec.loads(self._file.readline())
+                emitted += 1
+
+    def statistics(self) -> Dict:
+        """Content of 5_issues_statistics.json"""
+        return {
+            'total_count': self.count,
+            'severity_distribution': self.severity_distribution,
+            'cwe_distribution': self.cwe_distribution,
+            'component_distribution': self.component_distribution,
+            'vulnerability_source_distribution': self.vulnerability_source_distribution
+        }
+
+    def summary(self) -> Dict:
+        """Content of 5_issues_summary.json"""
+        # group_by sorts by name; a stable sort by count then reverse follows
+        components = sorted(self.component_distribution.items(), key=lambda kv: str(kv[0]))
+        components = sorted(components, key=lambda kv: kv[1])[::-1][:5]
+        return {
+            'total_issues': self.count,
+            'severity_summary': {
+                severity: len(self._offsets.get(severity, ()))
+                for severity in ('critical', 'high', 'medium', 'low')
+            },
+            'top_components': [{'key': key, 'count': count} for key, count in components],
+            'issues': list(self.iter_sorted(limit=10))
+        }
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class PolarisExporter:
+    """Produces the polaris_output/ artifacts of polaris-api-shell.sh"""
+
+    def __init__(self, portfolio_api: PolarisPortfolioAPI, output_dir: str = 'polaris_output',
+                 app_filter: Optional[str] = None, project_filter: Optional[str] = None,
+                 branch_filter: Optional[str] = None, max_workers: int = 4):
+        self.portfolio_api = portfolio_api
+        self.output_dir = output_dir
+        self.app_filter = app_filter
+        self.project_filter = project_filter
+        self.branch_filter = branch_filter
+        self.max_workers = max_workers
+        self.logger = logging.getLogger(__name__)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.output_dir, name)
+
+    def _export_listing(self, items: Iterable[Dict], fields: List[str], all_file: str,
+                        name_filter: Optional[str]) -> List[Dict]:
+        """
+        Stream a full listing to its *_all.json file
+
+        Returns:
+            Items matching the name filter
+        """
+        matches = []
+
+        def project(items: Iterable[Dict]) -> Iterator[Dict]:
+            for item in items:
+                if name_filter is not None and item.get('name') == name_filter:
+                    matches.append(item)
+                yield select_fields(item, fields)
+
+        with open(self._path(all_file), 'w', encoding='utf-8') as f:
+            count = write_json_array(f, project(items))
+            f.write('\n')
+        self.logger.info(f"Saved {count} items to {all_file}")
+        return matches
+
+    def export_portfolio(self) -> str:
+        """Step 1: first portfolio"""
+        response = self.portfolio_api.get_portfolios()
+        write_json(self._path('1_portfolios.json'), {
+            'portfolio_id': response['_items'][0]['id'] if response.get('_items') else None,
+            'total_items': response.get('_collection', {}).get('itemCount'),
+            'links': response.get('_links')
+        })
+        return response['_items'][0]['id']
+
+    def export_applications(self, portfolio_id: str) -> Optional[str]:
+        """Step 2: all portfolio items (applications)"""
+        first_page = self.portfolio_api.get_portfolio_items(portfolio_id, PaginationParams(limit=100))
+        matches = self._export_listing(
+            self.portfolio_api.iter_all_portfolio_items(
+                portfolio_id, max_workers=self.max_workers, first_page=first_page
+            ),
+            PORTFOLIO_ITEM_FIELDS, '2_portfolio_items_all.json', self.app_filter
+        )
+        if self.app_filter is None:
+            matches = first_page.get('_items', [])
+            total = first_page.get('_collection', {}).get('itemCount')
+        else:
+            total = len(matches)
+        write_json(self._path('2_portfolio_items.json'), {
+            'total_items': total,
+            'applications': [select_fields(item, PORTFOLIO_ITEM_SUMMARY_FIELDS) for item in matches]
+        })
+        return matches[0]['id'] if matches else None
+
+    def export_projects(self, item_id: str) -> Optional[str]:
+        """Step 3: all subitems (projects) of the application"""
+        first_page = self.portfolio_api.get_portfolio_item_subitems(
+            item_id, {'_limit': 100, '_offset': 0}
+        )
+        matches = self._export_listing(
+            self.portfolio_api.iter_all_portfolio_item_subitems(
+                item_id, max_workers=self.max_workers, first_page=first_page
+            ),
+            SUBITEM_FIELDS, '3_portfolio_subitems_all.json', self.project_filter
+        )
+        if self.project_filter is None:
+            matches = first_page.get('_items', [])
+            total = first_page.get('_collection', {}).get('itemCount')
+        else:
+            total = len(matches)
+        write_json(self._path('3_portfolio_subitems.json'), {
+            'total_items': total,
+            'projects': [select_fields(item, SUBITEM_SUMMARY_FIELDS) for item in matches]
+        })
+        return matches[0]['id'] if matches else None
+
+    def export_branches(self, subitem_id: str) -> Optional[str]:
+        """Step 4: branches of the project"""
+        branches = [
+            branch for branch in self.portfolio_api.iter_all_subitem_branches(subitem_id)
+            if self.branch_filter is None or branch.get('name') == self.branch_filter
+        ]
+        write_json(self._path('4_branches.json'), {
+            'total_items': len(branches),
+            'branches': [select_fields(branch, BRANCH_FIELDS) for branch in branches]
+        })
+        return branches[0]['id'] if branches else None
+
+    def export_issues(self, subitem_id: str) -> int:
+        """Step 5: issues of the latest test with statistics and summary"""
+        # Keep the page exactly as the server sent it, like the shell script does
+        body = self.portfolio_api.get_test_issues(subitem_id, raw=True)
+        with open(self._path('debug_first_page.json'), 'wb') as f:
+            f.write(body.rstrip(b'\n'))
+            f.write(b'\n')
+        first_page = json_codec.loads(body)
+        collection = first_page.get('_collection', {})
+        self.logger.info(
+            f"Found {collection.get('itemCount')} issues in {collection.get('pageCount')} pages"
+        )
+
+        spool = IssueSpool(self.output_dir)
+        try:
+            for issue in self.portfolio_api.iter_all_test_issues(
+                subitem_id, max_workers=self.max_workers, first_page=first_page
+            ):
+                spool.add(format_issue(issue))
+
+            with open(self._path('5_issues_all.json'), 'w', encoding='utf-8') as f:
+                f.write('{\n  "total_count": %d,\n  "issues": ' % spool.count)
+                write_json_array(f, spool.iter_sorted(), level=1)
+                f.write('\n}\n')
+            write_json(self._path('5_issues_statistics.json'), spool.statistics())
+            write_json(self._path('5_issues_summary.json'), spool.summary())
+            return spool.count
+        finally:
+            spool.close()
+
+    def run(self) -> None:
+        """Run every export step"""
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        portfolio_id = self.export_portfolio()
+        self.logger.info(f"Portfolio ID: {portfolio_id}")
+
+        item_id = self.export_applications(portfolio_id)
+        if not item_id:
+            raise ValueError(f"Application '{self.app_filter}' not found")
+        self.logger.info(f"Portfolio Item ID: {item_id}")
+
+        subitem_id = self.export_projects(item_id)
+        if not subitem_id:
+            raise ValueError(f"Project '{self.project_filter}' not found")
+        self.logger.info(f"Portfolio Subitem ID: {subitem_id}")
+
+        branch_id = self.export_branches(subitem_id)
+        self.logger.info(f"Branch ID: {branch_id}")
+
+        count = self.export_issues(subitem_id)
+        self.logger.info(f"Saved {count} issues to {self.output_dir}")
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments, using the same flags as polaris-api-shell.sh"""
+    parser = argparse.ArgumentParser(description='Export Polaris data to polaris_output/')
+    parser.add_argument('-t', dest='api_token', required=True, help='API token')
+    parser.add_argument('-u', dest='base_url', default='https://poc.polaris.blackduck.com',
+                        help='Base URL')
+    parser.add_argument('-a', dest='app_filter', help='Application name filter')
+    parser.add_argument('-p', dest='project_filter', help='Project name filter')
+    parser.add_argument('-b', dest='branch_filter', help='Branch name filter')
+    parser.add_argument('-o', dest='output_dir', default='polaris_output', help='Output directory')
+    parser.add_argument('--workers', type=int, default=4,
+                        help='Pages fetched in parallel per listing (default: 4)')
+    return parser.parse_args()
+
+
+def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    args = parse_args()
+
+    try:
+        exporter = PolarisExporter(
+            PolarisPortfolioAPI(args.base_url, args.api_token),
+            output_dir=args.output_dir,
+            app_filter=args.app_filter,
+            project_filter=args.project_filter,
+            branch_filter=args.branch_filter,
+            max_workers=args.workers
+        )
+        exporter.run()
+    except Exception as e:
+        logging.error(f"Error occurred: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
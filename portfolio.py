@@ -1,8 +1,13 @@
 import requests
-from typing import Dict, List, Optional, Union, Any
+from typing import Dict, List, Optional, Union, Any, BinaryIO, Callable, Iterator
 import logging
 import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from dataclasses import dataclass
+from response_cache import ResponseCache
+from transport import PolarisTransport, get_shared_transport
 
 @dataclass
 class PaginationParams:
@@ -16,23 +21,30 @@ class PolarisPortfolioAPI:
     A class to handle all Polaris Portfolio API endpoints
     """
     
-    def __init__(self, base_url: str, api_token: str):
+    def __init__(self, base_url: str, api_token: str, cache: Optional[ResponseCache] = None,
+                 transport: Optional[PolarisTransport] = None):
         """
         Initialize the API handler
         
         Args:
             base_url: Base URL for the Polaris instance
             api_token: API token for authentication
+            cache: Optional on-disk cache for GET responses
+            transport: Pooled HTTP transport, the shared default if omitted
         """
         self.base_url = base_url.rstrip('/')
         self.api_token = api_token
         self.headers = {
             'Api-Token': api_token
         }
+        self.cache = cache
+        self.transport = transport or get_shared_transport()
         self.logger = logging.getLogger(__name__)
 
     def _make_request(self, method: str, endpoint: str, accept_type: str, 
-                     params: Optional[Dict] = None, data: Optional[Dict] = None) -> Dict:
+                     params: Optional[Dict] = None, data: Optional[Dict] = None,
+                     raw: bool = False, output_file: Optional[Union[str, BinaryIO]] = None,
+                     hasher: Optional[Any] = None) -> Any:
         """
         Make HTTP request to Polaris API
         
@@ -42,25 +54,40 @@ class PolarisPortfolioAPI:
             accept_type: Accept header type
             params: Query parameters
             data: Request body data
+            raw: Return the undecoded response bytes
+            output_file: Stream the response body to this file path or binary
+                         buffer instead of decoding it
+            hasher: hashlib object updated with the streamed body
             
         Returns:
-            API response as dictionary
+            API response as dictionary, the response bytes if `raw` is set, or
+            the number of bytes written if `output_file` is given
         """
         headers = self.headers.copy()
         headers['Accept'] = accept_type
         
-        url = f"{self.base_url}{endpoint}"
-        
         try:
-            response = requests.request(
-                method=method,
-                url=url,
-                headers=headers,
+            if output_file:
+                return self.transport.download(
+                    method,
+                    self.base_url,
+                    endpoint,
+                    headers,
+                    output_file,
+                    params=params,
+                    data=data,
+                    hasher=hasher
+                )
+            request = self.transport.request_raw if raw else self.transport.request_json
+            return request(
+                method,
+                self.base_url,
+                endpoint,
+                headers,
                 params=params,
-                json=data
+                data=data,
+                cache=self.cache
             )
-            response.raise_for_status()
-            return response.json()
         except requests.exceptions.RequestException as e:
             self.logger.error(f"API request failed: {str(e)}")
             raise
@@ -210,6 +237,77 @@ class PolarisPortfolioAPI:
             params=params
         )
 
+    # Fetch-all iterators
+    def _iter_offset_pages(self, fetch_page: Callable[[int], Dict], limit: int,
+                           max_workers: int = 8,
+                           first_page: Optional[Dict] = None) -> Iterator[Dict]:
+        """
+        Read the first page, then fetch the remaining offsets concurrently
+        
+        The first response reports `_collection.pageCount`, so every other
+        offset is known up front. Items are yielded in offset order. At most
+        twice `max_workers` pages are fetched or buffered ahead of the
+        consumer, so a slow consumer does not hold a whole listing in memory.
+        
+        Args:
+            fetch_page: Function returning the page at a given offset
+            limit: Page size
+            max_workers: Maximum number of pages fetched at the same time
+            first_page: Already fetched page at offset 0, if any
+        """
+        if first_page is None:
+            first_page = fetch_page(0)
+        yield from first_page.get('_items', [])
+        
+        page_count = first_page.get('_collection', {}).get('pageCount', 1) or 1
+        if page_count <= 1:
+            return
+            
+        workers = max(1, min(max_workers, page_count - 1))
+        offsets = (page * limit for page in range(1, page_count))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            window = deque(executor.submit(fetch_page, offset)
+                           for offset in islice(offsets, 2 * workers))
+            while window:
+                page = window.popleft().result()
+                next_offset = next(offsets, None)
+                if next_offset is not None:
+                    window.append(executor.submit(fetch_page, next_offset))
+                yield from page.get('_items', [])
+
+    def iter_all_portfolio_items(self, portfolio_id: str, limit: int = 100,
+                                 filter: Optional[str] = None, sort: Optional[str] = None,
+                                 max_workers: int = 8,
+                                 first_page: Optional[Dict] = None) -> Iterator[Dict]:
+        """Iterate over all portfolio items (applications) across every page"""
+        def fetch_page(offset: int) -> Dict:
+            return self.get_portfolio_items(
+                portfolio_id,
+                PaginationParams(limit=limit, offset=offset, filter=filter, sort=sort)
+            )
+        return self._iter_offset_pages(fetch_page, limit, max_workers, first_page)
+
+    def iter_all_portfolio_item_subitems(self, item_id: str, limit: int = 100,
+                                         params: Optional[Dict] = None,
+                                         max_workers: int = 8,
+                                         first_page: Optional[Dict] = None) -> Iterator[Dict]:
+        """Iterate over all subitems (projects) of a portfolio item across every page"""
+        def fetch_page(offset: int) -> Dict:
+            page_params = dict(params or {})
+            page_params.update({'_limit': limit, '_offset': offset})
+            return self.get_portfolio_item_subitems(item_id, page_params)
+        return self._iter_offset_pages(fetch_page, limit, max_workers, first_page)
+
+    def iter_all_subitem_branches(self, subitem_id: str, limit: int = 100,
+                                  params: Optional[Dict] = None,
+                                  max_workers: int = 8) -> Iterator[Dict]:
+        """Iterate over all branches of a portfolio subitem across every page"""
+        def fetch_page(offset: int) -> Dict:
+            page_params = dict(params or {})
+            page_params.update({'_limit': limit, '_offset': offset})
+            return self.get_subitem_branches(subitem_id, page_params)
+        return self._iter_offset_pages(fetch_page, limit, max_workers)
+
     # Tags endpoints
     def get_tags(self, params: Optional[Dict] = None) -> Dict:
         """Get all tags"""
@@ -264,6 +362,37 @@ class PolarisPortfolioAPI:
             params=default_params
         )
 
+    def get_test_issues(self, subitem_id: str, test_id: str = 'latest',
+                        offset: int = 0, limit: int = 100,
+                        include_attributes: bool = True, raw: bool = False) -> Dict:
+        """
+        Get the issues of a test (the latest one by default) for a portfolio subitem
+
+        With `raw` set the page is returned as the undecoded response bytes.
+        """
+        params = {
+            'portfolioSubItemId': subitem_id,
+            'testId': test_id,
+            '_offset': offset,
+            '_limit': limit,
+            '_includeAttributes': include_attributes
+        }
+        return self._make_request(
+            'GET',
+            '/api/specialization-layer-service/issues/_actions/list',
+            'application/vnd.polaris-one.issue-management.issue-paginated-list-1+json',
+            params=params,
+            raw=raw
+        )
+
+    def iter_all_test_issues(self, subitem_id: str, test_id: str = 'latest',
+                             limit: int = 100, max_workers: int = 4,
+                             first_page: Optional[Dict] = None) -> Iterator[Dict]:
+        """Iterate over all issues of a test across every page"""
+        def fetch_page(offset: int) -> Dict:
+            return self.get_test_issues(subitem_id, test_id, offset=offset, limit=limit)
+        return self._iter_offset_pages(fetch_page, limit, max_workers, first_page)
+
 # Usage example
 def main():
     # Configure logging
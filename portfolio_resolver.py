@@ -0,0 +1,227 @@
+# portfolio_resolver.py - Cached name to ID resolver for the Polaris portfolio hierarchy
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, Optional, Tuple
+from portfolio import PolarisPortfolioAPI, PaginationParams
+from rsql import rsql_value
+
+
+class PortfolioResolver:
+    """
+    Resolves application, project and branch names to IDs from a local index
+
+    The index covers every portfolio, application (portfolio item), project
+    (portfolio subitem) and optionally branch. It is persisted as JSON and
+    rebuilt when older than `ttl`. Names missing from the index are looked up
+    with a server side name filter and added to it.
+    """
+
+    def __init__(self, portfolio_api: PolarisPortfolioAPI,
+                 path: str = '.polaris_cache/portfolio_index.json',
+                 ttl: float = 3600, include_branches: bool = True,
+                 max_workers: int = 8):
+        """
+        Initialize the resolver
+
+        Args:
+            portfolio_api: Portfolio API client
+            path: JSON file the index is persisted to
+            ttl: Maximum age of the persisted index in seconds
+            include_branches: Also index the branches of every project
+            max_workers: Number of applications/projects walked in parallel
+        """
+        self.portfolio_api = portfolio_api
+        self.path = path
+        self.ttl = ttl
+        self.include_branches = include_branches
+        self.max_workers = max_workers
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._index = None
+
+    # Index persistence
+    def _load(self) -> Optional[Dict]:
+        """Load the persisted index if it is recent enough"""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if index.get('base_url') != self.portfolio_api.base_url:
+            return None
+        if time.time() - index.get('built_at', 0) > self.ttl:
+            return None
+        return index
+
+    def _save(self) -> None:
+        """Write the index atomically"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+    @property
+    def index(self) -> Dict:
+        """The current index, loaded from disk or built on first use"""
+        with self._lock:
+            if self._index is None:
+                self._index = self._load()
+        if self._index is None:
+            self.refresh()
+        return self._index
+
+    # Index building
+    def _index_project(self, subitem: Dict) -> Dict:
+        project = {'id': subitem['id'], 'branches': {}}
+        if self.include_branches:
+            for branch in self.portfolio_api.iter_all_subitem_branches(subitem['id']):
+                project['branches'][branch['name']] = branch['id']
+        return project
+
+    def _index_application(self, item: Dict, portfolio_id: str,
+                           executor: ThreadPoolExecutor) -> Dict:
+        subitems = list(self.portfolio_api.iter_all_portfolio_item_subitems(item['id']))
+        projects = executor.map(self._index_project, subitems) if self.include_branches \
+            else ({'id': subitem['id'], 'branches': {}} for subitem in subitems)
+        return {
+            'id': item['id'],
+            'portfolio_id': portfolio_id,
+            'projects': {
+                subitem['name']: project for subitem, project in zip(subitems, projects)
+            }
+        }
+
+    def refresh(self) -> Dict:
+        """Rebuild the full index from the server and persist it"""
+        started = time.time()
+        index = {
+            'base_url': self.portfolio_api.base_url,
+            'built_at': started,
+            'portfolios': {},
+            'applications': {}
+        }
+
+        portfolios = self.portfolio_api.get_portfolios().get('_items', [])
+        # Applications and branches use separate pools so project walks
+        # submitted from application workers cannot starve them
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as app_executor, \
+                ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as branch_executor:
+            for portfolio in portfolios:
+                index['portfolios'][portfolio['id']] = portfolio.get('name')
+                items = list(self.portfolio_api.iter_all_portfolio_items(portfolio['id']))
+                applications = app_executor.map(
+                    lambda item: self._index_application(item, portfolio['id'], branch_executor),
+                    items
+                )
+                for item, application in zip(items, applications):
+                    index['applications'][item['name']] = application
+
+        with self._lock:
+            self._index = index
+            self._save()
+        self.logger.info(
+            f"Indexed {len(index['applications'])} applications in {time.time() - started:.1f}s"
+        )
+        return index
+
+    # Server side fallback for cache misses
+    def _lookup_application(self, app_name: str) -> Optional[Dict]:
+        for portfolio_id in self.index['portfolios']:
+            response = self.portfolio_api.get_portfolio_items(
+                portfolio_id,
+                PaginationParams(limit=10, filter=f"name=={rsql_value(app_name)}")
+            )
+            for item in response.get('_items', []):
+                if item.get('name') == app_name:
+                    return {'id': item['id'], 'portfolio_id': portfolio_id, 'projects': {}}
+        return None
+
+    def _lookup_project(self, application: Dict, project_name: str) -> Optional[Dict]:
+        response = self.portfolio_api.get_portfolio_item_subitems(
+            application['id'],
+            {'_filter': f"name=={rsql_value(project_name)}", '_limit': 10}
+        )
+        for subitem in response.get('_items', []):
+            if subitem.get('name') == project_name:
+                return {'id': subitem['id'], 'branches': {}}
+        return None
+
+    def _lookup_branch(self, project: Dict, branch_name: str) -> Optional[str]:
+        response = self.portfolio_api.get_subitem_branches(
+            project['id'],
+            {'_filter': f"name=={rsql_value(branch_name)}", '_limit': 10}
+        )
+        for branch in response.get('_items', []):
+            if branch.get('name') == branch_name:
+                return branch['id']
+        return None
+
+    # Lookups
+    def resolve(self, app_name: str, project_name: Optional[str] = None,
+                branch_name: Optional[str] = None) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """
+        Resolve names to (application_id, project_id, branch_id)
+
+        IDs that cannot be resolved are returned as None.
+        """
+        applications = self.index['applications']
+        updated = False
+
+        application = applications.get(app_name)
+        if application is None:
+            application = self._lookup_application(app_name)
+            if application is None:
+                return None, None, None
+            applications[app_name] = application
+            updated = True
+
+        project = None
+        branch_id = None
+        if project_name:
+            project = application['projects'].get(project_name)
+            if project is None:
+                project = self._lookup_project(application, project_name)
+                if project is not None:
+                    application['projects'][project_name] = project
+                    updated = True
+
+        if project is not None and branch_name:
+            branch_id = project['branches'].get(branch_name)
+            if branch_id is None:
+                branch_id = self._lookup_branch(project, branch_name)
+                if branch_id is not None:
+                    project['branches'][branch_name] = branch_id
+                    updated = True
+
+        if updated:
+            with self._lock:
+                self._save()
+
+        return application['id'], project['id'] if project else None, branch_id
+
+    def resolve_project(self, app_name: str, project_name: str) -> Tuple[Optional[str], Optional[str]]:
+        """Resolve an application and project name to their IDs"""
+        app_id, project_id, _ = self.resolve(app_name, project_name)
+        return app_id, project_id
+
+    def iter_projects(self, app_name: Optional[str] = None) -> Iterator[Tuple[str, str, str, Dict]]:
+        """
+        Iterate over every indexed project, optionally of one application only
+
+        Yields:
+            Tuples of (application name, application ID, project name, project entry);
+            the project entry holds the project 'id' and its 'branches' by name
+        """
+        for name, application in list(self.index['applications'].items()):
+            if app_name is not None and name != app_name:
+                continue
+            for project_name, project in list(application['projects'].items()):
+                yield name, application['id'], project_name, project
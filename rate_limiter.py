@@ -0,0 +1,273 @@
+# rate_limiter.py - Adaptive token bucket shared by the Polaris API clients
+
+import logging
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+# Methods that can be sent again without changing the result
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+# Responses that mean the tenant's quota or the server's capacity is exceeded
+THROTTLE_STATUSES = frozenset({429, 503})
+# Responses worth retrying for an idempotent request
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header, given as seconds or an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+    """Exponential backoff with full jitter: uniform in [0, min(cap, base * 2^attempt)]"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket whose rate follows the server's throttling (AIMD)
+
+    Without a configured rate, requests are not limited until the server
+    first answers 429 or 503; the rate then starts at the throughput of
+    successful requests over the last `window` seconds, which is what the
+    server was willing to serve. Every later throttled response multiplies
+    the rate by `decrease` (at most once per second, so a burst of 429s from
+    requests that were already in flight counts once), every successful response adds
+    `increase / rate`, i.e. about `increase` requests/sec per second at full
+    speed. A Retry-After header pauses all requests until it has passed.
+    The limiter is thread safe; one instance is meant to be shared by every
+    client talking to the same tenant.
+    """
+
+    def __init__(self, rate: Optional[float] = None, max_rate: Optional[float] = None,
+                 min_rate: float = 0.5, increase: float = 1.0, decrease: float = 0.8,
+                 burst: Optional[float] = None, window: float = 5.0):
+        """
+        Initialize the limiter
+
+        Args:
+            rate: Initial requests per second, unlimited until throttled if None
+            max_rate: Never exceed this many requests per second
+            min_rate: Never go below this many requests per second
+            increase: Requests/sec added per second of successful requests
+            decrease: Factor the rate is multiplied by when throttled
+            burst: Bucket size, one second worth of requests if None
+            window: Seconds of response history used to measure throughput
+        """
+        if rate is None and max_rate is not None:
+            rate = max_rate
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.burst = burst
+        self.window = window
+        self.throttled = 0
+        self._rate = rate
+        self._tokens = self._capacity() if rate else 0.0
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._sent: deque = deque()
+        self._succeeded: deque = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> Optional[float]:
+        """Current requests per second, None while unlimited"""
+        return self._rate
+
+    def _capacity(self) -> float:
+        return self.burst or max(1.0, self._rate or 1.0)
+
+    def reserve(self) -> float:
+        """
+        Take a token for one request
+
+        Returns:
+            Seconds the caller must wait before sending it
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._rate is None:
+                self._sent.append(now)
+                self._expire(self._sent, now)
+
+            wait = max(0.0, self._paused_until - now)
+            if self._rate:
+                self._tokens = min(self._capacity(),
+                                   self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                # Going negative reserves a future token for this caller
+                self._tokens -= 1
+                if self._tokens < 0:
+                    wait = max(wait, -self._tokens / self._rate)
+            return wait
+
+    def _expire(self, history: deque, now: float) -> None:
+        while history and history[0] < now - self.window:
+            history.popleft()
+
+    def _throughput(self, history: deque, now: float) -> float:
+        """Events per second in `history`, over at least one second"""
+        self._expire(history, now)
+        if not history:
+            return 0.0
+        return len(history) / max(1.0, now - history[0])
+
+    def acquire(self) -> float:
+        """Block until a request may be sent; returns the seconds waited"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def on_success(self) -> None:
+        """Additive increase after a request that was not throttled"""
+        with self._lock:
+            if self._rate is None:
+                now = time.monotonic()
+                self._succeeded.append(now)
+                self._expire(self._succeeded, now)
+                return
+            rate = self._rate + self.increase / self._rate
+            self._rate = min(rate, self.max_rate) if self.max_rate else rate
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """Multiplicative decrease after a 429/503, pausing for `retry_after` seconds if given"""
+        with self._lock:
+            now = time.monotonic()
+            self.throttled += 1
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+                self._tokens = min(self._tokens, 0.0)
+            if now - self._last_decrease < 1.0:
+                return
+            self._last_decrease = now
+            if self._rate is None:
+                observed = self._throughput(self._succeeded, now)
+                if not observed:
+                    # Throttled before anything succeeded: back off from the send rate
+                    observed = self._throughput(self._sent, now) * self.decrease
+                self._rate = max(self.min_rate, observed)
+                if self.max_rate:
+                    self._rate = min(self._rate, self.max_rate)
+                self._sent.clear()
+                self._succeeded.clear()
+                self._tokens = 0.0
+                self._updated = now
+            else:
+                self._rate = max(self.min_rate, self._rate * self.decrease)
+                self._tokens = min(self._tokens, self._capacity())
+
+    def stats(self) -> Dict:
+        """Current rate and number of throttled responses"""
+        with self._lock:
+            return {'rate': self._rate, 'throttled': self.throttled}
+
+
+class RetryPolicy:
+    """
+    Retry decisions shared by the synchronous transport and the async clients
+
+    Every response status is passed to the rate limiter. Idempotent requests
+    that failed with a transport error or a 429/5xx are retried up to
+    `max_retries` times, after the server's Retry-After (enforced by the
+    limiter) or a jittered exponential backoff. The clients only send,
+    sleep and record metrics.
+    """
+
+    def __init__(self, rate_limiter: AdaptiveRateLimiter, max_retries: int = 3,
+                 backoff_base: float = 0.5, backoff_max: float = 30):
+        """
+        Initialize the policy
+
+        Args:
+            rate_limiter: Limiter told about every response
+            max_retries: Retries of an idempotent request after the first attempt
+            backoff_base: Seconds of the first backoff, doubled on every retry
+            backoff_max: Upper bound of a backoff in seconds
+        """
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.logger = logging.getLogger(__name__)
+
+    def can_retry(self, method: str, attempt: int) -> bool:
+        """Whether attempt number `attempt` (from 0) of a request may be followed by another"""
+        return method.upper() in IDEMPOTENT_METHODS and attempt < self.max_retries
+
+    def on_response(self, method: str, endpoint: str, status: int,
+                    retry_after: Optional[str], attempt: int) -> Optional[float]:
+        """
+        Feed a response to the rate limiter and decide whether to send the request again
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint, for logging
+            status: Response status code
+            retry_after: Retry-After header of the response
+            attempt: Attempt number of the request, from 0
+
+        Returns:
+            Seconds to sleep before the retry, None if the response is final
+        """
+        seconds = None
+        if status in THROTTLE_STATUSES:
+            seconds = parse_retry_after(retry_after)
+            self.rate_limiter.on_throttle(seconds)
+        else:
+            self.rate_limiter.on_success()
+        if status not in RETRY_STATUSES or not self.can_retry(method, attempt):
+            return None
+        # The limiter already holds every request back until Retry-After has passed
+        delay = 0.0 if seconds else backoff_delay(attempt, self.backoff_base, self.backoff_max)
+        log = self.logger.debug if status in THROTTLE_STATUSES else self.logger.warning
+        log(f"{method} {endpoint} returned {status}, "
+            f"retry {attempt + 1}/{self.max_retries} in {seconds or delay:.1f}s")
+        return delay
+
+    def on_error(self, method: str, endpoint: str, error: BaseException,
+                 attempt: int) -> Optional[float]:
+        """
+        Decide whether to send a request again after a transport error
+
+        Returns:
+            Seconds to sleep before the retry, None if the error is final
+        """
+        if not self.can_retry(method, attempt):
+            return None
+        delay = backoff_delay(attempt, self.backoff_base, self.backoff_max)
+        self.logger.warning(f"{method} {endpoint} failed: {str(error) or type(error).__name__}, "
+                            f"retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+        return delay
+
+
+_shared_limiter = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_rate_limiter() -> AdaptiveRateLimiter:
+    """Return the process wide limiter used by transports created without one"""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = AdaptiveRateLimiter()
+        return _shared_limiter
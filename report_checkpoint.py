@@ -0,0 +1,120 @@
+# report_checkpoint.py - Persisted progress of a report run for --resume
+
+import json
+import logging
+import os
+import re
+import time
+from typing import Dict, List, Optional
+
+_UNSAFE = re.compile(r'[^\w.-]')
+
+
+def default_checkpoint_path(directory: str, app_name: str, project_name: str,
+                            branch: Optional[str] = None) -> str:
+    """Checkpoint file of a report run, one per application, project and branch"""
+    name = '_'.join(_UNSAFE.sub('_', part) for part in (app_name, project_name, branch) if part)
+    return os.path.join(directory, 'checkpoints', f"report_{name}.json")
+
+
+class ReportCheckpoint:
+    """
+    Progress of a report run, saved after every finding written to the output
+
+    Findings are written in page order, so the state needed to continue is
+    the cursor of the page the last written finding came from, the IDs of
+    that page already written, and the output file position after the last
+    finding. Pages before the cursor are complete; a resumed run requests the
+    page at the cursor, skips the IDs already written, truncates the output
+    to the saved position and appends from there.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the checkpoint
+
+        Args:
+            path: JSON file the state is saved to
+        """
+        self.path = path
+        self.state: Dict = {}
+        self.logger = logging.getLogger(__name__)
+
+    def load(self) -> bool:
+        """Load a saved checkpoint, False if there is none"""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self.state = json.load(f)
+        except (OSError, ValueError):
+            self.state = {}
+            return False
+        return True
+
+    def matches(self, run: Dict) -> bool:
+        """Whether the loaded checkpoint belongs to a run with these parameters"""
+        return bool(self.state) and self.state.get('run') == run \
+            and os.path.exists(self.state.get('output_file') or '')
+
+    def start(self, run: Dict, output_file: str, header: Dict, offset: int) -> None:
+        """Begin a new run, with the output positioned right after its header"""
+        self.state = {
+            'run': run,
+            'output_file': output_file,
+            'header': header,
+            'cursor': None,
+            'page_ids': [],
+            'written': 0,
+            'offset': offset,
+            'started_at': time.time()
+        }
+        self.save()
+
+    # Progress
+    @property
+    def cursor(self) -> Optional[str]:
+        """Cursor of the page to continue at, None for the first page"""
+        return self.state.get('cursor')
+
+    @property
+    def page_ids(self) -> List[str]:
+        """IDs of the findings on the cursor page already written"""
+        return self.state.get('page_ids', [])
+
+    @property
+    def written(self) -> int:
+        return self.state.get('written', 0)
+
+    @property
+    def offset(self) -> int:
+        return self.state.get('offset', 0)
+
+    def record(self, cursor: Optional[str], finding_id: str, offset: int) -> None:
+        """Record a finding written to the output, ending at `offset`"""
+        if cursor != self.state['cursor']:
+            # The first finding of a new page: every earlier page is complete
+            self.state['cursor'] = cursor
+            self.state['page_ids'] = []
+        self.state['page_ids'].append(finding_id)
+        self.state['written'] += 1
+        self.state['offset'] = offset
+        self.save()
+
+    # Persistence
+    def save(self) -> None:
+        """Write the state atomically"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.state['updated_at'] = time.time()
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+    def remove(self) -> None:
+        """Delete the checkpoint once the run has completed"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        self.state = {}
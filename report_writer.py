@@ -0,0 +1,184 @@
+# report_writer.py - Streaming writers for Polaris report output
+
+import json
+import os
+from typing import Dict, IO, Iterable, Iterator, Optional
+import json_codec
+
+
+class JsonLinesReportWriter:
+    """
+    Writes a report as JSON Lines
+
+    The first line holds the report header, every following line one finding.
+    Each line is flushed as soon as it is written, so a run that is
+    interrupted keeps every finding produced so far.
+    """
+
+    def __init__(self, filename: str, header: Dict, append: bool = False,
+                 offset: Optional[int] = None, count: int = 0):
+        """
+        Open the output file and write the header
+
+        Args:
+            filename: Output file path
+            header: Report metadata written as the first line
+            append: Continue an existing file instead of starting a new one
+            offset: Continue an existing file from this position (a previous
+                    `offset`), dropping anything written after it
+            count: Findings already in the file when continuing it
+        """
+        self.filename = filename
+        self.count = count
+        if offset is not None:
+            self._file = _reopen_at(filename, offset)
+            return
+        resume = append and os.path.exists(filename)
+        self._file = open(filename, 'a' if resume else 'w', encoding='utf-8')
+        if not resume:
+            self._write_line({'report': header})
+
+    @property
+    def offset(self) -> int:
+        """Position after the last complete line, to continue the file from"""
+        return self._file.tell()
+
+    def _write_line(self, data: Dict) -> None:
+        self._file.write(json.dumps(data, ensure_ascii=False))
+        self._file.write('\n')
+        self._file.flush()
+
+    def write_finding(self, finding: Dict) -> None:
+        """Append one finding to the output"""
+        self._write_line(finding)
+        self.count += 1
+
+    def close(self, footer: Optional[Dict] = None) -> None:
+        """Close the output file"""
+        if footer:
+            self._write_line({'summary': footer})
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if not self._file.closed:
+            self.close()
+
+
+class JsonArrayReportWriter:
+    """
+    Writes a report as one JSON document with an incrementally written findings array
+
+    The output has the same layout as the in-memory report. Findings are
+    flushed one by one; if the run is interrupted the file is only missing
+    its closing brackets.
+    """
+
+    def __init__(self, filename: str, header: Dict, indent: int = 2,
+                 offset: Optional[int] = None, count: int = 0):
+        """
+        Open the output file and write the header
+
+        Args:
+            filename: Output file path
+            header: Report metadata written before the findings array
+            indent: Indentation of the written JSON
+            offset: Continue an existing file from this position (a previous
+                    `offset`), dropping the closing brackets or a partly
+                    written finding after it
+            count: Findings already in the file when continuing it
+        """
+        self.filename = filename
+        self.indent = indent
+        self.count = count
+        if offset is not None:
+            self._file = _reopen_at(filename, offset)
+            return
+        self._file = open(filename, 'w', encoding='utf-8')
+
+        # Write the header object without its closing brace and open the array
+        head = json.dumps(header, indent=indent, ensure_ascii=False)
+        self._file.write(head[:-1].rstrip())
+        self._file.write(',\n' if header else '\n')
+        self._file.write(' ' * indent + '"findings": [')
+        self._file.flush()
+
+    def write_finding(self, finding: Dict) -> None:
+        """Append one finding to the findings array"""
+        prefix = ' ' * (self.indent * 2)
+        text = json.dumps(finding, indent=self.indent, ensure_ascii=False).replace('\n', '\n' + prefix)
+        self._file.write(',\n' if self.count else '\n')
+        self._file.write(prefix + text)
+        self._file.flush()
+        self.count += 1
+
+    @property
+    def offset(self) -> int:
+        """Position after the last complete finding, to continue the file from"""
+        return self._file.tell()
+
+    def close(self, footer: Optional[Dict] = None) -> None:
+        """Close the findings array and the document"""
+        self._file.write('\n' + ' ' * self.indent + ']' if self.count else ']')
+        for key, value in (footer or {}).items():
+            text = json.dumps(value, indent=self.indent, ensure_ascii=False)
+            text = text.replace('\n', '\n' + ' ' * self.indent)
+            self._file.write(f',\n{" " * self.indent}{json.dumps(key)}: {text}')
+        self._file.write('\n}\n')
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if not self._file.closed:
+            self.close()
+
+
+def _reopen_at(filename: str, offset: int) -> IO[str]:
+    """Open an existing output file for writing, truncated to `offset`"""
+    f = open(filename, 'r+', encoding='utf-8')
+    f.seek(offset)
+    f.truncate()
+    return f
+
+
+def write_json_array(f: IO[str], items: Iterable, indent: int = 2, level: int = 0) -> int:
+    """
+    Stream an iterable to an open file as a JSON array, one element at a time
+
+    The layout matches `json.dumps(list(items), indent=indent)` nested at
+    `level`, without building the list in memory.
+
+    Returns:
+        Number of elements written
+    """
+    pad = ' ' * (indent * (level + 1))
+    count = 0
+    for item in items:
+        text = json.dumps(item, indent=indent, ensure_ascii=False).replace('\n', '\n' + pad)
+        f.write(('[\n' if count == 0 else ',\n') + pad + text)
+        count += 1
+    f.write('\n' + ' ' * (indent * level) + ']' if count else '[]')
+    return count
+
+
+def read_json_lines_report(filename: str) -> Iterator[Dict]:
+    """
+    Iterate over the findings of a JSON Lines report
+
+    A truncated last line from an interrupted run is skipped.
+    """
+    with open(filename, encoding='utf-8') as f:
+        for line in f:
+            try:
+                data = json_codec.loads(line)
+            except ValueError:
+                break
+            if 'report' in data and len(data) == 1:
+                continue
+            if 'summary' in data and len(data) == 1:
+                continue
+            yield data
@@ -0,0 +1,235 @@
+# request_metrics.py - Per-endpoint request instrumentation for the Polaris API clients
+
+import bisect
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Tuple, Union
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Path segments that are IDs: UUIDs, numbers and anything else with a digit
+# (issue, occurrence, artifact, taxon IDs); collection names never contain one
+_ID_SEGMENT = re.compile(r'^(?:[0-9a-fA-F-]{32,36}|[^/]*\d[^/]*)$')
+
+
+def endpoint_template(endpoint: str) -> str:
+    """
+    Reduce an endpoint path to its template
+
+    '/api/findings/occurrences/1ef7.../assist' -> '/api/findings/occurrences/{id}/assist'
+    """
+    endpoint = endpoint.split('?', 1)[0]
+    return '/'.join(
+        '{id}' if segment and not segment.startswith('_') and _ID_SEGMENT.match(segment)
+        else segment
+        for segment in endpoint.split('/')
+    )
+
+
+class EndpointStats:
+    """Counters of one (method, endpoint template)"""
+
+    __slots__ = ('count', 'total_time', 'max_time', 'buckets', 'bytes', 'statuses',
+                 'retries', 'decode_count', 'decode_time')
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        # One count per bucket plus the overflow bucket, not cumulative
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.bytes = 0
+        self.statuses: Dict[str, int] = {}
+        self.retries = 0
+        self.decode_count = 0
+        self.decode_time = 0.0
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Upper bucket bound below which `fraction` of the requests completed"""
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.buckets):
+            seen += count
+            if seen >= target:
+                return bound
+        return self.max_time
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'total_seconds': round(self.total_time, 6),
+            'mean_seconds': round(self.total_time / self.count, 6) if self.count else None,
+            'max_seconds': round(self.max_time, 6),
+            'p50_seconds': self.percentile(0.5),
+            'p95_seconds': self.percentile(0.95),
+            'histogram': {
+                **{f"le_{bound:g}": count for bound, count in zip(LATENCY_BUCKETS, self.buckets)},
+                'le_inf': self.buckets[-1]
+            },
+            'bytes': self.bytes,
+            'statuses': dict(self.statuses),
+            'retries': self.retries,
+            'decode_count': self.decode_count,
+            'decode_seconds': round(self.decode_time, 6)
+        }
+
+
+class RequestMetrics:
+    """
+    Thread-safe per-endpoint request metrics
+
+    Records, per method and endpoint template, the request count, a latency
+    histogram, response bytes, status codes, retries and JSON decode time.
+    Pass an instance to PolarisTransport (or the async clients) to enable
+    it; without one the clients skip all bookkeeping.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[Tuple[str, str], EndpointStats] = {}
+
+    def _stats(self, method: str, endpoint: str) -> EndpointStats:
+        key = (method.upper(), endpoint_template(endpoint))
+        stats = self._endpoints.get(key)
+        if stats is None:
+            stats = self._endpoints.setdefault(key, EndpointStats())
+        return stats
+
+    def record(self, method: str, endpoint: str, status: Union[int, str],
+               elapsed: float, size: int = 0) -> None:
+        """
+        Record one completed request
+
+        Args:
+            method: HTTP method
+            endpoint: Endpoint path, IDs are folded into the template
+            status: HTTP status code, 'cache' for responses served from the
+                    response cache or 'error' for requests that got no response
+            elapsed: Seconds from sending to the last body byte
+            size: Response body bytes
+        """
+        with self._lock:
+            stats = self._stats(method, endpoint)
+            stats.count += 1
+            stats.total_time += elapsed
+            if elapsed > stats.max_time:
+                stats.max_time = elapsed
+            stats.buckets[bisect.bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+            stats.bytes += size
+            status = str(status)
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+
+    def record_retry(self, method: str, endpoint: str) -> None:
+        """Record that a request is about to be retried"""
+        with self._lock:
+            self._stats(method, endpoint).retries += 1
+
+    def record_decode(self, method: str, endpoint: str, elapsed: float) -> None:
+        """Record time spent decoding a JSON response body"""
+        with self._lock:
+            stats = self._stats(method, endpoint)
+            stats.decode_count += 1
+            stats.decode_time += elapsed
+
+    def reset(self) -> None:
+        """Drop everything recorded so far"""
+        with self._lock:
+            self._endpoints.clear()
+
+    # Export
+    def to_dict(self) -> Dict:
+        """Metrics as {'endpoints': [{method, endpoint, ...counters}]}"""
+        with self._lock:
+            items = sorted(self._endpoints.items(), key=lambda item: -item[1].total_time)
+            return {
+                'latency_buckets': list(LATENCY_BUCKETS),
+                'endpoints': [
+                    {'method': method, 'endpoint': endpoint, **stats.to_dict()}
+                    for (method, endpoint), stats in items
+                ]
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self, prefix: str = 'polaris_client') -> str:
+        """Metrics in the Prometheus text exposition format"""
+        def labels(method: str, endpoint: str, **extra) -> str:
+            pairs = {'method': method, 'endpoint': endpoint, **extra}
+            return ','.join(f'{key}="{value}"' for key, value in pairs.items())
+
+        lines: List[str] = [
+            f"# HELP {prefix}_request_duration_seconds Request latency by endpoint",
+            f"# TYPE {prefix}_request_duration_seconds histogram"
+        ]
+        with self._lock:
+            items = sorted(self._endpoints.items())
+            for (method, endpoint), stats in items:
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+                    cumulative += count
+                    lines.append(f"{prefix}_request_duration_seconds_bucket"
+                                 f"{{{labels(method, endpoint, le=f'{bound:g}')}}} {cumulative}")
+                lines.append(f"{prefix}_request_duration_seconds_bucket"
+                             f"{{{labels(method, endpoint, le='+Inf')}}} {stats.count}")
+                lines.append(f"{prefix}_request_duration_seconds_sum"
+                             f"{{{labels(method, endpoint)}}} {stats.total_time:.6f}")
+                lines.append(f"{prefix}_request_duration_seconds_count"
+                             f"{{{labels(method, endpoint)}}} {stats.count}")
+
+            counters = (
+                ('response_bytes_total', 'Response body bytes', lambda s: s.bytes),
+                ('retries_total', 'Retried requests', lambda s: s.retries),
+                ('decode_seconds_total', 'Seconds spent decoding JSON', lambda s: s.decode_time),
+            )
+            for name, help_text, value in counters:
+                lines.append(f"# HELP {prefix}_{name} {help_text}")
+                lines.append(f"# TYPE {prefix}_{name} counter")
+                for (method, endpoint), stats in items:
+                    lines.append(f"{prefix}_{name}{{{labels(method, endpoint)}}} {value(stats):g}")
+
+            lines.append(f"# HELP {prefix}_responses_total Responses by status code")
+            lines.append(f"# TYPE {prefix}_responses_total counter")
+            for (method, endpoint), stats in items:
+                for status, count in sorted(stats.statuses.items()):
+                    lines.append(f"{prefix}_responses_total"
+                                 f"{{{labels(method, endpoint, status=status)}}} {count}")
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str) -> None:
+        """Write the metrics to a file, Prometheus text for .prom/.txt, JSON otherwise"""
+        prometheus = os.path.splitext(path)[1].lower() in ('.prom', '.txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus() if prometheus else self.to_json())
+
+    def summary(self, limit: int = 15) -> str:
+        """Table of the endpoints that took the most total time"""
+        endpoints = self.to_dict()['endpoints']
+        if not endpoints:
+            return 'No API requests recorded.'
+        lines = [
+            f"{'endpoint':<58}{'count':>7}{'total s':>9}{'mean ms':>9}{'p95 ms':>8}"
+            f"{'MB':>8}{'retries':>8}{'decode s':>9}  statuses"
+        ]
+        for entry in endpoints[:limit]:
+            name = f"{entry['method']} {entry['endpoint']}"
+            if len(name) > 57:
+                name = '...' + name[-54:]
+            p95 = entry['p95_seconds']
+            statuses = ', '.join(f"{status} {count}" for status, count
+                                 in sorted(entry['statuses'].items()))
+            lines.append(
+                f"{name:<58}{entry['count']:>7}{entry['total_seconds']:>9.1f}"
+                f"{(entry['mean_seconds'] or 0) * 1000:>9.0f}"
+                f"{p95 * 1000 if p95 is not None else 0:>8.0f}"
+                f"{entry['bytes'] / (1024 * 1024):>8.1f}{entry['retries']:>8}"
+                f"{entry['decode_seconds']:>9.2f}  {statuses}"
+            )
+        if len(endpoints) > limit:
+            lines.append(f"... {len(endpoints) - limit} more endpoints")
+        return '\n'.join(lines)
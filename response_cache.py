@@ -0,0 +1,195 @@
+# response_cache.py - Persistent on-disk cache for Polaris API responses
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+# Time-to-live in seconds per endpoint prefix. The longest matching prefix wins.
+# A TTL of 0 keeps the response but revalidates it with the server on every use.
+DEFAULT_TTLS = {
+    '/api/portfolio/portfolios': 3600,
+    '/api/portfolio/portfolio-items': 3600,
+    '/api/portfolio/portfolio-sub-items': 3600,
+    '/api/portfolio/branches': 900,
+    '/api/portfolio/tags': 3600,
+    '/api/findings/taxonomies': 86400,
+    '/api/findings/taxa': 86400,
+    '/api/findings/licenses': 86400,
+    '/api/findings/issues': 0,
+    '/api/findings/occurrences': 0,
+}
+
+
+@dataclass
+class CacheEntry:
+    """Cached response body with its validators"""
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    expires_at: float
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    @property
+    def can_revalidate(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+
+class ResponseCache:
+    """
+    SQLite backed response cache used by the API clients' `_make_request`
+
+    Entries are keyed by method, base URL, endpoint, query parameters, Accept
+    type and API token.
+    Fresh entries are served without a request; expired entries that carry an
+    ETag or Last-Modified validator are revalidated with a conditional request.
+    The store is trimmed to `max_bytes` by evicting least recently used entries.
+    """
+
+    def __init__(self, path: str = '.polaris_cache/responses.sqlite',
+                 ttls: Optional[Dict[str, float]] = None,
+                 default_ttl: float = 300,
+                 max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize the cache
+
+        Args:
+            path: SQLite database file
+            ttls: TTL in seconds per endpoint prefix, merged over DEFAULT_TTLS
+            default_ttl: TTL for endpoints without a matching prefix
+            max_bytes: Maximum total size of cached bodies
+        """
+        self.path = path
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(method: str, base_url: str, endpoint: str, params: Optional[Dict],
+                 accept_type: str, credential: Optional[str] = None) -> str:
+        """
+        Build a stable cache key for a request
+
+        The key covers the server and the credential, so clients of different
+        instances or tenants sharing one cache file never see each other's
+        responses. Only the hash of the credential is stored.
+        """
+        raw = json.dumps(
+            [method.upper(), base_url.rstrip('/'), endpoint, params or {}, accept_type,
+             credential or ''],
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def ttl_for(self, endpoint: str) -> float:
+        """Return the TTL of the longest configured prefix matching the endpoint"""
+        best = None
+        for prefix in self.ttls:
+            if endpoint.startswith(prefix) and (best is None or len(prefix) > len(best)):
+                best = prefix
+        return self.ttls[best] if best is not None else self.default_ttl
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Return the cached entry for a key, fresh or not"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, expires_at FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+        return CacheEntry(bytes(row[0]), row[1], row[2], row[3])
+
+    def put(self, key: str, endpoint: str, body: bytes,
+            etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """Store a response body, then evict old entries if over the size limit"""
+        ttl = self.ttl_for(endpoint)
+        # Without a validator an entry with TTL 0 could never be reused
+        if ttl <= 0 and not (etag or last_modified):
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, endpoint, body, size, etag, last_modified, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, endpoint, body, len(body), etag, last_modified, now + ttl, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def refresh(self, key: str, endpoint: str) -> None:
+        """Extend the lifetime of an entry after a 304 Not Modified"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET expires_at = ?, accessed_at = ? WHERE key = ?",
+                (now + self.ttl_for(endpoint), now, key)
+            )
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the store fits in max_bytes"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ).fetchall()
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        self.logger.debug(f"Evicted {len(evicted)} cached responses")
+
+    def clear(self) -> None:
+        """Remove all cached responses"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
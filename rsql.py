@@ -0,0 +1,9 @@
+# rsql.py - Helpers for building Polaris RSQL `_filter` expressions
+
+
+def rsql_value(value: str) -> str:
+    """Quote a value for an RSQL comparison"""
+    value = str(value)
+    if "'" not in value:
+        return f"'{value}'"
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# taxonomy_index.py - Persisted local index of the Polaris taxonomy tree
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
+from findings import PolarisFindingsAPI
+
+# Keys a taxon's nested children may be returned under
+CHILD_KEYS = ('subtaxa', 'taxa', 'children', 'descendants')
+# Taxonomy fields that identify a revision of the taxonomy
+VERSION_KEYS = ('version', 'revision', 'updatedAt', 'lastModified')
+
+
+class TaxonomyIndex:
+    """
+    Local index of every taxonomy, taxon and issue type mapping
+
+    The full tree is downloaded once with `_includeDescendants` and persisted
+    as JSON. Parent/child lookups are dict reads, ancestor walks cost O(depth)
+    and issue types map straight to the taxa (standards such as OWASP or CWE
+    categories) that contain them. The index is rebuilt only when the
+    taxonomy version fingerprint changes; the fingerprint is checked with one
+    shallow taxonomies request at most every `check_interval` seconds.
+    """
+
+    def __init__(self, findings_api: PolarisFindingsAPI,
+                 path: str = '.polaris_cache/taxonomy_index.json',
+                 check_interval: float = 86400, include_issue_types: bool = True,
+                 max_workers: int = 8):
+        """
+        Initialize the index
+
+        Args:
+            findings_api: Findings API client
+            path: JSON file the index is persisted to
+            check_interval: Seconds between taxonomy version checks
+            include_issue_types: Also map issue types to taxa when building
+            max_workers: Number of taxon issue type requests in parallel
+        """
+        self.findings_api = findings_api
+        self.path = path
+        self.check_interval = check_interval
+        self.include_issue_types = include_issue_types
+        self.max_workers = max_workers
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._index = None
+        self._by_name: Dict[str, List[str]] = {}
+
+    # Index persistence
+    def _load(self) -> Optional[Dict]:
+        """Load the persisted index built against the same server"""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if index.get('base_url') != self.findings_api.base_url:
+            return None
+        return index
+
+    def _save(self) -> None:
+        """Write the index atomically"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+    def _set_index(self, index: Dict) -> None:
+        """Install an index and rebuild the derived name lookup"""
+        by_name: Dict[str, List[str]] = {}
+        for taxon_id, taxon in index['taxa'].items():
+            if taxon.get('name'):
+                by_name.setdefault(taxon['name'].lower(), []).append(taxon_id)
+        self._index = index
+        self._by_name = by_name
+
+    @property
+    def index(self) -> Dict:
+        """The current index, loaded from disk, revalidated or built on first use"""
+        with self._lock:
+            if self._index is None:
+                index = self._load()
+                if index is not None:
+                    self._set_index(index)
+        # One thread builds or revalidates while concurrent callers wait for it
+        with self._refresh_lock:
+            if self._index is None:
+                self.refresh()
+            elif time.time() - self._index.get('checked_at', 0) > self.check_interval:
+                self.refresh_if_changed()
+        return self._index
+
+    # Version check
+    @staticmethod
+    def fingerprint(response: Dict) -> str:
+        """
+        Fingerprint of the taxonomy versions in a taxonomies response
+
+        Uses the version fields of each taxonomy; if the server returns none,
+        the whole shallow response is hashed instead.
+        """
+        items = response.get('_items', [])
+        versions = [
+            [item.get('id')] + [item.get(key) for key in VERSION_KEYS]
+            for item in items
+        ]
+        if not any(value is not None for version in versions for value in version[1:]):
+            versions = response
+        raw = json.dumps(versions, sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def refresh_if_changed(self) -> bool:
+        """
+        Rebuild the index if the taxonomy version changed
+
+        Returns:
+            True if the index was rebuilt
+        """
+        current = self.fingerprint(self.findings_api.get_taxonomies())
+        if self._index is not None and self._index.get('fingerprint') == current:
+            with self._lock:
+                self._index['checked_at'] = time.time()
+                self._save()
+            return False
+        self.refresh(current)
+        return True
+
+    # Index building
+    def _add_taxon(self, index: Dict, taxon: Dict, taxonomy_id: str,
+                   parent_id: Optional[str]) -> None:
+        """Add a taxon and, recursively, its nested descendants"""
+        taxon_id = taxon.get('id')
+        if not taxon_id:
+            return
+        # Flat descendant lists name their parent instead of nesting
+        parent_id = taxon.get('parentId') or parent_id
+        entry = index['taxa'].setdefault(taxon_id, {
+            'name': taxon.get('name'),
+            'taxonomy': taxonomy_id,
+            'parent': parent_id,
+            'children': []
+        })
+        if entry['parent'] is None:
+            entry['parent'] = parent_id
+        for issue_type in taxon.get('issueTypes') or []:
+            type_id = issue_type.get('id') if isinstance(issue_type, dict) else issue_type
+            self._map_issue_type(index, type_id, taxon_id)
+        for key in CHILD_KEYS:
+            for child in taxon.get(key) or []:
+                self._add_taxon(index, child, taxonomy_id, taxon_id)
+
+    @staticmethod
+    def _map_issue_type(index: Dict, type_id: Optional[str], taxon_id: str) -> None:
+        if type_id:
+            taxa = index['issue_types'].setdefault(type_id, [])
+            if taxon_id not in taxa:
+                taxa.append(taxon_id)
+
+    def _taxon_issue_types(self, taxon_id: str) -> List[str]:
+        """IDs of every issue type of a taxon, across all pages"""
+        try:
+            return [
+                item.get('id')
+                for page in self.findings_api.get_taxon_issue_types_paginated(taxon_id)
+                for item in page.get('_items', []) if item.get('id')
+            ]
+        except Exception as e:
+            self.logger.warning(f"Error getting issue types of taxon {taxon_id}: {str(e)}")
+            return []
+
+    def refresh(self, fingerprint: Optional[str] = None) -> Dict:
+        """Download the full taxonomy tree and persist it"""
+        started = time.time()
+        if fingerprint is None:
+            fingerprint = self.fingerprint(self.findings_api.get_taxonomies())
+        response = self.findings_api.get_taxonomies(include_descendants=True)
+        index = {
+            'base_url': self.findings_api.base_url,
+            'fingerprint': fingerprint,
+            'built_at': started,
+            'checked_at': started,
+            'taxonomies': {},
+            'taxa': {},
+            'issue_types': {}
+        }
+        for taxonomy in response.get('_items', []):
+            taxonomy_id = taxonomy.get('id')
+            index['taxonomies'][taxonomy_id] = taxonomy.get('name')
+            for key in CHILD_KEYS:
+                for taxon in taxonomy.get(key) or []:
+                    self._add_taxon(index, taxon, taxonomy_id, None)
+        for taxon_id, taxon in index['taxa'].items():
+            if taxon['parent'] in index['taxa']:
+                index['taxa'][taxon['parent']]['children'].append(taxon_id)
+
+        # Issue types are not part of the tree; fetch them once per taxon
+        if self.include_issue_types and not index['issue_types']:
+            taxon_ids = list(index['taxa'])
+            with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+                for taxon_id, type_ids in zip(taxon_ids,
+                                              executor.map(self._taxon_issue_types, taxon_ids)):
+                    for type_id in type_ids:
+                        self._map_issue_type(index, type_id, taxon_id)
+
+        with self._lock:
+            self._set_index(index)
+            self._save()
+        self.logger.info(
+            f"Indexed {len(index['taxa'])} taxa of {len(index['taxonomies'])} taxonomies "
+            f"in {time.time() - started:.1f}s"
+        )
+        return index
+
+    # Lookups
+    def taxon(self, taxon_id: str) -> Optional[Dict]:
+        """Indexed record of a taxon: name, taxonomy, parent and children"""
+        return self.index['taxa'].get(taxon_id)
+
+    def parent(self, taxon_id: str) -> Optional[str]:
+        """Parent taxon ID, None for a top level taxon"""
+        taxon = self.taxon(taxon_id)
+        return taxon['parent'] if taxon else None
+
+    def children(self, taxon_id: str) -> List[str]:
+        """Direct child taxon IDs"""
+        taxon = self.taxon(taxon_id)
+        return list(taxon['children']) if taxon else []
+
+    def ancestors(self, taxon_id: str) -> List[str]:
+        """Taxon IDs from the parent up to the top level taxon"""
+        taxa = self.index['taxa']
+        result = []
+        parent = taxa[taxon_id]['parent'] if taxon_id in taxa else None
+        while parent is not None and parent not in result:
+            result.append(parent)
+            parent = taxa[parent]['parent'] if parent in taxa else None
+        return result
+
+    def descendants(self, taxon_id: str) -> Iterator[str]:
+        """All taxon IDs below a taxon, depth first"""
+        stack = self.children(taxon_id)[::-1]
+        while stack:
+            current = stack.pop()
+            yield current
+            stack.extend(self.children(current)[::-1])
+
+    def find(self, name: str) -> List[str]:
+        """Taxon IDs with the given name (case insensitive), e.g. 'CWE-89'"""
+        self.index  # loads or builds the index and its name lookup
+        return list(self._by_name.get(name.lower(), []))
+
+    def taxa_for_issue_type(self, type_id: str) -> List[str]:
+        """Taxon IDs that directly contain an issue type"""
+        return list(self.index['issue_types'].get(type_id, []))
+
+    def standards_for_issue_type(self, type_id: str,
+                                 taxonomy: Optional[str] = None) -> Dict[str, List[str]]:
+        """
+        Standards an issue type belongs to, by taxonomy name
+
+        Each containing taxon is reported as its path from the top level,
+        e.g. {'OWASP Top 10 2021': ['A03 Injection']}.
+
+        Args:
+            type_id: Issue type ID (`type.id` of an issue)
+            taxonomy: Only report this taxonomy (name or ID)
+        """
+        index = self.index
+        result: Dict[str, List[str]] = {}
+        for taxon_id in index['issue_types'].get(type_id, []):
+            taxon = index['taxa'][taxon_id]
+            taxonomy_id = taxon['taxonomy']
+            taxonomy_name = index['taxonomies'].get(taxonomy_id) or taxonomy_id
+            if taxonomy is not None and taxonomy not in (taxonomy_id, taxonomy_name):
+                continue
+            path = [index['taxa'][a]['name'] for a in reversed(self.ancestors(taxon_id))]
+            label = ' / '.join(str(name) for name in path + [taxon['name']])
+            labels = result.setdefault(taxonomy_name, [])
+            if label not in labels:
+                labels.append(label)
+        return result
+
+
+def main() -> None:
+    """Build the taxonomy index and look up issue types"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    parser = argparse.ArgumentParser(description='Local Polaris taxonomy index')
+    parser.add_argument('base_url', help='Polaris base URL')
+    parser.add_argument('api_token', help='API token')
+    parser.add_argument('issue_type_ids', nargs='*', help='Issue type IDs to map to standards')
+    parser.add_argument('--path', default='.polaris_cache/taxonomy_index.json',
+                        help='Index file (default: .polaris_cache/taxonomy_index.json)')
+    parser.add_argument('--refresh', action='store_true', help='Rebuild the index')
+    args = parser.parse_args()
+
+    index = TaxonomyIndex(PolarisFindingsAPI(args.base_url, args.api_token), path=args.path)
+    if args.refresh:
+        index.refresh()
+    for type_id in args.issue_type_ids:
+        print(f"{type_id}:")
+        for taxonomy, labels in index.standards_for_issue_type(type_id).items():
+            print(f"  {taxonomy}: {', '.join(labels)}")
+
+
+if __name__ == '__main__':
+    main()
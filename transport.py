@@ -0,0 +1,308 @@
+# transport.py - Shared pooled HTTP transport for the Polaris API clients
+
+import fnmatch
+import logging
+import os
+import threading
+import time
+from typing import Any, BinaryIO, Callable, Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+import json_codec
+from rate_limiter import AdaptiveRateLimiter, RetryPolicy, get_shared_rate_limiter
+from request_metrics import RequestMetrics
+from response_cache import ResponseCache
+
+try:
+    import brotli  # noqa: F401 - enables 'br' decoding in urllib3
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+# Transport failures after which an idempotent request is sent again
+RETRY_EXCEPTIONS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+# Read timeouts in seconds per endpoint pattern, the first matching pattern wins
+DEFAULT_ENDPOINT_TIMEOUTS = {
+    '/api/findings/occurrences/*/assist': 120,
+    '/api/findings/occurrences/*/artifacts/*': 120,
+    '/api/findings/issues/_actions/export': 300,
+}
+
+
+class PolarisTransport:
+    """
+    Pooled HTTP transport shared by PolarisFindingsAPI and PolarisPortfolioAPI
+
+    Keeps connections alive in a urllib3 pool so consecutive calls reuse the
+    TCP/TLS handshake, negotiates compressed responses and applies per
+    endpoint timeouts. Pass one instance to several clients to let them share
+    the pool; clients created without a transport use `get_shared_transport()`.
+    Every request first takes a token from the rate limiter, and idempotent
+    requests that fail with a connection error, a timeout or a 429/5xx are
+    retried with the server's Retry-After or a jittered exponential backoff.
+    """
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 32,
+                 timeout: float = 30, connect_timeout: float = 10,
+                 endpoint_timeouts: Optional[Dict[str, float]] = None,
+                 compression: bool = True,
+                 decoder: Optional[Callable[[bytes], Any]] = None,
+                 metrics: Optional[RequestMetrics] = None,
+                 rate_limiter: Optional[AdaptiveRateLimiter] = None,
+                 max_retries: int = 3, backoff_base: float = 0.5, backoff_max: float = 30):
+        """
+        Initialize the transport
+
+        Args:
+            pool_connections: Number of hosts to keep connection pools for
+            pool_maxsize: Maximum connections kept alive per host
+            timeout: Default read timeout in seconds
+            connect_timeout: Connect timeout in seconds
+            endpoint_timeouts: Read timeout per endpoint pattern, merged over the defaults
+            compression: Ask the server for compressed responses
+            decoder: Function decoding a JSON response body, json_codec.loads by default
+            metrics: Per-endpoint request metrics to record into, disabled if omitted
+            rate_limiter: Limiter shared with other clients of the same tenant,
+                          `get_shared_rate_limiter()` if omitted
+            max_retries: Retries of an idempotent request after the first attempt
+            backoff_base: Seconds of the first backoff, doubled on every retry
+            backoff_max: Upper bound of a backoff in seconds
+        """
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.endpoint_timeouts = dict(DEFAULT_ENDPOINT_TIMEOUTS)
+        if endpoint_timeouts:
+            self.endpoint_timeouts.update(endpoint_timeouts)
+        self.decoder = decoder or json_codec.loads
+        self.metrics = metrics
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
+        self.retry_policy = RetryPolicy(self.rate_limiter, max_retries, backoff_base, backoff_max)
+        self.logger = logging.getLogger(__name__)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers['Accept-Encoding'] = ACCEPT_ENCODING if compression else 'identity'
+
+    def timeout_for(self, endpoint: str) -> Tuple[float, float]:
+        """Return the (connect, read) timeout for an endpoint"""
+        for pattern, timeout in self.endpoint_timeouts.items():
+            if fnmatch.fnmatchcase(endpoint, pattern):
+                return self.connect_timeout, timeout
+        return self.connect_timeout, self.timeout
+
+    def send(self, method: str, url: str, endpoint: str, headers: Dict,
+             params: Optional[Dict] = None, data: Optional[Dict] = None,
+             stream: bool = False) -> requests.Response:
+        """Send a request over the pooled session"""
+        return self.session.request(
+            method=method,
+            url=url,
+            headers=headers,
+            params=params,
+            json=data,
+            timeout=self.timeout_for(endpoint),
+            stream=stream
+        )
+
+    def _request(self, method: str, base_url: str, endpoint: str, headers: Dict,
+                 params: Optional[Dict] = None, data: Optional[Dict] = None,
+                 stream: bool = False) -> requests.Response:
+        """
+        Send a request through the rate limiter, retrying idempotent requests
+
+        The body of a non-streamed response is read before returning, and
+        every attempt is recorded in the metrics. A streamed response is
+        returned unread; only the attempts that were retried are recorded and
+        the caller records the final one. The last response is returned
+        whatever its status, the last transport error is raised.
+        """
+        policy = self.retry_policy
+        metrics = self.metrics
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire()
+            started = time.perf_counter()
+            try:
+                response = self.send(method, f"{base_url}{endpoint}", endpoint, headers,
+                                     params, data, stream=stream)
+                if not stream:
+                    response.content
+            except RETRY_EXCEPTIONS as e:
+                delay = policy.on_error(method, endpoint, e, attempt)
+                if metrics is not None and (not stream or delay is not None):
+                    metrics.record(method, endpoint, 'error', time.perf_counter() - started)
+                if delay is None:
+                    raise
+            except requests.exceptions.RequestException:
+                if metrics is not None and not stream:
+                    metrics.record(method, endpoint, 'error', time.perf_counter() - started)
+                raise
+            else:
+                status = response.status_code
+                delay = policy.on_response(method, endpoint, status,
+                                           response.headers.get('Retry-After'), attempt)
+                if metrics is not None and (not stream or delay is not None):
+                    metrics.record(method, endpoint, status, time.perf_counter() - started,
+                                   0 if stream else len(response.content))
+                if delay is None:
+                    return response
+                response.close()
+
+            if metrics is not None:
+                metrics.record_retry(method, endpoint)
+            if delay > 0:
+                time.sleep(delay)
+            attempt += 1
+
+    def request_raw(self, method: str, base_url: str, endpoint: str, headers: Dict,
+                    params: Optional[Dict] = None, data: Optional[Dict] = None,
+                    cache: Optional[ResponseCache] = None) -> bytes:
+        """
+        Send a request and return the response body without decoding it
+
+        GET requests are served from or revalidated against `cache` when given.
+
+        Raises:
+            requests.exceptions.RequestException on transport or HTTP errors
+        """
+        cache_key = None
+        cached = None
+        if cache is not None and method.upper() == 'GET':
+            cache_key = cache.make_key(method, base_url, endpoint, params, headers.get('Accept'),
+                                       headers.get('Api-Token'))
+            cached = cache.get(cache_key)
+            if cached is not None and cached.is_fresh:
+                if self.metrics is not None:
+                    self.metrics.record(method, endpoint, 'cache', 0.0, len(cached.body))
+                return cached.body
+            if cached is not None and cached.can_revalidate:
+                headers = dict(headers)
+                if cached.etag:
+                    headers['If-None-Match'] = cached.etag
+                if cached.last_modified:
+                    headers['If-Modified-Since'] = cached.last_modified
+
+        response = self._request(method, base_url, endpoint, headers, params, data)
+        body = response.content
+        if response.status_code == 304 and cached is not None:
+            cache.refresh(cache_key, endpoint)
+            return cached.body
+        response.raise_for_status()
+        if response.status_code == 204:
+            return b''
+        if cache_key is not None and body:
+            cache.put(
+                cache_key,
+                endpoint,
+                body,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified')
+            )
+        return body
+
+    def request_json(self, method: str, base_url: str, endpoint: str, headers: Dict,
+                     params: Optional[Dict] = None, data: Optional[Dict] = None,
+                     cache: Optional[ResponseCache] = None) -> Union[Dict, list]:
+        """
+        Send a request and decode the JSON response with `decoder`
+
+        An empty response body decodes to an empty dict.
+
+        Raises:
+            requests.exceptions.RequestException on transport or HTTP errors
+        """
+        body = self.request_raw(method, base_url, endpoint, headers, params, data, cache)
+        if not body:
+            return {}
+        if self.metrics is None:
+            return self.decoder(body)
+        started = time.perf_counter()
+        result = self.decoder(body)
+        self.metrics.record_decode(method, endpoint, time.perf_counter() - started)
+        return result
+
+    def download(self, method: str, base_url: str, endpoint: str, headers: Dict,
+                 target: Union[str, BinaryIO], params: Optional[Dict] = None,
+                 data: Optional[Dict] = None, chunk_size: int = 1024 * 1024,
+                 hasher: Optional[Any] = None) -> int:
+        """
+        Stream a response body to a file or buffer without holding it in memory
+
+        A path target is written to `<path>.part` and moved into place once
+        complete, so an interrupted download never leaves a truncated file at
+        the path. Any other target is treated as a writable binary buffer and
+        receives the chunks directly.
+
+        Args:
+            target: File path or writable binary object
+            chunk_size: Bytes read per chunk
+            hasher: hashlib object updated with every chunk
+
+        Returns:
+            Number of bytes written
+
+        Raises:
+            requests.exceptions.RequestException on transport or HTTP errors
+        """
+        started = time.perf_counter()
+        status = 'error'
+        written = 0
+        try:
+            with self._request(method, base_url, endpoint, headers, params, data,
+                               stream=True) as response:
+                status = response.status_code
+                response.raise_for_status()
+                if not isinstance(target, str):
+                    written = self._copy_chunks(response, target, chunk_size, hasher)
+                    return written
+
+                temp_path = f"{target}.part"
+                try:
+                    with open(temp_path, 'wb') as f:
+                        written = self._copy_chunks(response, f, chunk_size, hasher)
+                    os.replace(temp_path, target)
+                except BaseException:
+                    if os.path.exists(temp_path):
+                        os.remove(temp_path)
+                    raise
+            return written
+        finally:
+            if self.metrics is not None:
+                self.metrics.record(method, endpoint, status, time.perf_counter() - started,
+                                    written)
+
+    @staticmethod
+    def _copy_chunks(response: requests.Response, out: BinaryIO, chunk_size: int,
+                     hasher: Optional[Any]) -> int:
+        written = 0
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            out.write(chunk)
+            if hasher is not None:
+                hasher.update(chunk)
+            written += len(chunk)
+        return written
+
+    def close(self) -> None:
+        """Close all pooled connections"""
+        self.session.close()
+
+
+_shared_transport = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_transport() -> PolarisTransport:
+    """Return the process wide default transport"""
+    global _shared_transport
+    with _shared_lock:
+        if _shared_transport is None:
+            _shared_transport = PolarisTransport()
+        return _shared_transport